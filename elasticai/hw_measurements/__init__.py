@@ -1,7 +1,15 @@
 from ._helper import get_path_to_project as get_path_to_project
 from ._helper import init_project_folder as init_project_folder
 from .data_types import FrequencyResponse as FrequencyResponse
+from .data_types import MetricDynamic as MetricDynamic
+from .data_types import MetricFrequencyResponse as MetricFrequencyResponse
+from .data_types import MetricHarmonics as MetricHarmonics
+from .data_types import MetricIVCurve as MetricIVCurve
 from .data_types import MetricNoise as MetricNoise
+from .data_types import MetricSineFit as MetricSineFit
+from .data_types import MetricStepResponse as MetricStepResponse
+from .data_types import MetricTransfer as MetricTransfer
+from .data_types import ReducedData as ReducedData
 from .data_types import TransformSpectrum as TransformSpectrum
 from .data_types import TransientData as TransientData
 from .data_types import TransientNoiseSpectrum as TransientNoiseSpectrum
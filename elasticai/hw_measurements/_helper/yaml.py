@@ -97,6 +97,21 @@ class YamlConfigHandler:
         with open(self.path2chck, "w") as f:
             yaml.dump(config_data, f, sort_keys=False)
 
+    def update_dict(self, entries: dict) -> None:
+        """Updating selected entries of the existing YAML file (like: sleep_sec from measurement)
+        Args:
+            entries:    Dict. with keys (must be available in YAML file) and new values
+        Returns:
+            None
+        """
+        config_data = self.get_dict()
+        unknown = [key for key in entries.keys() if key not in config_data.keys()]
+        if unknown:
+            raise KeyError(f"Entries {unknown} are not available in YAML file {self.path2chck}")
+        config_data.update(entries)
+        self.write_dict_to_yaml(config_data)
+        self.__logger.debug(f"... updated entries {list(entries.keys())} in YAML file")
+
     def get_class(self, class_constructor: type):
         """Getting all key inputs from yaml dictionary to a class"""
         data = self.get_dict()
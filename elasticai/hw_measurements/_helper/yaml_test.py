@@ -55,6 +55,18 @@ class TestYamlHandler(unittest.TestCase):
         data_rd = self.dummy0.get_dict()
         self.assertTrue(data_wr == data_rd)
 
+    def test_yaml_update(self):
+        dummy = YamlConfigHandler(
+            yaml_template=DefaultSettingsTest, path2yaml=path2yaml, yaml_name=filename + "2"
+        )
+        dummy.update_dict({"freq": 20.0})
+        self.assertEqual(dummy.get_dict()["freq"], 20.0)
+        self.assertEqual(dummy.get_class(SettingsTest).val, DefaultSettingsTest.val)
+
+    def test_yaml_update_unknown_key(self):
+        with self.assertRaises(KeyError):
+            self.dummy1.update_dict({"unknown": 1})
+
 
 if __name__ == "__main__":
     unittest.main()
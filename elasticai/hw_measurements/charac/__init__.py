@@ -10,6 +10,8 @@ from .amp import (
 from .amp import (
     SettingsAmplifier as SettingsAmplifier,
 )
+from .coherent import CoherentPlan as CoherentPlan
+from .coherent import CoherentSamplingPlanner as CoherentSamplingPlanner
 from .dac import CharacterizationDAC as CharacterizationDAC
 from .dac import DefaultSettingsDAC as DefaultSettingsDAC
 from .dac import SettingsDAC as SettingsDAC
@@ -25,3 +27,30 @@ from .noise import (
 from .noise import (
     TransientNoiseSpectrum as TransientNoiseSpectrum,
 )
+from .pipeline import AcquisitionPipeline as AcquisitionPipeline
+from .pipeline import PipelineSample as PipelineSample
+from .pipeline import PipelineStatistics as PipelineStatistics
+from .planner import DefaultLatencyProfile as DefaultLatencyProfile
+from .planner import LatencyProfile as LatencyProfile
+from .planner import SweepPhase as SweepPhase
+from .planner import SweepPlan as SweepPlan
+from .planner import SweepPlanner as SweepPlanner
+from .planner import SweepSuggestion as SweepSuggestion
+from .planner import calibrate_latency_profile as calibrate_latency_profile
+from .planner import load_latency_profile as load_latency_profile
+from .ranging import RangePlan as RangePlan
+from .ranging import RangePlanner as RangePlanner
+from .ranging import RangesDMM6500Current as RangesDMM6500Current
+from .ranging import RangesDMM6500Voltage as RangesDMM6500Voltage
+from .ranging import RangesNGUX01Current as RangesNGUX01Current
+from .ranging import RangesNGUX01Voltage as RangesNGUX01Voltage
+from .scheduler import StationJob as StationJob
+from .scheduler import StationJobResult as StationJobResult
+from .scheduler import StationScheduler as StationScheduler
+from .screening import LimitCheck as LimitCheck
+from .screening import ProductionScreening as ProductionScreening
+from .screening import ScreeningResult as ScreeningResult
+from .virtual import VirtualADC as VirtualADC
+from .virtual import VirtualAmplifier as VirtualAmplifier
+from .virtual import VirtualDAC as VirtualDAC
+from .virtual import VirtualNoiseSource as VirtualNoiseSource
@@ -8,7 +8,9 @@ from time import sleep
 import numpy as np
 from tqdm import tqdm
 
+from elasticai.hw_measurements import MetricDynamic
 from elasticai.hw_measurements._helper.yaml import YamlConfigHandler
+from elasticai.hw_measurements.charac.coherent import CoherentSamplingPlanner
 from elasticai.hw_measurements.charac.common import CharacterizationCommon
 from elasticai.hw_measurements.plots import plot_transfer_function_metric, plot_transfer_function_norm
 from elasticai.hw_measurements.process.data import MetricCalculator
@@ -97,6 +99,7 @@ class CharacterizationADC(CharacterizationCommon):
     settings: SettingsADC
     _logger: Logger
     _input_val: float
+    _num_reads_per_step: int = 2
 
     def __init__(self, path2yaml: Path = Path("config")) -> None:
         """Class for handling the measurement routine for characterizing an Analog-Digital-Converter (ADC)
@@ -109,13 +112,24 @@ class CharacterizationADC(CharacterizationCommon):
             yaml_template=DefaultSettingsADC, path2yaml=path2yaml, yaml_name="Config_TestADC"
         ).get_class(SettingsADC)
 
-    def run_test_transfer(self, func_mux, func_daq, func_sens, func_dut, func_beep) -> dict:
+    def run_test_transfer(
+        self,
+        func_mux,
+        func_daq,
+        func_sens,
+        func_dut,
+        func_beep,
+        do_pipeline: bool = False,
+        stages: list | tuple = (),
+    ) -> dict:
         """Function for characterizing the transfer function of the ADC
         :param func_mux:    Function for defining the pre-processing part of the hardware DUT, setting the ADC channel with inputs (chnl)
         :param func_daq:    Function for applying selected channel and data on DAQ with input params (data)
-        :param func_sens:   Function for getting the applied voltage (measured) from DAQ device
+        :param func_sens:   Function for getting the applied voltage (measured) from DAQ device (not used for pipelined sweep)
         :param func_dut:    Function for sensing the ADC output with external multimeter device with inputs (chnl)
         :param func_beep:   Function for do a beep in DAQ
+        :param do_pipeline: If True, the acquisition is decoupled from the processing (run_sweep_pipelined)
+        :param stages:      List or tuple with additional consumer functions for pipelined sweep with input params (sample: PipelineSample)
         :return:            Dictionary with ['stim': input test signal of one repetition, 'settings': Settings, 'ch<X>': DUT results with 'val' and 'std']"""
         stimuli = self.settings.get_cycle_stimuli_input()
 
@@ -125,6 +139,21 @@ class CharacterizationADC(CharacterizationCommon):
             results_ch = self.settings.get_cycle_empty_array()
             func_mux(chnl)
             self._logger.debug(f"Prepared ADC channel: {chnl}")
+            if do_pipeline:
+                results_ch, stats = self.run_sweep_pipelined(
+                    stimuli=stimuli,
+                    func_set=func_daq,
+                    func_read=lambda: func_dut(chnl),
+                    num_rpt=self.settings.num_rpt,
+                    daq_ovr=self.settings.daq_ovr,
+                    sleep_sec=self.settings.sleep_sec,
+                    stages=stages,
+                    func_beep=func_beep,
+                    desc=f"Process CH{chnl}",
+                )
+                self._logger.debug(f"Pipelined sweep ADC channel {chnl}: {stats}")
+                results.update({f"ch{chnl:02d}": results_ch})
+                continue
 
             for rpt_idx in range(self.settings.num_rpt):
                 for val_idx, data in enumerate(
@@ -150,6 +179,203 @@ class CharacterizationADC(CharacterizationCommon):
 
         return results
 
+    def run_test_transfer_stimulus_major(
+        self, func_mux, func_daq, func_sens, func_dut, func_beep, vector_dut: bool = False
+    ) -> dict:
+        """Function for characterizing the transfer function of the ADC with stimulus-major loop order,
+        i.e. the stimulus is applied and settled only once per step and all channels are read afterward.
+        :param func_mux:    Function for defining the pre-processing part of the hardware DUT, setting the ADC channel with inputs (chnl) (not used if vector_dut=True)
+        :param func_daq:    Function for applying selected channel and data on DAQ with input params (data)
+        :param func_sens:   Function for getting the applied voltage (measured) from DAQ device
+        :param func_dut:    Function for sensing the ADC output with inputs (chnl) or without inputs if vector_dut=True
+        :param func_beep:   Function for do a beep in DAQ
+        :param vector_dut:  If True, func_dut() returns all channels of adc_chnl in one call with shape (num_chnl, ) or (num_chnl, daq_ovr)
+        :return:            Dictionary with ['stim': input test signal of one repetition, 'ch<X>': DUT results], same layout like run_test_transfer"""
+        stimuli = self.settings.get_cycle_stimuli_input()
+        num_chnl = len(self.settings.adc_chnl)
+
+        sens_test = self.settings.get_cycle_empty_array()
+        results_all = np.zeros(shape=(num_chnl, *sens_test.shape), dtype=float)
+        for rpt_idx in range(self.settings.num_rpt):
+            for val_idx, data in enumerate(
+                tqdm(
+                    stimuli,
+                    ncols=100,
+                    desc=f"Process {num_chnl} channels @ repetition {1 + rpt_idx}/{self.settings.num_rpt}",
+                )
+            ):
+                self._input_val = data
+                func_daq(data)
+                sleep(self.settings.sleep_sec)
+                for daq_idx in range(self.settings.daq_ovr):
+                    sens_test[rpt_idx, val_idx, daq_idx] = func_sens()
+
+                if vector_dut:
+                    results_all[:, rpt_idx, val_idx, :] = self.__read_dut_vector(func_dut)
+                else:
+                    for chnl_idx, chnl in enumerate(self.settings.adc_chnl):
+                        func_mux(chnl)
+                        for daq_idx in range(self.settings.daq_ovr):
+                            results_all[chnl_idx, rpt_idx, val_idx, daq_idx] = func_dut(chnl)
+            self._logger.debug(f"Sweep ADC channels @ repetition {1 + rpt_idx}")
+            func_beep()
+
+        results = {"stim": stimuli}
+        for chnl_idx, chnl in enumerate(self.settings.adc_chnl):
+            results.update({f"ch{chnl:02d}": results_all[chnl_idx]})
+        for _ in range(4):
+            sleep(0.5)
+            func_beep()
+
+        return results
+
+    def run_test_transfer_converged(
+        self,
+        func_mux,
+        func_daq,
+        func_dut,
+        func_beep,
+        sem_target: float,
+        num_min: int = 2,
+        num_max: int = 16,
+    ) -> tuple[dict, dict]:
+        """Function for characterizing the transfer function of the ADC with convergence-driven sampling.
+        Setting num_rpt is used as upper bound of repetitions.
+        :param func_mux:    Function for defining the pre-processing part of the hardware DUT, setting the ADC channel with inputs (chnl)
+        :param func_daq:    Function for applying selected channel and data on DAQ with input params (data)
+        :param func_dut:    Function for sensing the ADC output with external multimeter device with inputs (chnl)
+        :param func_beep:   Function for do a beep in DAQ
+        :param sem_target:  Floating value with target standard error of the mean of the ADC output
+        :param num_min:     Integer with minimal number of samples per step (at least 2)
+        :param num_max:     Integer with maximal number of samples per step (independent of daq_ovr)
+        :return:            Tuple with two dictionaries
+                            [0]: Results ['stim': input test signal of one repetition, 'ch<X>': DUT results (not measured samples are NaN)]
+                            [1]: Achieved standard error of the mean ['stim': input test signal, 'ch<X>': SEM with shape (num_rpt_done, num_steps)]
+        """
+        stimuli = self.settings.get_cycle_stimuli_input()
+
+        results = {"stim": stimuli}
+        confidence = {"stim": stimuli}
+        for chnl in self.settings.adc_chnl:
+            func_mux(chnl)
+            self._logger.debug(f"Prepared ADC channel: {chnl}")
+            results_ch, sem_ch = self.sweep_until_converged(
+                stimuli=stimuli,
+                func_set=func_daq,
+                func_read=lambda: func_dut(chnl),
+                func_beep=func_beep,
+                sem_target=sem_target,
+                num_min=num_min,
+                num_max=num_max,
+                num_rpt=self.settings.num_rpt,
+                sleep_sec=self.settings.sleep_sec,
+                desc=f"Process CH{chnl}",
+            )
+            results.update({f"ch{chnl:02d}": results_ch})
+            confidence.update({f"ch{chnl:02d}": sem_ch})
+        for _ in range(4):
+            sleep(0.5)
+            func_beep()
+
+        return results, confidence
+
+    def run_test_dynamic(
+        self,
+        func_mux,
+        func_gen_function,
+        func_gen_offset,
+        func_gen_freq,
+        func_gen_ampl,
+        func_capture,
+        func_beep,
+        frequencies: np.ndarray,
+        amplitudes: np.ndarray,
+        fs: float,
+        num_samples: int,
+        num_harmonics: int = 4,
+        method_window: str = "hanning",
+        do_coherent: bool = False,
+    ) -> tuple[dict, dict]:
+        """Function for characterizing the dynamic performance of the ADC with sinusoidal input (e.g. from MXO generator)
+        :param func_mux:        Function for defining the pre-processing part of the hardware DUT, setting the ADC channel with inputs (chnl)
+        :param func_gen_function: Function for selecting the generator waveform with input params (waveform), called with 'SINE'
+        :param func_gen_offset: Function for setting the generator offset with input params (offset), called with common mode voltage
+        :param func_gen_freq:   Function for setting the generator frequency with input params (frequency)
+        :param func_gen_ampl:   Function for setting the generator amplitude with input params (amplitude)
+        :param func_capture:    Function for capturing a block of ADC samples from DUT with input params (chnl, num_samples)
+        :param func_beep:       Function for do a beep in DAQ
+        :param frequencies:     Numpy array with stimulus frequencies [Hz]
+        :param amplitudes:      Numpy array with stimulus amplitudes [V]
+        :param fs:              Sampling rate of the DUT-ADC [Hz]
+        :param num_samples:     Integer with number of samples per capture
+        :param num_harmonics:   Number of used harmonics (excl. fundamental) for calculating THD
+        :param method_window:   Selected window for spectral analysis
+        :param do_coherent:     If True, the frequencies are shifted to coherent frequencies (co-prime number of cycles in num_samples),
+                                recommended with rectangular window (method_window=''), num_samples must reach the
+                                frequency tolerance of the planner (otherwise ValueError)
+        :return:                Tuple with two dictionaries
+                                [0]: Captures ['freq': frequencies, 'ampl': amplitudes, 'ch<X>': ADC samples with shape (num_freq, num_ampl, num_samples)]
+                                [1]: Metrics ['ch<X>': Dataclass MetricDynamic with shape (num_freq, num_ampl)]
+        """
+        if do_coherent:
+            plans = CoherentSamplingPlanner(fs=fs).plan_sweep(
+                frequencies=frequencies, num_samples=num_samples
+            )
+            frequencies = np.array([plan.freq for plan in plans])
+        func_gen_function("SINE")
+        func_gen_offset(self.settings.get_common_mode_voltage())
+
+        captures = np.zeros(
+            shape=(len(self.settings.adc_chnl), frequencies.size, amplitudes.size, num_samples),
+            dtype=float,
+        )
+        for chnl_idx, chnl in enumerate(self.settings.adc_chnl):
+            func_mux(chnl)
+            self._logger.debug(f"Prepared ADC channel: {chnl}")
+            for freq_idx, freq in enumerate(tqdm(frequencies, ncols=100, desc=f"Process CH{chnl}")):
+                func_gen_freq(freq)
+                for ampl_idx, ampl in enumerate(amplitudes):
+                    func_gen_ampl(ampl)
+                    sleep(self.settings.sleep_sec)
+                    captures[chnl_idx, freq_idx, ampl_idx] = func_capture(chnl, num_samples)
+            func_beep()
+
+        self._logger.info("Calculating the dynamic metrics")
+        metric = MetricCalculator.calculate_dynamic_metrics(
+            signal=captures, fs=fs, num_harmonics=num_harmonics, method_window=method_window
+        )
+        results = {"freq": frequencies, "ampl": amplitudes}
+        metrics = dict()
+        for chnl_idx, chnl in enumerate(self.settings.adc_chnl):
+            results.update({f"ch{chnl:02d}": captures[chnl_idx]})
+            metrics.update(
+                {
+                    f"ch{chnl:02d}": MetricDynamic(
+                        **{key: value[chnl_idx] for key, value in metric.__dict__.items()}
+                    )
+                }
+            )
+        for _ in range(4):
+            sleep(0.5)
+            func_beep()
+        return results, metrics
+
+    def __read_dut_vector(self, func_dut) -> np.ndarray:
+        """Function for reading all ADC channels (and oversampling values) with vectorized DUT function
+        :param func_dut:    Function returning numpy array with shape (num_chnl, ) or (num_chnl, daq_ovr)
+        :return:            Numpy array with shape (num_chnl, daq_ovr)
+        """
+        data = np.asarray(func_dut(), dtype=float)
+        if data.ndim == 1:
+            data = np.stack(
+                [data] + [np.asarray(func_dut(), dtype=float) for _ in range(self.settings.daq_ovr - 1)],
+                axis=1,
+            )
+        assert data.shape == (len(self.settings.adc_chnl), self.settings.daq_ovr), (
+            "Dimension / shape mismatch of vectorized func_dut"
+        )
+        return data
+
     def plot_characteristic_results_from_file(self, path: Path, file_name: str) -> None:
         """Function for plotting the loaded data files
         :param path:        Path to the numpy files with DAQ results
@@ -1,11 +1,12 @@
 import unittest
 from copy import deepcopy
+from dataclasses import replace
 
 import numpy as np
 
 from elasticai.hw_measurements import get_path_to_project
 
-from .adc import CharacterizationADC, SettingsADC
+from .adc import CharacterizationADC, DefaultSettingsADC, SettingsADC
 
 settings = SettingsADC(
     system_id="0",
@@ -94,6 +95,155 @@ class TestADC(unittest.TestCase):
         )
         self.assertTrue(len(results) == 1 + len(set0.adc_chnl))
 
+    def test_run_transfer_pipelined(self):
+        set0 = deepcopy(settings)
+        set0.adc_chnl = [0, 1]
+        set0.adc_rang = [0.0, 5.0]
+        set0.delta_steps = 0.5
+        set0.num_rpt = 2
+        set0.daq_ovr = 2
+        set0.sleep_sec = 0.0
+
+        hndl = CharacterizationADC(path2yaml=get_path_to_project("temp_config") / "adc")
+        hndl.settings = set0
+        persisted = list()
+        results = hndl.run_test_transfer(
+            func_mux=hndl.dummy_set_mux,
+            func_daq=hndl.dummy_set_daq,
+            func_sens=hndl.dummy_get_daq,
+            func_dut=lambda chnl: chnl + hndl.dummy_get_stim_value(),
+            func_beep=hndl.dummy_beep,
+            do_pipeline=True,
+            stages=[persisted.append],
+        )
+        self.assertEqual(results["ch01"].shape, set0.get_cycle_empty_array().shape)
+        np.testing.assert_array_equal(results["ch01"][1, :, 1], 1 + results["stim"])
+        self.assertEqual(len(persisted), 2 * set0.num_rpt * set0.get_num_steps())
+
+    def test_run_transfer_stimulus_major(self):
+        set0 = deepcopy(settings)
+        set0.adc_rang = [0.0, 5.0]
+        set0.delta_steps = 0.5
+        set0.num_rpt = 2
+        set0.sleep_sec = 0.0
+
+        hndl = CharacterizationADC(path2yaml=get_path_to_project("temp_config") / "adc")
+        hndl.settings = set0
+        num_settle = []
+        results = hndl.run_test_transfer_stimulus_major(
+            func_mux=hndl.dummy_set_mux,
+            func_daq=lambda data: num_settle.append(data),
+            func_sens=hndl.dummy_get_daq,
+            func_dut=lambda chnl: 100 * chnl + hndl.dummy_get_stim_value(),
+            func_beep=hndl.dummy_beep,
+        )
+        self.assertTrue(len(results) == 1 + len(set0.adc_chnl))
+        self.assertEqual(len(num_settle), set0.num_rpt * set0.get_num_steps())
+        self.assertEqual(results["ch03"].shape, set0.get_cycle_empty_array().shape)
+        np.testing.assert_array_almost_equal(results["ch02"][1, :, 0], 200 + results["stim"])
+
+    def test_run_transfer_stimulus_major_vector(self):
+        set0 = deepcopy(settings)
+        set0.adc_rang = [0.0, 5.0]
+        set0.delta_steps = 1.0
+        set0.sleep_sec = 0.0
+
+        hndl = CharacterizationADC(path2yaml=get_path_to_project("temp_config") / "adc")
+        hndl.settings = set0
+        chnl = np.array(set0.adc_chnl, dtype=float)
+        for func_dut in [
+            lambda: chnl + hndl.dummy_get_stim_value(),
+            lambda: np.tile((chnl + hndl.dummy_get_stim_value())[:, None], (1, set0.daq_ovr)),
+        ]:
+            results = hndl.run_test_transfer_stimulus_major(
+                func_mux=hndl.dummy_set_mux,
+                func_daq=hndl.dummy_set_daq,
+                func_sens=hndl.dummy_get_daq,
+                func_dut=func_dut,
+                func_beep=hndl.dummy_beep,
+                vector_dut=True,
+            )
+            self.assertEqual(results["ch01"].shape, set0.get_cycle_empty_array().shape)
+            np.testing.assert_array_almost_equal(results["ch01"][0, :, -1], 1 + results["stim"])
+
+    def test_run_transfer_converged(self):
+        set0 = deepcopy(settings)
+        set0.adc_rang = [0.0, 5.0]
+        set0.delta_steps = 1.0
+        set0.num_rpt = 5
+        set0.daq_ovr = 16
+        set0.sleep_sec = 0.0
+
+        hndl = CharacterizationADC(path2yaml=get_path_to_project("temp_config") / "adc")
+        hndl.settings = set0
+        results, confidence = hndl.run_test_transfer_converged(
+            func_mux=hndl.dummy_set_mux,
+            func_daq=hndl.dummy_set_daq,
+            func_dut=lambda chnl: chnl + hndl.dummy_get_stim_value(),
+            func_beep=hndl.dummy_beep,
+            sem_target=0.01,
+            num_max=set0.daq_ovr,
+        )
+        self.assertTrue(len(results) == len(confidence) == 1 + len(set0.adc_chnl))
+        self.assertEqual(results["ch00"].shape, (2, set0.get_num_steps(), set0.daq_ovr))
+        self.assertEqual(confidence["ch00"].shape, (2, set0.get_num_steps()))
+        np.testing.assert_array_equal(confidence["ch01"], np.zeros_like(confidence["ch01"]))
+
+    def test_run_transfer_converged_default_settings(self):
+        set0 = replace(DefaultSettingsADC, adc_chnl=[0], delta_steps=1.0, sleep_sec=0.0)
+        hndl = CharacterizationADC(path2yaml=get_path_to_project("temp_config") / "adc")
+        hndl.settings = set0
+        results, confidence = hndl.run_test_transfer_converged(
+            func_mux=hndl.dummy_set_mux,
+            func_daq=hndl.dummy_set_daq,
+            func_dut=lambda chnl: hndl.dummy_get_stim_value() + hndl.dummy_get_daq(),
+            func_beep=hndl.dummy_beep,
+            sem_target=1e-9,
+            num_max=4,
+        )
+        self.assertEqual(results["ch00"].shape, (set0.num_rpt, set0.get_num_steps(), 4))
+        self.assertFalse(np.any(np.isnan(results["ch00"])))
+
+    def test_run_dynamic(self):
+        set0 = deepcopy(settings)
+        set0.adc_chnl = [0, 1]
+        set0.sleep_sec = 0.0
+        fs = 1e4
+        num_samples = 1024
+        hndl = CharacterizationADC(path2yaml=get_path_to_project("temp_config") / "adc")
+        hndl.settings = set0
+
+        gen = {"freq": 0.0, "ampl": 0.0}
+        rng = np.random.default_rng(42)
+
+        def capture(chnl: int, num: int) -> np.ndarray:
+            time = np.arange(num) / fs
+            sig = gen["ampl"] * np.sin(2 * np.pi * gen["freq"] * time)
+            sig += 0.01 * gen["ampl"] * (1 + chnl) * np.sin(2 * np.pi * 3 * gen["freq"] * time)
+            return 2**15 + 2**14 * sig + rng.normal(0, 0.5, num)
+
+        frequencies = fs * np.array([31, 67, 127]) / num_samples
+        amplitudes = np.array([0.5, 1.0])
+        results, metrics = hndl.run_test_dynamic(
+            func_mux=hndl.dummy_set_mux,
+            func_gen_function=lambda waveform: None,
+            func_gen_offset=hndl.dummy_set_daq,
+            func_gen_freq=lambda freq: gen.update({"freq": freq}),
+            func_gen_ampl=lambda ampl: gen.update({"ampl": ampl}),
+            func_capture=capture,
+            func_beep=hndl.dummy_beep,
+            frequencies=frequencies,
+            amplitudes=amplitudes,
+            fs=fs,
+            num_samples=num_samples,
+        )
+        self.assertEqual(results["ch01"].shape, (3, 2, num_samples))
+        self.assertEqual(metrics["ch00"].thd.shape, (3, 2))
+        np.testing.assert_array_almost_equal(metrics["ch00"].freq_fund[:, 0], frequencies)
+        np.testing.assert_array_almost_equal(metrics["ch00"].thd, np.zeros((3, 2)) - 40.0, decimal=1)
+        np.testing.assert_array_almost_equal(metrics["ch01"].thd, np.zeros((3, 2)) - 33.98, decimal=1)
+        self.assertTrue(np.all(metrics["ch00"].snr[:, 1] > metrics["ch00"].snr[:, 0]))
+
 
 if __name__ == "__main__":
     unittest.main()
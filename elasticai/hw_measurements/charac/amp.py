@@ -8,7 +8,9 @@ from time import sleep
 import numpy as np
 from tqdm import tqdm
 
+from elasticai.hw_measurements import FrequencyResponse, MetricDynamic, MetricFrequencyResponse
 from elasticai.hw_measurements._helper.yaml import YamlConfigHandler
+from elasticai.hw_measurements.charac.coherent import CoherentSamplingPlanner
 from elasticai.hw_measurements.charac.common import CharacterizationCommon
 from elasticai.hw_measurements.plots import plot_transfer_function_metric, plot_transfer_function_norm
 from elasticai.hw_measurements.process.data import MetricCalculator
@@ -93,6 +95,7 @@ class CharacterizationAmplifier(CharacterizationCommon):
     settings: SettingsAmplifier
     _input_val: float
     _logger: Logger
+    _num_reads_per_step: int = 2
 
     def __init__(self, path2yaml: Path = Path("config")) -> None:
         """Class for handling the measurement routine for characterizing an analog amplifier
@@ -148,6 +151,129 @@ class CharacterizationAmplifier(CharacterizationCommon):
             func_beep()
         return results
 
+    def run_test_fra_campaign(
+        self,
+        func_set_offset,
+        func_set_amplitude,
+        func_run_fra,
+        func_beep,
+        offsets: np.ndarray | list,
+        amplitudes: np.ndarray | list,
+    ) -> tuple[FrequencyResponse, MetricFrequencyResponse]:
+        """Function for running an automated Frequency Response Analysis (FRA) campaign over input offset and stimulus amplitude
+        :param func_set_offset:     Function for applying the input offset voltage on the DUT with input params (offset)
+        :param func_set_amplitude:  Function for applying the stimulus amplitude of the FRA generator with input params (amplitude)
+        :param func_run_fra:        Function for running one FRA sweep and returning the dataclass FrequencyResponse (like: from load_fra_data)
+        :param func_beep:           Function for do a beep in DAQ
+        :param offsets:             List / Numpy array with input offset voltages
+        :param amplitudes:          List / Numpy array with stimulus amplitudes
+        :return:                    Tuple with [0] dataclass FrequencyResponse with stacked gain/phase [shape: (num_offset, num_ampl, num_freq)]
+                                    on the frequency grid of the first sweep and [1] dataclass MetricFrequencyResponse [shape: (num_offset, num_ampl)]
+        """
+        offsets = np.asarray(offsets, dtype=float)
+        amplitudes = np.asarray(amplitudes, dtype=float)
+        freq = np.zeros(shape=(0,), dtype=float)
+        gain = np.zeros(shape=(0,), dtype=float)
+        phase = np.zeros(shape=(0,), dtype=float)
+
+        for off_idx, offset in enumerate(tqdm(offsets, ncols=100, desc="Process FRA campaign")):
+            func_set_offset(offset)
+            sleep(self.settings.sleep_sec)
+            for amp_idx, amplitude in enumerate(amplitudes):
+                func_set_amplitude(amplitude)
+                fra = func_run_fra()
+                if not freq.size:
+                    freq = np.asarray(fra.freq, dtype=float)
+                    gain = np.zeros(shape=(offsets.size, amplitudes.size, freq.size), dtype=float)
+                    phase = np.zeros_like(gain)
+                if fra.freq.size == freq.size and np.allclose(fra.freq, freq):
+                    gain[off_idx, amp_idx] = fra.gain
+                    phase[off_idx, amp_idx] = fra.phase
+                else:
+                    logf = np.log10(fra.freq)
+                    gain[off_idx, amp_idx] = np.interp(np.log10(freq), logf, fra.gain)
+                    phase[off_idx, amp_idx] = np.interp(np.log10(freq), logf, fra.phase)
+                self._logger.debug(f"FRA done @ offset {offset:.3f} and amplitude {amplitude:.3f}")
+            func_beep()
+
+        cube = FrequencyResponse(freq=freq, gain=gain, phase=phase)
+        return cube, MetricCalculator().calculate_fra_metrics(cube)
+
+    def run_test_thd_sweep(
+        self,
+        func_gen_function,
+        func_gen_offset,
+        func_gen_freq,
+        func_gen_ampl,
+        func_capture,
+        func_beep,
+        frequencies: np.ndarray,
+        amplitudes: np.ndarray,
+        fs: float,
+        num_samples: int,
+        num_harmonics: int = 4,
+        method_window: str = "hanning",
+        compression_db: float = 1.0,
+        do_coherent: bool = False,
+    ) -> tuple[dict, dict]:
+        """Function for characterizing the Total Harmonic Distortion (THD) of the amplifier over stimulus frequency and amplitude.
+        All captures are stacked and analysed with one batched FFT after the sweep.
+        :param func_gen_function: Function for selecting the generator waveform with input params (waveform), called with 'SINE'
+        :param func_gen_offset: Function for setting the generator offset with input params (offset), called with common mode voltage
+        :param func_gen_freq:   Function for setting the generator frequency with input params (frequency)
+        :param func_gen_ampl:   Function for setting the generator amplitude with input params (amplitude)
+        :param func_capture:    Function for capturing a block of the amplifier output (e.g. from scope) with input params (num_samples)
+        :param func_beep:       Function for do a beep in DAQ
+        :param frequencies:     Numpy array with stimulus frequencies [Hz]
+        :param amplitudes:      Numpy array with increasing stimulus amplitudes [V]
+        :param fs:              Sampling rate of the capture device [Hz]
+        :param num_samples:     Integer with number of samples per capture
+        :param num_harmonics:   Number of used harmonics (excl. fundamental) for calculating THD
+        :param method_window:   Selected window for spectral analysis
+        :param compression_db:  Floating with gain compression (in dB) for extracting the compression point
+        :param do_coherent:     If True, the frequencies are shifted to coherent frequencies (co-prime number of cycles in num_samples),
+                                recommended with rectangular window (method_window=''), num_samples must reach the
+                                frequency tolerance of the planner (otherwise ValueError)
+        :return:                Tuple with two dictionaries
+                                [0]: Captures ['freq': frequencies, 'ampl': amplitudes, 'capture': samples with shape (num_freq, num_ampl, num_samples)]
+                                [1]: Metrics ['thd': THD map (num_freq, num_ampl) in dB, 'gain': gain map (num_freq, num_ampl) in dB,
+                                    'ampl_compression': input amplitude at compression point (num_freq, ), 'dynamic': Dataclass MetricDynamic]
+        """
+        if do_coherent:
+            plans = CoherentSamplingPlanner(fs=fs).plan_sweep(
+                frequencies=frequencies, num_samples=num_samples
+            )
+            frequencies = np.array([plan.freq for plan in plans])
+        func_gen_function("SINE")
+        func_gen_offset(self.settings.get_common_mode_voltage())
+
+        captures = np.zeros(shape=(frequencies.size, amplitudes.size, num_samples), dtype=float)
+        for freq_idx, freq in enumerate(tqdm(frequencies, ncols=100, desc="Process THD sweep")):
+            func_gen_freq(freq)
+            for ampl_idx, ampl in enumerate(amplitudes):
+                func_gen_ampl(ampl)
+                sleep(self.settings.sleep_sec)
+                captures[freq_idx, ampl_idx] = func_capture(num_samples)
+            func_beep()
+
+        self._logger.info("Calculating the THD maps")
+        hndl = MetricCalculator()
+        metric: MetricDynamic = hndl.calculate_dynamic_metrics(
+            signal=captures, fs=fs, num_harmonics=num_harmonics, method_window=method_window
+        )
+        metrics = {
+            "thd": metric.thd,
+            "gain": 20 * np.log10(metric.ampl_fund / amplitudes),
+            "ampl_compression": hndl.calculate_compression_point(
+                ampl_input=amplitudes, ampl_output=metric.ampl_fund, compression_db=compression_db
+            ),
+            "dynamic": metric,
+        }
+        for _ in range(4):
+            sleep(0.5)
+            func_beep()
+        return {"freq": frequencies, "ampl": amplitudes, "capture": captures}, metrics
+
     def plot_characteristic_results_direct(self, data: dict, file_name: str, path: str) -> None:
         """Function for plotting the loaded data files
         :param data:        Dictionary with measurement data ['stim', 'ch<x>', ...]
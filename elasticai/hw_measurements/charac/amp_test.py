@@ -3,7 +3,7 @@ from copy import deepcopy
 
 import numpy as np
 
-from elasticai.hw_measurements import get_path_to_project
+from elasticai.hw_measurements import FrequencyResponse, get_path_to_project
 
 from .amp import CharacterizationAmplifier, SettingsAmplifier
 
@@ -93,6 +93,111 @@ class TestAmplifier(unittest.TestCase):
         )
         self.assertTrue(len(results) == 1 + set0.num_rpt)
 
+    def test_run_fra_campaign(self):
+        path2yaml = get_path_to_project("temp_config") / "amp"
+        hndl = CharacterizationAmplifier(path2yaml=path2yaml)
+        hndl.settings = deepcopy(settings)
+        hndl.settings.sleep_sec = 0.0
+
+        state = {"offset": 0.0, "ampl": 0.0, "num": 0}
+        freq = np.logspace(1, 6, 51)
+
+        def run_fra() -> FrequencyResponse:
+            # Compression with amplitude, pole shift with offset; second sweep uses other grid
+            fpole = 1e3 * (1 + state["offset"])
+            a0 = 10.0 / (1 + state["ampl"])
+            f = freq if state["num"] == 0 else np.logspace(1, 6, 101)
+            state["num"] += 1
+            h = a0 / (1 + 1j * f / fpole)
+            return FrequencyResponse(f, 20 * np.log10(np.abs(h)), np.rad2deg(np.angle(h)))
+
+        cube, metric = hndl.run_test_fra_campaign(
+            func_set_offset=lambda val: state.update({"offset": val}),
+            func_set_amplitude=lambda val: state.update({"ampl": val}),
+            func_run_fra=run_fra,
+            func_beep=hndl.dummy_beep,
+            offsets=[0.0, 1.0],
+            amplitudes=[0.0, 0.5, 1.0],
+        )
+        self.assertEqual(state["num"], 6)
+        self.assertEqual(cube.gain.shape, (2, 3, 51))
+        np.testing.assert_array_equal(cube.freq, freq)
+        self.assertEqual(metric.bandwidth.shape, (2, 3))
+        np.testing.assert_allclose(metric.bandwidth[:, 0], [1e3, 2e3], rtol=0.03)
+        np.testing.assert_allclose(
+            metric.gain_max[0], 20 * np.log10(10.0 / (1 + np.array([0.0, 0.5, 1.0]))), atol=0.01
+        )
+
+    def test_run_thd_sweep(self):
+        path2yaml = get_path_to_project("temp_config") / "amp"
+        hndl = CharacterizationAmplifier(path2yaml=path2yaml)
+        hndl.settings = deepcopy(settings)
+        hndl.settings.sleep_sec = 0.0
+
+        fs = 1e5
+        num_samples = 2000
+        state = {"freq": 0.0, "ampl": 0.0}
+
+        def capture(num: int) -> np.ndarray:
+            # Amplifier with gain 2 and soft clipping at 1 V
+            t = np.arange(num) / fs
+            return np.tanh(2 * state["ampl"] * np.sin(2 * np.pi * state["freq"] * t))
+
+        frequencies = np.array([1e3, 2e3])
+        amplitudes = np.array([0.01, 0.1, 0.3, 0.5, 1.0])
+        results, metrics = hndl.run_test_thd_sweep(
+            func_gen_function=lambda val: None,
+            func_gen_offset=lambda val: None,
+            func_gen_freq=lambda val: state.update({"freq": val}),
+            func_gen_ampl=lambda val: state.update({"ampl": val}),
+            func_capture=capture,
+            func_beep=hndl.dummy_beep,
+            frequencies=frequencies,
+            amplitudes=amplitudes,
+            fs=fs,
+            num_samples=num_samples,
+            method_window="",
+        )
+        self.assertEqual(results["capture"].shape, (2, 5, num_samples))
+        self.assertEqual(metrics["thd"].shape, (2, 5))
+        self.assertTrue(np.all(np.diff(metrics["thd"], axis=-1) > 0.0))
+        np.testing.assert_allclose(metrics["gain"][:, 0], 20 * np.log10(2.0), atol=0.01)
+        self.assertEqual(metrics["ampl_compression"].shape, (2,))
+        self.assertTrue(np.all((metrics["ampl_compression"] > 0.1) & (metrics["ampl_compression"] < 0.5)))
+
+    def test_run_thd_sweep_coherent(self):
+        path2yaml = get_path_to_project("temp_config") / "amp"
+        hndl = CharacterizationAmplifier(path2yaml=path2yaml)
+        hndl.settings = deepcopy(settings)
+        hndl.settings.sleep_sec = 0.0
+
+        fs = 1e5
+        num_samples = 8192
+        state = {"freq": 0.0, "ampl": 0.0}
+
+        def capture(num: int) -> np.ndarray:
+            t = np.arange(num) / fs
+            return 2 * state["ampl"] * np.sin(2 * np.pi * state["freq"] * t)
+
+        results, metrics = hndl.run_test_thd_sweep(
+            func_gen_function=lambda val: None,
+            func_gen_offset=lambda val: None,
+            func_gen_freq=lambda val: state.update({"freq": val}),
+            func_gen_ampl=lambda val: state.update({"ampl": val}),
+            func_capture=capture,
+            func_beep=hndl.dummy_beep,
+            frequencies=np.array([1234.0, 5678.0]),
+            amplitudes=np.array([0.1, 0.5]),
+            fs=fs,
+            num_samples=num_samples,
+            method_window="",
+            do_coherent=True,
+        )
+        num_cycles = results["freq"] * num_samples / fs
+        np.testing.assert_allclose(num_cycles, np.round(num_cycles), atol=1e-3)
+        np.testing.assert_allclose(results["freq"], [1234.0, 5678.0], rtol=0.01)
+        np.testing.assert_allclose(metrics["gain"], 20 * np.log10(2.0), atol=1e-4)
+
 
 if __name__ == "__main__":
     unittest.main()
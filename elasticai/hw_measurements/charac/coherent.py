@@ -0,0 +1,143 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+from logging import Logger, getLogger
+from math import gcd
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class CoherentPlan:
+    """Class with the coherent stimulus frequency and record length of one capture
+    Attributes:
+        freq_desired:   Floating with desired stimulus frequency [Hz]
+        freq:           Floating with coherent generator frequency on the resolution grid [Hz]
+        num_cycles:     Integer with number of signal periods in the record (co-prime to num_samples)
+        num_samples:    Integer with record length of the capture
+        fs:             Floating with sampling rate of the capture device [Hz]
+        cycle_error:    Floating with remaining non-integer part of cycles due to the generator resolution
+    """
+
+    freq_desired: float
+    freq: float
+    num_cycles: int
+    num_samples: int
+    fs: float
+    cycle_error: float
+
+
+class CoherentSamplingPlanner:
+    _logger: Logger
+    _fs: float
+    _num_samples_min: int
+    _tol_freq: float
+    _freq_resolution: float
+    _power_of_two: bool
+    num_candidates: int = 16
+
+    def __init__(
+        self,
+        fs: float,
+        num_samples_min: int = 256,
+        tol_freq: float = 0.01,
+        freq_resolution: float = 0.001,
+        power_of_two: bool = True,
+    ) -> None:
+        """Class for planning coherent captures with integer and co-prime number of signal periods, so spectra can be
+        calculated with rectangular window (method_window='') and minimal record length
+        :param fs:              Floating with sampling rate of the DUT or scope [Hz]
+        :param num_samples_min: Integer with minimal record length
+        :param tol_freq:        Floating with relative tolerance between desired and coherent frequency
+        :param freq_resolution: Floating with frequency resolution of the generator [Hz] (like: 0.001 for DriverMXO4X.gen_frequency)
+        :param power_of_two:    If True, the record length is a power of two (fast FFT)
+        :return:                None
+        """
+        self._logger = getLogger(__name__)
+        self._fs = fs
+        self._num_samples_min = num_samples_min
+        self._tol_freq = tol_freq
+        self._freq_resolution = freq_resolution
+        self._power_of_two = power_of_two
+
+    def get_num_samples(self, freq_desired: float) -> int:
+        """Function for getting the minimal record length for reaching the frequency tolerance with co-prime number of cycles
+        :param freq_desired:    Floating with desired stimulus frequency [Hz]
+        :return:                Integer with record length
+        """
+        num_samples = max(self._num_samples_min, int(np.ceil(self._fs / (self._tol_freq * freq_desired))))
+        if self._power_of_two:
+            num_samples = int(2 ** np.ceil(np.log2(num_samples)))
+        return num_samples
+
+    def __get_generator_freq(self, num_cycles: int, num_samples: int) -> tuple[float, float]:
+        """Getting the generator frequency on the resolution grid and the remaining cycle error"""
+        freq = num_cycles * self._fs / num_samples
+        if self._freq_resolution > 0.0:
+            freq = round(freq / self._freq_resolution) * self._freq_resolution
+        return freq, abs(freq * num_samples / self._fs - num_cycles)
+
+    def plan(self, freq_desired: float, num_samples: int | None = None) -> CoherentPlan:
+        """Function for planning the coherent generator frequency and record length of one capture.
+        From the co-prime numbers of cycles within the tolerance, the one with smallest cycle error on the generator grid
+        (and then closest to the desired frequency) is selected.
+        :param freq_desired:    Floating with desired stimulus frequency [Hz]
+        :param num_samples:     Integer with fixed record length, None for minimal record length
+        :return:                Dataclass CoherentPlan
+        """
+        if not 0.0 < freq_desired < self._fs / 2:
+            raise ValueError(f"Frequency {freq_desired} Hz is not in range (0, {self._fs / 2}) Hz")
+        num_samples = self.get_num_samples(freq_desired) if num_samples is None else num_samples
+        cycles_desired = freq_desired * num_samples / self._fs
+        cycles_max = cycles_desired * self._tol_freq
+
+        candidates = list()
+        for delta in range(-self.num_candidates, self.num_candidates + 1):
+            num_cycles = int(round(cycles_desired)) + delta
+            if not 0 < num_cycles < num_samples / 2 or gcd(num_cycles, num_samples) != 1:
+                continue
+            if abs(num_cycles - cycles_desired) > cycles_max:
+                continue
+            freq, cycle_error = self.__get_generator_freq(num_cycles, num_samples)
+            candidates.append((round(cycle_error, 9), abs(num_cycles - cycles_desired), num_cycles, freq))
+        if not candidates:
+            raise ValueError(
+                f"No coherent frequency within tolerance {self._tol_freq} available for {freq_desired} Hz with "
+                f"{num_samples} samples - use at least {self.get_num_samples(freq_desired)} samples"
+            )
+
+        cycle_error, _, num_cycles, freq = min(candidates)
+        self._logger.debug(
+            f"Coherent frequency {freq} Hz with {num_cycles} cycles in {num_samples} samples"
+        )
+        return CoherentPlan(
+            freq_desired=freq_desired,
+            freq=freq,
+            num_cycles=num_cycles,
+            num_samples=num_samples,
+            fs=self._fs,
+            cycle_error=cycle_error,
+        )
+
+    def plan_sweep(self, frequencies: np.ndarray, num_samples: int | None = None) -> list[CoherentPlan]:
+        """Function for planning a frequency sweep with common record length (capture config is not changed in sweep)
+        :param frequencies:     Numpy array with desired stimulus frequencies [Hz]
+        :param num_samples:     Integer with fixed record length, None for minimal record length of all frequencies
+        :return:                List with dataclass CoherentPlan
+        """
+        if num_samples is None:
+            num_samples = max(self.get_num_samples(freq) for freq in frequencies)
+        return [self.plan(freq, num_samples=num_samples) for freq in frequencies]
+
+    @staticmethod
+    def apply(
+        plan: CoherentPlan, func_gen_freq: Callable, func_set_capture: Callable | None = None
+    ) -> None:
+        """Function for pushing the plan into the generator and the capture config
+        :param plan:                Dataclass CoherentPlan
+        :param func_gen_freq:       Function for setting the generator frequency with input params (frequency), like DriverMXO4X.gen_frequency
+        :param func_set_capture:    Function for setting the capture config with input params (num_samples, fs), None if not used
+        :return:                    None
+        """
+        func_gen_freq(plan.freq)
+        if func_set_capture is not None:
+            func_set_capture(plan.num_samples, plan.fs)
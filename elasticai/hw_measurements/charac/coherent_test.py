@@ -0,0 +1,64 @@
+from math import gcd
+
+import numpy as np
+import pytest
+
+from elasticai.hw_measurements.charac.coherent import CoherentSamplingPlanner
+from elasticai.hw_measurements.process.data import MetricCalculator
+
+
+def test_plan_minimal_record_length():
+    plan = CoherentSamplingPlanner(fs=1e6, tol_freq=0.01).plan(1234.0)
+    assert plan.num_samples == 2**17
+    assert gcd(plan.num_cycles, plan.num_samples) == 1
+    assert abs(plan.freq - plan.freq_desired) <= 0.01 * plan.freq_desired
+    assert plan.cycle_error < 1e-3
+    assert round(plan.freq / 0.001) * 0.001 == pytest.approx(plan.freq)
+
+
+def test_plan_fixed_record_length():
+    planner = CoherentSamplingPlanner(fs=1e5, freq_resolution=0.0)
+    plan = planner.plan(1000.0, num_samples=4096)
+    assert plan.num_samples == 4096
+    assert plan.num_cycles == 41
+    assert plan.freq == pytest.approx(41 * 1e5 / 4096)
+    assert plan.cycle_error == pytest.approx(0.0, abs=1e-9)
+
+
+def test_plan_sweep_common_length():
+    plans = CoherentSamplingPlanner(fs=1e6).plan_sweep(np.array([1e3, 1e4, 1e5]))
+    assert len({plan.num_samples for plan in plans}) == 1
+    assert all(gcd(plan.num_cycles, plan.num_samples) == 1 for plan in plans)
+
+
+def test_plan_fixed_record_length_outside_tolerance():
+    planner = CoherentSamplingPlanner(fs=1e5, tol_freq=0.01)
+    with pytest.raises(ValueError, match="tolerance"):
+        planner.plan(1234.0, num_samples=2048)
+    plan = planner.plan(1234.0, num_samples=planner.get_num_samples(1234.0))
+    assert abs(plan.freq - plan.freq_desired) <= 0.01 * plan.freq_desired
+
+
+def test_plan_wrong_frequency():
+    with pytest.raises(ValueError):
+        CoherentSamplingPlanner(fs=1e3).plan(600.0)
+
+
+def test_apply_plan_rectangular_spectrum():
+    fs = 1e5
+    plan = CoherentSamplingPlanner(fs=fs, freq_resolution=0.0).plan(1234.5, num_samples=8192)
+    state = dict()
+    CoherentSamplingPlanner.apply(
+        plan,
+        func_gen_freq=lambda freq: state.update({"freq": freq}),
+        func_set_capture=lambda num, fs: state.update({"num": num, "fs": fs}),
+    )
+    assert state == {"freq": plan.freq, "num": 8192, "fs": fs}
+
+    t = np.arange(state["num"]) / fs
+    signal = np.sin(2 * np.pi * state["freq"] * t) + 1e-5 * np.sin(2 * np.pi * 2 * state["freq"] * t)
+    rslt = MetricCalculator.calculate_dynamic_metrics(
+        signal=signal, fs=fs, num_harmonics=1, method_window=""
+    )
+    assert float(rslt.thd) == pytest.approx(-100.0, abs=1e-3)
+    assert float(rslt.ampl_fund) == pytest.approx(1.0, abs=1e-9)
@@ -1,13 +1,29 @@
 from logging import Logger, getLogger
 from pathlib import Path
 from random import randint, random
+from time import sleep
 
 import numpy as np
+from tqdm import tqdm
+
+from elasticai.hw_measurements import MetricStepResponse
+from elasticai.hw_measurements._helper.yaml import YamlConfigHandler
+from elasticai.hw_measurements.charac.pipeline import (
+    AcquisitionPipeline,
+    PipelineSample,
+    PipelineStatistics,
+)
+from elasticai.hw_measurements.charac.planner import LatencyProfile, SweepPlanner
+from elasticai.hw_measurements.charac.ranging import RangePlan, RangePlanner
+from elasticai.hw_measurements.process.catalog import RunCatalog
+from elasticai.hw_measurements.process.data import MetricCalculator
+from elasticai.hw_measurements.process.results import save_results_hdf5
 
 
 class CharacterizationCommon:
     _input_val: float | int
     _logger: Logger
+    _num_reads_per_step: int = 1
 
     def __init__(self) -> None:
         """Common class with functions used in all characterization methods"""
@@ -70,17 +86,314 @@ class CharacterizationCommon:
         """
         pass
 
-    def save_results(self, file_name: str, settings: object, data: dict, folder_name: Path) -> None:
+    @staticmethod
+    def calculate_standard_error(samples: np.ndarray, axis: int = -1) -> np.ndarray:
+        """Function for calculating the standard error of the mean (SEM), NaN entries (not measured) are ignored
+        :param samples: Numpy array with samples
+        :param axis:    Integer with axis to reduce
+        :return:        Numpy array with standard error of the mean
+        """
+        num = np.sum(~np.isnan(samples), axis=axis)
+        return np.nanstd(samples, axis=axis, ddof=1) / np.sqrt(num)
+
+    @staticmethod
+    def _check_num_samples_converged(num_min: int, num_max: int) -> None:
+        """Checking the sample bounds of the convergence-driven sampling (SEM needs at least two samples)"""
+        if not 2 <= num_min <= num_max:
+            raise ValueError(
+                f"Convergence-driven sampling needs 2 <= num_min <= num_max, got num_min={num_min} and num_max={num_max}"
+            )
+
+    def sample_until_converged(
+        self, func_read, sem_target: float, num_min: int, num_max: int
+    ) -> tuple[np.ndarray, float]:
+        """Function for reading samples until the standard error of the mean drops below a target value
+        :param func_read:   Function for reading one sample
+        :param sem_target:  Floating value with target standard error of the mean
+        :param num_min:     Integer with minimal number of samples (at least 2)
+        :param num_max:     Integer with maximal number of samples
+        :return:            Tuple with [0] numpy array of samples with size num_max (not measured samples are NaN) and [1] achieved SEM
+        """
+        self._check_num_samples_converged(num_min=num_min, num_max=num_max)
+        samples = np.full(shape=(num_max,), fill_value=np.nan, dtype=float)
+        sem = np.inf
+        for idx in range(num_max):
+            samples[idx] = func_read()
+            if idx + 1 >= num_min:
+                sem = float(self.calculate_standard_error(samples[: idx + 1]))
+                if sem <= sem_target:
+                    break
+        return samples, sem
+
+    def sweep_until_converged(
+        self,
+        stimuli: np.ndarray,
+        func_set,
+        func_read,
+        func_beep,
+        sem_target: float,
+        num_min: int,
+        num_max: int,
+        num_rpt: int,
+        sleep_sec: float,
+        desc: str = "",
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Function for sweeping the stimuli with convergence-driven oversampling and repetitions.
+        Each step is sampled until its SEM is below sem_target (within [num_min, num_max] samples). Further
+        repetitions are skipped if the SEM of the repetition-to-repetition spread is below sem_target for all steps.
+        :param stimuli:     Numpy array with stimuli values
+        :param func_set:    Function for applying one stimuli value with input params (data)
+        :param func_read:   Function for reading one sample
+        :param func_beep:   Function for do a beep in DAQ
+        :param sem_target:  Floating value with target standard error of the mean
+        :param num_min:     Integer with minimal number of samples per step (at least 2)
+        :param num_max:     Integer with maximal number of samples per step
+        :param num_rpt:     Integer with maximal number of repetitions
+        :param sleep_sec:   Sleeping seconds after applying each stimuli value
+        :param desc:        String with description for progress bar
+        :return:            Tuple with [0] numpy array of results [shape: (num_rpt_done, stimuli.size, num_max)]
+                            (not measured samples are NaN) and [1] numpy array with achieved SEM [shape: (num_rpt_done, stimuli.size)]
+        """
+        self._check_num_samples_converged(num_min=num_min, num_max=num_max)
+        results = np.full(shape=(num_rpt, stimuli.size, num_max), fill_value=np.nan, dtype=float)
+        sem = np.full(shape=(num_rpt, stimuli.size), fill_value=np.nan, dtype=float)
+        for rpt_idx in range(num_rpt):
+            for val_idx, data in enumerate(
+                tqdm(stimuli, ncols=100, desc=f"{desc} @ repetition {1 + rpt_idx}/{num_rpt}")
+            ):
+                self._input_val = data
+                func_set(data)
+                sleep(sleep_sec)
+                results[rpt_idx, val_idx], sem[rpt_idx, val_idx] = self.sample_until_converged(
+                    func_read=func_read, sem_target=sem_target, num_min=num_min, num_max=num_max
+                )
+            func_beep()
+
+            if rpt_idx > 0:
+                sem_rpt = self.calculate_standard_error(
+                    np.nanmean(results[: rpt_idx + 1], axis=2), axis=0
+                )
+                if np.all(sem_rpt <= sem_target):
+                    self._logger.debug(f"Repetitions converged after {1 + rpt_idx}/{num_rpt}")
+                    return results[: rpt_idx + 1], sem[: rpt_idx + 1]
+        return results, sem
+
+    def run_sweep_pipelined(
+        self,
+        stimuli: np.ndarray,
+        func_set,
+        func_read,
+        num_rpt: int,
+        daq_ovr: int,
+        sleep_sec: float,
+        stages: list | tuple = (),
+        queue_size: int = 256,
+        period_sec: float = 0.0,
+        drop_on_full: bool = False,
+        func_beep=None,
+        desc: str = "",
+    ) -> tuple[np.ndarray, PipelineStatistics]:
+        """Function for sweeping the stimuli with decoupled acquisition (instrument thread) and processing (consumer threads).
+        Bookkeeping into the result array and the progress bar are consumer stages, additional stages (like saving or plotting) can be added.
+        :param stimuli:         Numpy array with stimuli values of one repetition
+        :param func_set:        Function for applying one stimuli value with input params (data)
+        :param func_read:       Function for reading one sample
+        :param num_rpt:         Integer of completes cycles to run DAQ
+        :param daq_ovr:         Integer number for oversampling of DAQ system
+        :param sleep_sec:       Sleeping seconds after applying each stimuli value
+        :param stages:          List or tuple with additional consumer functions with input params (sample: PipelineSample),
+                                the sample value is a numpy array with daq_ovr samples of step (sample.index)
+        :param queue_size:      Integer with maximal number of samples in the queue of each stage
+        :param period_sec:      Floating with fixed step period of acquisition in seconds (0.0: as fast as possible)
+        :param drop_on_full:    If True, samples are dropped for full stages (not stored results are NaN), otherwise the acquisition is blocked
+        :param func_beep:       Function for do a beep in DAQ after each repetition (called in the instrument thread, None: no beep)
+        :param desc:            String with description for progress bar
+        :return:                Tuple with [0] numpy array of results [shape: (num_rpt, stimuli.size, daq_ovr)] and [1] dataclass PipelineStatistics
+        """
+        results = np.full(shape=(num_rpt, stimuli.size, daq_ovr), fill_value=np.nan, dtype=float)
+
+        def acquire(idx: int) -> np.ndarray:
+            data = stimuli[idx % stimuli.size]
+            self._input_val = data
+            func_set(data)
+            sleep(sleep_sec)
+            value = np.array([func_read() for _ in range(daq_ovr)], dtype=float)
+            if func_beep is not None and (idx + 1) % stimuli.size == 0:
+                func_beep()
+            return value
+
+        def reduce(sample: PipelineSample) -> None:
+            results[sample.index // stimuli.size, sample.index % stimuli.size] = sample.value
+
+        with tqdm(total=num_rpt * stimuli.size, ncols=100, desc=desc) as pbar:
+            stats = AcquisitionPipeline(
+                func_acquire=acquire,
+                stages=[reduce, lambda sample: pbar.update(1), *stages],
+                queue_size=queue_size,
+                period_sec=period_sec,
+                drop_on_full=drop_on_full,
+            ).run(num_steps=num_rpt * stimuli.size)
+        return results, stats
+
+    def run_test_step_response(
+        self,
+        func_reset,
+        func_step,
+        func_capture,
+        func_beep,
+        fs: float,
+        num_samples: int,
+        num_captures: int = 1,
+        do_average: bool = False,
+        pos_trigger: int | None = None,
+        settling_tol: float = 0.02,
+        func_arm=None,
+    ) -> tuple[np.ndarray, MetricStepResponse]:
+        """Function for characterizing the step response of a DUT (like amplifier stage or output of NGU/HMP supply)
+        :param func_reset:      Function for applying the initial level without inputs (like: set generator / NGU to low voltage)
+        :param func_step:       Function for triggering the step without inputs (like: set generator / NGU to high voltage)
+        :param func_capture:    Function for reading the captured transient from scope with input params (num_samples)
+        :param func_beep:       Function for do a beep in DAQ
+        :param fs:              Sampling rate of the capture device [Hz]
+        :param num_samples:     Integer with number of samples per capture
+        :param num_captures:    Integer with number of (segmented) captures
+        :param do_average:      If True, the captures are averaged before extracting the metrics (less noise)
+        :param pos_trigger:     Integer with sample index of the applied step in capture (None: first crossing of 10% level)
+        :param settling_tol:    Floating with relative tolerance band around the final value for settling (like: 0.02 for +/-2%)
+        :param func_arm:        Function for arming the single trigger of the scope before step without inputs, None if not required
+        :return:                Tuple with [0] numpy array with captures [shape: (num_captures, num_samples)] and
+                                [1] dataclass MetricStepResponse [shape: (num_captures, ) or (), if averaged]
+        """
+        captures = np.zeros(shape=(num_captures, num_samples), dtype=float)
+        for idx in tqdm(range(num_captures), ncols=100, desc="Process step response"):
+            func_reset()
+            if func_arm is not None:
+                func_arm()
+            func_step()
+            captures[idx] = func_capture(num_samples)
+        func_beep()
+
+        metric = MetricCalculator().calculate_step_response(
+            signal=np.mean(captures, axis=0) if do_average else captures,
+            fs=fs,
+            pos_trigger=pos_trigger,
+            settling_tol=settling_tol,
+        )
+        return captures, metric
+
+    def update_sleep_from_settling(
+        self, settling_time: np.ndarray | float, path2yaml: Path, yaml_name: str, margin: float = 2.0
+    ) -> float:
+        """Function for seeding the sleep_sec value of the settings and its YAML config from the measured settling time
+        :param settling_time:   Numpy array or floating with measured settling time(s) [s], the worst case is used
+        :param path2yaml:       Path to the folder with YAML config file
+        :param yaml_name:       String with name of YAML file (like: 'Config_TestAmplifier')
+        :param margin:          Floating with safety factor on the settling time
+        :return:                Floating with new sleep_sec value
+        """
+        sleep_sec = float(margin * np.nanmax(settling_time))
+        if np.isnan(sleep_sec):
+            raise ValueError("No valid settling time available")
+        settings = getattr(self, "settings", None)
+        if settings is not None:
+            settings.sleep_sec = sleep_sec
+        YamlConfigHandler(
+            yaml_template=settings if settings is not None else {"sleep_sec": sleep_sec},
+            path2yaml=path2yaml,
+            yaml_name=yaml_name,
+        ).update_dict({"sleep_sec": sleep_sec})
+        self._logger.info(f"Updated sleep_sec to {sleep_sec:.4f} s in {yaml_name}")
+        return sleep_sec
+
+    def run_sweep_ranged(
+        self,
+        stimuli: np.ndarray,
+        expected: np.ndarray,
+        func_set,
+        func_read,
+        func_set_range,
+        ranges: tuple | list,
+        num_rpt: int,
+        daq_ovr: int,
+        sleep_sec: float,
+        sleep_range_sec: float = 0.0,
+        keep_order: bool = False,
+        headroom: float = 0.95,
+        desc: str = "",
+    ) -> tuple[np.ndarray, RangePlan]:
+        """Function for sweeping the stimuli with fixed, pre-planned instrument ranges instead of autorange.
+        The steps are grouped by range to minimize the range switches, the results are stored in the original order.
+        :param stimuli:         Numpy array with stimuli values of one repetition
+        :param expected:        Numpy array with expected instrument value (DUT response) of each stimuli value
+        :param func_set:        Function for applying one stimuli value with input params (data)
+        :param func_read:       Function for reading one sample
+        :param func_set_range:  Function for setting the instrument range with input params (range) (like: set_voltage_range)
+        :param ranges:          Tuple with available ranges of the instrument (like: RangesDMM6500Voltage)
+        :param num_rpt:         Integer of completes cycles to run DAQ
+        :param daq_ovr:         Integer number for oversampling of DAQ system
+        :param sleep_sec:       Sleeping seconds after applying each stimuli value
+        :param sleep_range_sec: Sleeping seconds after each range switch
+        :param keep_order:      If True, the stimuli are applied in original order (ranges are still fixed per segment)
+        :param headroom:        Floating with maximal usage of the range before switching to next range
+        :param desc:            String with description for progress bar
+        :return:                Tuple with [0] numpy array of results [shape: (num_rpt, stimuli.size, daq_ovr)] and [1] dataclass RangePlan
+        """
+        plan = RangePlanner(ranges=ranges, headroom=headroom).plan(
+            expected=expected, keep_order=keep_order
+        )
+        results = np.zeros(shape=(num_rpt, stimuli.size, daq_ovr), dtype=float)
+        for rpt_idx in range(num_rpt):
+            for start, stop, rang in tqdm(
+                plan.segments, ncols=100, desc=f"{desc} @ repetition {1 + rpt_idx}/{num_rpt}"
+            ):
+                func_set_range(rang)
+                sleep(sleep_range_sec)
+                for val_idx in plan.order[start:stop]:
+                    self._input_val = stimuli[val_idx]
+                    func_set(self._input_val)
+                    sleep(sleep_sec)
+                    for ovr_idx in range(daq_ovr):
+                        results[rpt_idx, val_idx, ovr_idx] = func_read()
+        return results, plan
+
+    def get_sweep_planner(self, latency: LatencyProfile) -> SweepPlanner:
+        """Function for getting the dry-run planner of the transfer sweep with actual settings
+        :param latency: Dataclass LatencyProfile with command latencies (stored or from calibration pass)
+        :return:        Class SweepPlanner for predicting the wall time and suggesting config changes
+        """
+        return SweepPlanner(settings=self.settings, latency=latency, num_reads=self._num_reads_per_step)
+
+    def save_results(
+        self,
+        file_name: str,
+        settings: object,
+        data: dict,
+        folder_name: Path,
+        file_format: str = "npz",
+        compression: str | None = None,
+        catalog: RunCatalog | None = None,
+    ) -> None:
         """Function for saving the measured data in numpy format
         :param file_name:   Name of file to save (without extension)
         :param settings:    Class with settings
         :param data:        Dictionary with results from measurement
         :param folder_name: Name of folder where results will be saved
+        :param file_format: String with file format ['npz': pickled numpy archive, 'h5': pickle-free HDF5 with lazy loading]
+        :param compression: String with compression filter of HDF5 format (like: 'gzip'), None for memory-mappable datasets
+        :param catalog:     Class RunCatalog for indexing the run metadata and summary metrics, None if not used
         :return:            None
         """
 
         folder_name.mkdir(parents=True, exist_ok=True)
-        path2save = folder_name / f"{file_name}.npz"
-        np.savez(file=path2save.as_posix(), allow_pickle=True, data=data, settings=settings)
+        if file_format == "h5":
+            path2save = folder_name / f"{file_name}.h5"
+            save_results_hdf5(path2file=path2save, data=data, settings=settings, compression=compression)
+        elif file_format == "npz":
+            path2save = folder_name / f"{file_name}.npz"
+            np.savez(file=path2save.as_posix(), allow_pickle=True, data=data, settings=settings)
+        else:
+            raise ValueError(f"File format {file_format} is not available")
+        if catalog is not None:
+            catalog.add_run(path2file=path2save, data=data, settings=settings)
         self._logger.debug(f"Saved results in folder: {folder_name}")
         self._logger.debug(f"Saved measured with {len(data)} entries")
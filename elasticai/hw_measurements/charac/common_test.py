@@ -5,6 +5,7 @@ import pytest
 
 from elasticai.hw_measurements import get_path_to_project
 from elasticai.hw_measurements.charac.common import CharacterizationCommon
+from elasticai.hw_measurements.process.common import ProcessCommon
 
 
 class Settings:
@@ -70,3 +71,146 @@ class TestCommon:
         np.testing.assert_array_equal(loaded_data["a"], data["a"])
         assert loaded_settings.lr == 0.01
         assert loaded_settings.batch_size == 32
+
+    def test_save_results_hdf5_without_pickle(self, tmp_path):
+        saver = CharacterizationCommon()
+        data = {"stim": np.array([1, 2, 3]), "ch00": np.ones((1, 3, 2))}
+        saver.save_results(
+            file_name="result", settings=Settings(), data=data, folder_name=tmp_path, file_format="h5"
+        )
+        assert (tmp_path / "result.h5").exists()
+
+        loaded = ProcessCommon().load_data(path=tmp_path, file_name="result.h5", load_settings=True)
+        np.testing.assert_array_equal(loaded.data["ch00"], data["ch00"])
+        assert loaded.settings == {"batch_size": 32, "lr": 0.01}
+
+    def test_calculate_standard_error_ignores_nan(self):
+        samples = np.array([[1.0, 3.0, np.nan], [2.0, 2.0, 2.0]])
+        rslt = CharacterizationCommon.calculate_standard_error(samples, axis=-1)
+        np.testing.assert_array_almost_equal(rslt, [1.0, 0.0])
+
+    def test_sample_until_converged_stable_signal(self):
+        hndl = CharacterizationCommon()
+        samples, sem = hndl.sample_until_converged(
+            func_read=lambda: 1.0, sem_target=1e-3, num_min=3, num_max=10
+        )
+        assert samples.shape == (10,)
+        assert np.sum(~np.isnan(samples)) == 3
+        assert sem == 0.0
+
+    def test_sample_until_converged_noisy_signal(self):
+        hndl = CharacterizationCommon()
+        samples, sem = hndl.sample_until_converged(
+            func_read=hndl.dummy_get_daq, sem_target=1e-6, num_min=2, num_max=20
+        )
+        assert np.sum(~np.isnan(samples)) == 20
+        assert sem > 1e-6
+
+    def test_sample_until_converged_wrong_bounds(self):
+        hndl = CharacterizationCommon()
+        with pytest.raises(ValueError):
+            hndl.sample_until_converged(func_read=lambda: 1.0, sem_target=1e-3, num_min=2, num_max=1)
+
+    def test_sweep_until_converged_skips_repetitions(self):
+        hndl = CharacterizationCommon()
+        stimuli = np.linspace(0.0, 1.0, 5)
+        results, sem = hndl.sweep_until_converged(
+            stimuli=stimuli,
+            func_set=hndl.dummy_set_daq,
+            func_read=hndl.dummy_get_stim_value,
+            func_beep=hndl.dummy_beep,
+            sem_target=1e-3,
+            num_min=2,
+            num_max=8,
+            num_rpt=10,
+            sleep_sec=0.0,
+        )
+        assert results.shape == (2, stimuli.size, 8)
+        assert sem.shape == (2, stimuli.size)
+        np.testing.assert_array_equal(np.nanmean(results, axis=(0, 2)), stimuli)
+        assert np.all(np.isnan(results[:, :, 2:]))
+
+    def test_run_sweep_pipelined(self):
+        hndl = CharacterizationCommon()
+        stimuli = np.linspace(0.0, 1.0, 11)
+        persisted = list()
+        beeps = list()
+        results, stats = hndl.run_sweep_pipelined(
+            stimuli=stimuli,
+            func_set=hndl.dummy_set_daq,
+            func_read=hndl.dummy_get_stim_value,
+            num_rpt=2,
+            daq_ovr=3,
+            sleep_sec=0.0,
+            stages=[persisted.append],
+            func_beep=lambda: beeps.append(hndl.dummy_get_stim_value()),
+        )
+        assert results.shape == (2, stimuli.size, 3)
+        np.testing.assert_array_equal(results[1, :, 2], stimuli)
+        assert len(persisted) == 2 * stimuli.size
+        assert stats.num_processed == [22, 22, 22]
+        assert beeps == [stimuli[-1], stimuli[-1]]
+
+    def test_run_step_response(self):
+        hndl = CharacterizationCommon()
+        fs = 1e6
+        tau = 50e-6
+        state = {"level": 0.0}
+        rng = np.random.default_rng(0)
+
+        def capture(num: int) -> np.ndarray:
+            t = np.arange(num) / fs - 100e-6
+            step = np.where(t >= 0.0, 1 - np.exp(-np.maximum(t, 0.0) / tau), 0.0)
+            return state["level"] * step + rng.normal(0.0, 1e-3, num)
+
+        captures, metric = hndl.run_test_step_response(
+            func_reset=lambda: state.update({"level": 0.0}),
+            func_step=lambda: state.update({"level": 2.0}),
+            func_capture=capture,
+            func_beep=hndl.dummy_beep,
+            fs=fs,
+            num_samples=2000,
+            num_captures=4,
+            pos_trigger=100,
+        )
+        assert captures.shape == (4, 2000)
+        assert metric.rise_time.shape == (4,)
+        np.testing.assert_allclose(metric.rise_time, tau * np.log(9), rtol=0.05)
+        np.testing.assert_allclose(metric.settling_time, tau * np.log(50), rtol=0.05)
+        np.testing.assert_allclose(metric.val_final, 2.0, atol=0.01)
+
+    def test_update_sleep_from_settling(self, tmp_path):
+        hndl = CharacterizationCommon()
+        sleep_sec = hndl.update_sleep_from_settling(
+            settling_time=np.array([1e-3, 2e-3, np.nan]),
+            path2yaml=tmp_path,
+            yaml_name="Config_Test",
+            margin=2.0,
+        )
+        assert sleep_sec == pytest.approx(4e-3)
+        assert (tmp_path / "Config_Test.yaml").exists()
+
+    def test_run_sweep_ranged(self):
+        hndl = CharacterizationCommon()
+        stimuli = np.concatenate((np.linspace(0.0, 5.0, 11), np.linspace(4.5, -5.0, 20)))
+        state = {"range": None, "switches": list()}
+
+        def read() -> float:
+            assert abs(hndl.dummy_get_stim_value()) <= 0.95 * state["range"]
+            return hndl.dummy_get_stim_value()
+
+        results, plan = hndl.run_sweep_ranged(
+            stimuli=stimuli,
+            expected=stimuli,
+            func_set=hndl.dummy_set_daq,
+            func_read=read,
+            func_set_range=lambda rang: (state.update({"range": rang}), state["switches"].append(rang)),
+            ranges=(0.1, 1.0, 10.0, 100.0),
+            num_rpt=2,
+            daq_ovr=2,
+            sleep_sec=0.0,
+        )
+        assert results.shape == (2, stimuli.size, 2)
+        np.testing.assert_array_equal(results[1, :, 0], stimuli)
+        assert state["switches"] == [0.1, 1.0, 10.0, 0.1, 1.0, 10.0]
+        assert plan.num_switches == 2
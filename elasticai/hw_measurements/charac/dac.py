@@ -65,6 +65,31 @@ class SettingsDAC:
         assert self.daq_ovr > 0, "Variable: adc_ovr - Must be greater than 1"
         return np.zeros(shape=(self.num_rpt, self.get_num_steps(), self.daq_ovr), dtype=float)
 
+    def get_superposition_codes(self) -> np.ndarray:
+        """Getting the DAC codes for the superposition test (zero code followed by all bit-weight codes 2^k)"""
+        codes = np.concatenate(([0], 2 ** np.arange(self.dac_reso)), axis=0).astype(int)
+        outside = codes[(codes < self.dac_rang[0]) | (codes > self.dac_rang[1])]
+        if outside.size:
+            raise ValueError(
+                f"Superposition codes {outside.tolist()} are outside of dac_rang {self.dac_rang} - "
+                "superposition test needs the full range [0, 2**dac_reso - 1]"
+            )
+        return codes
+
+    def get_superposition_verify_codes(self, num_verify: int = 8) -> np.ndarray:
+        """Getting the DAC codes for verifying the superposition test, i.e. the major-carry codes (2^k - 1)
+        together with equally-spaced codes inside dac_rang. Codes which are already measured as bit-weight are excluded.
+        :param num_verify:  Integer with number of equally-spaced codes inside dac_rang
+        :return:            Numpy array with sorted verification codes
+        """
+        major_carry = 2 ** np.arange(2, self.dac_reso + 1) - 1
+        spaced = np.linspace(
+            start=self.dac_rang[0], stop=self.dac_rang[1], num=num_verify, endpoint=True, dtype=int
+        )
+        codes = np.union1d(major_carry, spaced)
+        codes = codes[(codes >= self.dac_rang[0]) & (codes <= self.dac_rang[1])]
+        return codes[~np.isin(codes, self.get_superposition_codes())]
+
 
 DefaultSettingsDAC = SettingsDAC(
     system_id="0",
@@ -94,43 +119,283 @@ class CharacterizationDAC(CharacterizationCommon):
             yaml_template=DefaultSettingsDAC, path2yaml=path2yaml, yaml_name="Config_TestDAC"
         ).get_class(SettingsDAC)
 
-    def run_test_dac_transfer(self, func_mux, func_dac, func_daq, func_beep) -> dict:
+    def run_test_dac_transfer(
+        self,
+        func_mux,
+        func_dac,
+        func_daq,
+        func_beep,
+        do_pipeline: bool = False,
+        stages: list | tuple = (),
+    ) -> dict:
         """Function for characterizing the transfer function of the DAC
         :param func_mux:    Function for defining the pre-processing part of the hardware DUT, setting the DAC channel with inputs (chnl)
         :param func_dac:    Function for applying selected channel and data on DUT-DAC with input params (chnl, data)
         :param func_daq:    Function for sensing the DAC output with external multimeter device
         :param func_beep:   Function for do a beep in DAQ
+        :param do_pipeline: If True, the acquisition is decoupled from the processing (run_sweep_pipelined)
+        :param stages:      List or tuple with additional consumer functions for pipelined sweep with input params (sample: PipelineSample)
         :return:            Dictionary with ['stim': input test signal of one repetition, 'settings': Settings, 'ch<X>': DAQ results with 'val' and 'std']"""
         stimuli = self.settings.get_cycle_stimuli_input()
 
         results = {"stim": stimuli}
         for chnl in self.settings.dac_chnl:
-            results_ch = self.settings.get_cycle_empty_array()
             func_mux(chnl)
             self._logger.debug(f"Prepared DAC channel: {chnl}")
+            if do_pipeline:
+                results_ch, stats = self.run_sweep_pipelined(
+                    stimuli=stimuli,
+                    func_set=lambda data: func_dac(chnl, data),
+                    func_read=func_daq,
+                    num_rpt=self.settings.num_rpt,
+                    daq_ovr=self.settings.daq_ovr,
+                    sleep_sec=self.settings.sleep_sec,
+                    stages=stages,
+                    func_beep=func_beep,
+                    desc=f"Process CH{chnl}",
+                )
+                self._logger.debug(f"Pipelined sweep DAC channel {chnl}: {stats}")
+                results.update({f"ch{chnl:02d}": results_ch})
+                continue
+            results_ch = self._sweep_codes(
+                chnl=chnl, codes=stimuli, func_dac=func_dac, func_daq=func_daq, func_beep=func_beep
+            )
+            results.update({f"ch{chnl:02d}": results_ch})
+        for _ in range(4):
+            sleep(0.5)
+            func_beep()
+
+        return results
+
+    def run_test_dac_superposition(
+        self, func_mux, func_dac, func_daq, func_beep, num_verify: int = 8
+    ) -> tuple[dict, dict, dict]:
+        """Function for characterizing the transfer function of the DAC with a reduced number of measurements.
+        Only the bit-weight codes (and some verification codes) are measured and the full transfer function
+        is reconstructed under the superposition assumption. Full sweeps (run_test_dac_transfer) should be kept for qualification.
+        :param func_mux:    Function for defining the pre-processing part of the hardware DUT, setting the DAC channel with inputs (chnl)
+        :param func_dac:    Function for applying selected channel and data on DUT-DAC with input params (chnl, data)
+        :param func_daq:    Function for sensing the DAC output with external multimeter device
+        :param func_beep:   Function for do a beep in DAQ
+        :param num_verify:  Integer with number of equally-spaced verification codes (additional to the major-carry codes)
+        :return:            Tuple with three dictionaries
+                            [0]: Reconstructed results ['stim': input test signal of one repetition, 'ch<X>': DAQ results], same layout like run_test_dac_transfer
+                            [1]: Residual on verification codes ['stim': verification codes, 'ch<X>': measured minus reconstructed output]
+                            [2]: Metrics of reconstructed transfer function ['stim': input test signal, 'ch<X>': 'dnl' and 'inl']
+        """
+        stimuli = self.settings.get_cycle_stimuli_input()
+        codes_weight = self.settings.get_superposition_codes()
+        codes_verify = self.settings.get_superposition_verify_codes(num_verify=num_verify)
+        hndl = MetricCalculator()
+
+        results = {"stim": stimuli}
+        residual = {"stim": codes_verify}
+        metric = {"stim": stimuli}
+        for chnl in self.settings.dac_chnl:
+            func_mux(chnl)
+            self._logger.debug(f"Prepared DAC channel: {chnl}")
+            meas_ch = self._sweep_codes(
+                chnl=chnl,
+                codes=np.concatenate((codes_weight, codes_verify), axis=0),
+                func_dac=func_dac,
+                func_daq=func_daq,
+                func_beep=func_beep,
+            )
+            meas_weight = meas_ch[:, : codes_weight.size, :]
+            meas_verify = meas_ch[:, codes_weight.size :, :]
+
+            results.update(
+                {
+                    f"ch{chnl:02d}": self.reconstruct_transfer_from_bit_weights(
+                        codes=stimuli, weight_data=meas_weight, dac_reso=self.settings.dac_reso
+                    )
+                }
+            )
+            residual.update(
+                {
+                    f"ch{chnl:02d}": meas_verify
+                    - self.reconstruct_transfer_from_bit_weights(
+                        codes=codes_verify, weight_data=meas_weight, dac_reso=self.settings.dac_reso
+                    )
+                }
+            )
+            transfer = np.mean(results[f"ch{chnl:02d}"], axis=(0, 2))
+            metric.update(
+                {
+                    f"ch{chnl:02d}": {
+                        "dnl": hndl.calculate_dnl(stim_input=stimuli, daq_output=transfer),
+                        "inl": hndl.calculate_inl(stim_input=stimuli, daq_output=transfer),
+                    }
+                }
+            )
+            self._logger.debug(
+                f"Superposition residual CH{chnl}: {np.max(np.abs(residual[f'ch{chnl:02d}'])):.6f} (max. abs)"
+            )
+        for _ in range(4):
+            sleep(0.5)
+            func_beep()
+
+        return results, residual, metric
+
+    def run_test_dac_transfer_converged(
+        self,
+        func_mux,
+        func_dac,
+        func_daq,
+        func_beep,
+        sem_target: float,
+        num_min: int = 2,
+        num_max: int = 16,
+    ) -> tuple[dict, dict]:
+        """Function for characterizing the transfer function of the DAC with convergence-driven sampling.
+        Setting num_rpt is used as upper bound of repetitions.
+        :param func_mux:    Function for defining the pre-processing part of the hardware DUT, setting the DAC channel with inputs (chnl)
+        :param func_dac:    Function for applying selected channel and data on DUT-DAC with input params (chnl, data)
+        :param func_daq:    Function for sensing the DAC output with external multimeter device
+        :param func_beep:   Function for do a beep in DAQ
+        :param sem_target:  Floating value with target standard error of the mean of the DAC output
+        :param num_min:     Integer with minimal number of samples per step (at least 2)
+        :param num_max:     Integer with maximal number of samples per step (independent of daq_ovr)
+        :return:            Tuple with two dictionaries
+                            [0]: Results ['stim': input test signal of one repetition, 'ch<X>': DAQ results (not measured samples are NaN)]
+                            [1]: Achieved standard error of the mean ['stim': input test signal, 'ch<X>': SEM with shape (num_rpt_done, num_steps)]
+        """
+        stimuli = self.settings.get_cycle_stimuli_input()
+
+        results = {"stim": stimuli}
+        confidence = {"stim": stimuli}
+        for chnl in self.settings.dac_chnl:
+            func_mux(chnl)
+            self._logger.debug(f"Prepared DAC channel: {chnl}")
+            results_ch, sem_ch = self.sweep_until_converged(
+                stimuli=stimuli,
+                func_set=lambda data: func_dac(chnl, data),
+                func_read=func_daq,
+                func_beep=func_beep,
+                sem_target=sem_target,
+                num_min=num_min,
+                num_max=num_max,
+                num_rpt=self.settings.num_rpt,
+                sleep_sec=self.settings.sleep_sec,
+                desc=f"Process CH{chnl}",
+            )
+            results.update({f"ch{chnl:02d}": results_ch})
+            confidence.update({f"ch{chnl:02d}": sem_ch})
+        for _ in range(4):
+            sleep(0.5)
+            func_beep()
+
+        return results, confidence
+
+    def run_test_loopback(
+        self, func_mux, func_dac, func_daq, func_adc, func_beep, adc_chnl: list | None = None
+    ) -> tuple[dict, dict]:
+        """Function for co-characterizing the DAC and the loopback ADC of the DUT in one sweep. In each step, the DAC code is applied,
+        the DMM reference voltage and the ADC output are read, so both transfer functions are using the same reference.
+        :param func_mux:    Function for defining the pre-processing part of the hardware DUT, setting the DAC channel with inputs (chnl)
+        :param func_dac:    Function for applying selected channel and data on DUT-DAC with input params (chnl, data)
+        :param func_daq:    Function for sensing the DAC output (reference voltage) with external multimeter device
+        :param func_adc:    Function for getting the output of the loopback DUT-ADC with input params (chnl)
+        :param func_beep:   Function for do a beep in DAQ
+        :param adc_chnl:    List with ADC channel IDs connected to the DAC channels in dac_chnl (default: same IDs)
+        :return:            Tuple with two dictionaries
+                            [0]: DAC results ['stim': DAC codes of one repetition, 'ch<X>': DAQ reference voltage], same layout like run_test_dac_transfer
+                            [1]: ADC results ['stim': DAC codes of one repetition, 'ch<Y>': ADC output], use get_loopback_adc_transfer() for voltage reference
+        """
+        adc_chnl = self.settings.dac_chnl if adc_chnl is None else adc_chnl
+        assert len(adc_chnl) == len(self.settings.dac_chnl), (
+            "Length of adc_chnl and dac_chnl must be equal"
+        )
+        stimuli = self.settings.get_cycle_stimuli_input()
+
+        results_dac = {"stim": stimuli}
+        results_adc = {"stim": stimuli}
+        for chnl, chnl_adc in zip(self.settings.dac_chnl, adc_chnl):
+            ref_ch = self.settings.get_cycle_empty_array()
+            adc_ch = self.settings.get_cycle_empty_array()
+            func_mux(chnl)
+            self._logger.debug(f"Prepared DAC channel: {chnl} with loopback on ADC channel: {chnl_adc}")
 
             for rpt_idx in range(self.settings.num_rpt):
                 for val_idx, data in enumerate(
                     tqdm(
                         stimuli,
                         ncols=100,
-                        desc=f"Process CH{chnl} @ repetition {1 + rpt_idx}/{self.settings.num_rpt}",
+                        desc=f"Process CH{chnl}->CH{chnl_adc} @ repetition {1 + rpt_idx}/{self.settings.num_rpt}",
                     )
                 ):
                     self._input_val = data
                     func_dac(chnl, data)
                     sleep(self.settings.sleep_sec)
                     for ovr_idx in range(self.settings.daq_ovr):
-                        results_ch[rpt_idx, val_idx, ovr_idx] = func_daq()
-                self._logger.debug(f"Sweep DAC channel: {chnl}")
-
+                        ref_ch[rpt_idx, val_idx, ovr_idx] = func_daq()
+                        adc_ch[rpt_idx, val_idx, ovr_idx] = func_adc(chnl_adc)
                 func_beep()
-            results.update({f"ch{chnl:02d}": results_ch})
+            results_dac.update({f"ch{chnl:02d}": ref_ch})
+            results_adc.update({f"ch{chnl_adc:02d}": adc_ch})
         for _ in range(4):
             sleep(0.5)
             func_beep()
 
-        return results
+        return results_dac, results_adc
+
+    @staticmethod
+    def get_loopback_adc_transfer(
+        results_dac: dict, results_adc: dict, chnl_dac: int, chnl_adc: int
+    ) -> dict:
+        """Function for getting the ADC transfer function of one loopback pair with the DMM reference voltage as stimulus
+        :param results_dac: Dictionary with DAC results from run_test_loopback
+        :param results_adc: Dictionary with ADC results from run_test_loopback
+        :param chnl_dac:    Integer with DAC channel ID
+        :param chnl_adc:    Integer with ADC channel ID
+        :return:            Dictionary with ['stim': mean reference voltage of each step, 'ch<Y>': ADC output], same layout like CharacterizationADC.run_test_transfer
+        """
+        ref = results_dac[f"ch{chnl_dac:02d}"]
+        return {
+            "stim": np.mean(ref, axis=(0, 2)),
+            f"ch{chnl_adc:02d}": results_adc[f"ch{chnl_adc:02d}"],
+        }
+
+    @staticmethod
+    def reconstruct_transfer_from_bit_weights(
+        codes: np.ndarray, weight_data: np.ndarray, dac_reso: int
+    ) -> np.ndarray:
+        """Function for reconstructing the DAC output of arbitrary codes from the measured bit-weight codes (superposition)
+        :param codes:       Numpy array with DAC codes to reconstruct
+        :param weight_data: Numpy array with measured output of the codes from get_superposition_codes() [shape: (num_rpt, 1 + dac_reso, daq_ovr)]
+        :param dac_reso:    Integer with bit resolution of DAC
+        :return:            Numpy array with reconstructed output [shape: (num_rpt, codes.size, daq_ovr)]
+        """
+        assert weight_data.shape[1] == 1 + dac_reso, "Dimension / shape mismatch"
+        zero = weight_data[:, :1, :]
+        weights = weight_data[:, 1:, :] - zero
+        bits = (np.asarray(codes, dtype=np.int64)[:, None] >> np.arange(dac_reso)) & 1
+        return zero + np.einsum("sk,rko->rso", bits.astype(float), weights)
+
+    def _sweep_codes(self, chnl: int, codes: np.ndarray, func_dac, func_daq, func_beep) -> np.ndarray:
+        """Function for measuring the DAC output of one (already selected) channel for given codes
+        :return:    Numpy array with DAQ results [shape: (num_rpt, codes.size, daq_ovr)]
+        """
+        results_ch = np.zeros(
+            shape=(self.settings.num_rpt, codes.size, self.settings.daq_ovr), dtype=float
+        )
+        for rpt_idx in range(self.settings.num_rpt):
+            for val_idx, data in enumerate(
+                tqdm(
+                    codes,
+                    ncols=100,
+                    desc=f"Process CH{chnl} @ repetition {1 + rpt_idx}/{self.settings.num_rpt}",
+                )
+            ):
+                self._input_val = data
+                func_dac(chnl, data)
+                sleep(self.settings.sleep_sec)
+                for ovr_idx in range(self.settings.daq_ovr):
+                    results_ch[rpt_idx, val_idx, ovr_idx] = func_daq()
+            self._logger.debug(f"Sweep DAC channel: {chnl}")
+
+            func_beep()
+        return results_ch
 
     def plot_characteristic_results_from_file(self, path: Path, file_name: str) -> None:
         """Function for plotting the loaded data files
@@ -1,11 +1,13 @@
 import unittest
 from copy import deepcopy
+from dataclasses import replace
 
 import numpy as np
 
 from elasticai.hw_measurements import get_path_to_project
+from elasticai.hw_measurements.process.data import MetricCalculator
 
-from .dac import CharacterizationDAC, SettingsDAC
+from .dac import CharacterizationDAC, DefaultSettingsDAC, SettingsDAC
 
 settings = SettingsDAC(
     system_id="0",
@@ -106,6 +108,173 @@ class TestDAC(unittest.TestCase):
         )
         self.assertTrue(len(results) == 1 + len(set0.dac_chnl))
 
+    def test_run_transfer_pipelined(self):
+        set0 = deepcopy(settings)
+        set0.dac_reso = 4
+        set0.dac_rang = [0, 2**set0.dac_reso - 1]
+        set0.dac_chnl = [0, 1]
+        set0.num_rpt = 2
+        set0.daq_ovr = 3
+        set0.sleep_sec = 0.0
+
+        hndl = CharacterizationDAC(path2yaml=get_path_to_project("temp_config") / "dac")
+        hndl.settings = set0
+        results = hndl.run_test_dac_transfer(
+            func_mux=hndl.dummy_set_mux,
+            func_dac=hndl.dummy_set_dut_dac,
+            func_daq=lambda: 1e-3 * hndl.dummy_get_stim_value(),
+            func_beep=hndl.dummy_beep,
+            do_pipeline=True,
+        )
+        self.assertEqual(results["ch00"].shape, set0.get_cycle_empty_array().shape)
+        np.testing.assert_array_almost_equal(results["ch01"][1, :, 2], 1e-3 * results["stim"])
+
+    def test_settings_superposition_codes(self):
+        set0 = deepcopy(settings)
+        set0.dac_reso = 4
+        np.testing.assert_array_equal(set0.get_superposition_codes(), [0, 1, 2, 4, 8])
+
+    def test_settings_superposition_verify_codes(self):
+        set0 = deepcopy(settings)
+        set0.dac_reso = 4
+        set0.dac_rang = [0, 15]
+        codes = set0.get_superposition_verify_codes(num_verify=4)
+        np.testing.assert_array_equal(codes, [3, 5, 7, 10, 15])
+
+    def test_reconstruct_transfer_from_bit_weights(self):
+        codes = np.arange(16)
+        weights = np.array([0.5, 1.5, 2.5, 4.5, 8.5]).reshape(1, 5, 1)
+        rslt = CharacterizationDAC.reconstruct_transfer_from_bit_weights(
+            codes=codes, weight_data=weights, dac_reso=4
+        )
+        self.assertEqual(rslt.shape, (1, 16, 1))
+        np.testing.assert_array_almost_equal(rslt[0, :, 0], 0.5 + codes)
+
+    def test_run_superposition_with_bit_errors(self):
+        set0 = deepcopy(settings)
+        set0.dac_reso = 8
+        set0.dac_rang = [0, 2**set0.dac_reso - 1]
+        set0.dac_chnl = [0, 1]
+        set0.num_steps = 1
+        set0.daq_ovr = 2
+        set0.sleep_sec = 0.0
+        bit_weights = 1e-3 * 2 ** np.arange(set0.dac_reso) * (1 + 0.01 * np.arange(set0.dac_reso))
+
+        path2yaml = get_path_to_project("temp_config") / "dac"
+        hndl = CharacterizationDAC(path2yaml=path2yaml)
+        hndl.settings = set0
+
+        def get_daq() -> float:
+            bits = (int(hndl.dummy_get_stim_value()) >> np.arange(set0.dac_reso)) & 1
+            return 0.1 + float(np.sum(bits * bit_weights))
+
+        results, residual, metric = hndl.run_test_dac_superposition(
+            func_mux=hndl.dummy_set_mux,
+            func_dac=hndl.dummy_set_dut_dac,
+            func_daq=get_daq,
+            func_beep=hndl.dummy_beep,
+            num_verify=4,
+        )
+        self.assertTrue(len(results) == len(residual) == 1 + len(set0.dac_chnl))
+        self.assertEqual(results["ch00"].shape, set0.get_cycle_empty_array().shape)
+        self.assertEqual(residual["ch01"].shape[1], residual["stim"].size)
+        np.testing.assert_array_almost_equal(residual["ch00"], np.zeros_like(residual["ch00"]))
+        ideal = np.array(
+            [0.1 + np.sum(((code >> np.arange(8)) & 1) * bit_weights) for code in results["stim"]]
+        )
+        np.testing.assert_array_almost_equal(results["ch01"][0, :, 1], ideal)
+
+        calc = MetricCalculator()
+        self.assertEqual(metric["ch00"]["dnl"].size, results["stim"].size - 1)
+        np.testing.assert_array_almost_equal(
+            metric["ch01"]["inl"], calc.calculate_inl(stim_input=results["stim"], daq_output=ideal)
+        )
+        np.testing.assert_array_almost_equal(
+            metric["ch01"]["dnl"], calc.calculate_dnl(stim_input=results["stim"], daq_output=ideal)
+        )
+
+    def test_settings_superposition_codes_outside_range(self):
+        set0 = deepcopy(settings)
+        set0.dac_reso = 4
+        set0.dac_rang = [0, 7]
+        with self.assertRaises(ValueError):
+            set0.get_superposition_codes()
+
+    def test_run_transfer_converged_noisy(self):
+        set0 = deepcopy(settings)
+        set0.dac_reso = 4
+        set0.dac_rang = [0, 2**set0.dac_reso - 1]
+        set0.dac_chnl = [0]
+        set0.num_rpt = 3
+        set0.daq_ovr = 5
+        set0.sleep_sec = 0.0
+
+        hndl = CharacterizationDAC(path2yaml=get_path_to_project("temp_config") / "dac")
+        hndl.settings = set0
+        results, confidence = hndl.run_test_dac_transfer_converged(
+            func_mux=hndl.dummy_set_mux,
+            func_dac=hndl.dummy_set_dut_dac,
+            func_daq=hndl.dummy_get_daq,
+            func_beep=hndl.dummy_beep,
+            sem_target=1e-9,
+            num_max=set0.daq_ovr,
+        )
+        self.assertEqual(results["ch00"].shape, set0.get_cycle_empty_array().shape)
+        self.assertEqual(confidence["ch00"].shape, (set0.num_rpt, set0.get_num_steps()))
+        self.assertFalse(np.any(np.isnan(results["ch00"])))
+        self.assertTrue(np.all(confidence["ch00"] > 1e-9))
+
+    def test_run_transfer_converged_default_settings(self):
+        set0 = replace(DefaultSettingsDAC, dac_chnl=[0], dac_rang=[0, 15], sleep_sec=0.0)
+        hndl = CharacterizationDAC(path2yaml=get_path_to_project("temp_config") / "dac")
+        hndl.settings = set0
+        results, confidence = hndl.run_test_dac_transfer_converged(
+            func_mux=hndl.dummy_set_mux,
+            func_dac=hndl.dummy_set_dut_dac,
+            func_daq=hndl.dummy_get_daq,
+            func_beep=hndl.dummy_beep,
+            sem_target=1e-9,
+            num_max=4,
+        )
+        self.assertEqual(results["ch00"].shape, (set0.num_rpt, set0.get_num_steps(), 4))
+        self.assertEqual(confidence["ch00"].shape, (set0.num_rpt, set0.get_num_steps()))
+
+    def test_run_loopback(self):
+        set0 = deepcopy(settings)
+        set0.dac_reso = 8
+        set0.dac_rang = [0, 2**set0.dac_reso - 1]
+        set0.dac_chnl = [0, 1]
+        set0.num_steps = 16
+        set0.num_rpt = 2
+        set0.daq_ovr = 2
+        set0.sleep_sec = 0.0
+
+        hndl = CharacterizationDAC(path2yaml=get_path_to_project("temp_config") / "dac")
+        hndl.settings = set0
+        lsb = 5.0 / 2**set0.dac_reso
+        num_reads = []
+
+        def get_daq() -> float:
+            num_reads.append(1)
+            return lsb * hndl.dummy_get_stim_value()
+
+        results_dac, results_adc = hndl.run_test_loopback(
+            func_mux=hndl.dummy_set_mux,
+            func_dac=hndl.dummy_set_dut_dac,
+            func_daq=get_daq,
+            func_adc=lambda chnl: 16 * hndl.dummy_get_stim_value() + chnl,
+            func_beep=hndl.dummy_beep,
+            adc_chnl=[4, 5],
+        )
+        self.assertEqual(list(results_dac.keys()), ["stim", "ch00", "ch01"])
+        self.assertEqual(list(results_adc.keys()), ["stim", "ch04", "ch05"])
+        self.assertEqual(len(num_reads), 2 * set0.num_rpt * set0.get_num_steps() * set0.daq_ovr)
+        self.assertEqual(results_adc["ch05"].shape, set0.get_cycle_empty_array().shape)
+
+        transfer = hndl.get_loopback_adc_transfer(results_dac, results_adc, chnl_dac=1, chnl_adc=5)
+        np.testing.assert_array_almost_equal(transfer["stim"], lsb * results_dac["stim"])
+        np.testing.assert_array_almost_equal(transfer["ch05"][0, :, 0], 16 * results_dac["stim"] + 5)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -7,8 +7,11 @@ from time import sleep
 import numpy as np
 from tqdm import tqdm
 
+from elasticai.hw_measurements import MetricIVCurve
 from elasticai.hw_measurements._helper.yaml import YamlConfigHandler
 from elasticai.hw_measurements.charac.common import CharacterizationCommon
+from elasticai.hw_measurements.charac.ranging import RangesNGUX01Current, RangesNGUX01Voltage
+from elasticai.hw_measurements.process.data import MetricCalculator
 
 
 @dataclass
@@ -110,6 +113,9 @@ class CharacterizationDevice(CharacterizationCommon):
     settings: SettingsDevice
     _input_val: float
     _logger: Logger
+    volt_ranges: tuple = RangesNGUX01Voltage
+    curr_ranges: tuple = RangesNGUX01Current
+    _num_reads_per_step: int = 2
 
     def __init__(self, path2yaml: Path = Path("config")) -> None:
         """Class for handling the measurement routine for characterizing an electrical device"""
@@ -152,3 +158,126 @@ class CharacterizationDevice(CharacterizationCommon):
             func_beep()
 
         return results
+
+    def get_iv_segments(self, stimuli: np.ndarray) -> list[tuple[np.ndarray, float]]:
+        """Function for splitting the I-V sweep into segments with constant quadrant (sign of voltage) and voltage range.
+        The points of each segment are ordered from 0 V outwards, so the current magnitude is increasing.
+        :param stimuli: Numpy array with voltage values of the sweep
+        :return:        List with tuple of [0] numpy array with indices of stimuli in measurement order and [1] voltage range
+        """
+        if np.max(np.abs(stimuli)) > self.volt_ranges[-1]:
+            raise ValueError(f"Voltage sweep exceeds the maximal range of {self.volt_ranges[-1]} V")
+        volt_range = np.array(self.volt_ranges)[np.searchsorted(self.volt_ranges, np.abs(stimuli))]
+        key = np.sign(stimuli + (stimuli == 0.0)) * volt_range
+
+        segments = list()
+        for segment_key in np.unique(key):
+            idx = np.flatnonzero(key == segment_key)
+            segments.append(
+                (idx[np.argsort(np.abs(stimuli[idx]), kind="stable")], float(np.abs(segment_key)))
+            )
+        segments.sort(key=lambda item: (np.sign(stimuli[item[0][0]]) < 0, item[1]))
+        return segments
+
+    def run_test_iv_curve(
+        self,
+        func_set_volt,
+        func_get_volt,
+        func_get_curr,
+        func_set_volt_range,
+        func_set_curr_range,
+        func_set_curr_limits,
+        func_beep,
+        curr_limit: float,
+        stimuli: np.ndarray | None = None,
+        curr_threshold: float = 1e-3,
+        func_run_segment=None,
+    ) -> tuple[dict, MetricIVCurve]:
+        """Function for tracing the four-quadrant I-V curve of the device (e.g. with NGUX01) with fixed measurement ranges.
+        The sweep is split into segments (quadrant, voltage range), each measured from 0 V outwards starting in the lowest current
+        range. If the current exceeds the actual range, the next higher range is selected before the point is measured again.
+        :param func_set_volt:           Function for applying the voltage with input params (val)
+        :param func_get_volt:           Function for measuring the applied voltage
+        :param func_get_curr:           Function for measuring the current
+        :param func_set_volt_range:     Function for setting the voltage range with input params (range) [6, 20]
+        :param func_set_curr_range:     Function for setting the current range with input params (range) [0.01, 0.1, 2]
+        :param func_set_curr_limits:    Function for setting the current limits (compliance) with input params (val_min, val_max)
+        :param func_beep:               Function for do a beep in DAQ
+        :param curr_limit:              Floating with current limit (compliance) in both quadrants [A]
+        :param stimuli:                 Numpy array with voltages of the sweep (None: sawtooth from settings)
+        :param curr_threshold:          Floating with current level for extracting the threshold voltages
+        :param func_run_segment:        Function for running a complete segment in hardware list mode with input params (voltages),
+                                        returning a tuple with numpy arrays of measured voltages and currents, None for point-wise sweep
+        :return:                        Tuple with [0] dictionary ['stim': voltages (N, ), 'volt'/'curr': measurements (num_rpt, N, daq_ovr),
+                                        'volt_range': (N, ), 'curr_range': (num_rpt, N), 'segment': (N, ), 'compliance': (num_rpt, N)] and
+                                        [1] dataclass MetricIVCurve [shape: (num_rpt, )]
+        """
+        stimuli = (
+            self.settings.get_cycle_stimuli_input_sawtooth() if stimuli is None else np.asarray(stimuli)
+        )
+        segments = self.get_iv_segments(stimuli)
+        num_rpt = self.settings.num_rpt
+        volt = np.zeros(shape=(num_rpt, stimuli.size, self.settings.daq_ovr), dtype=float)
+        curr = np.zeros_like(volt)
+        curr_range = np.zeros(shape=(num_rpt, stimuli.size), dtype=float)
+        volt_range = np.zeros(shape=(stimuli.size,), dtype=float)
+        segment_id = np.zeros(shape=(stimuli.size,), dtype=int)
+        for seg_idx, (idx, rang) in enumerate(segments):
+            volt_range[idx] = rang
+            segment_id[idx] = seg_idx
+
+        func_set_curr_limits(-curr_limit, curr_limit)
+        for rpt_idx in range(num_rpt):
+            for seg_idx, (idx, rang) in enumerate(
+                tqdm(segments, ncols=100, desc=f"Process I-V repetition {1 + rpt_idx}/{num_rpt}")
+            ):
+                func_set_volt(0.0)
+                func_set_volt_range(rang)
+                range_idx = 0
+                func_set_curr_range(self.curr_ranges[range_idx])
+                pos = 0
+                while pos < idx.size:
+                    if func_run_segment is not None:
+                        volt_seg, curr_seg = func_run_segment(stimuli[idx[pos:]])
+                        volt_seg = np.asarray(volt_seg, dtype=float).reshape(idx.size - pos, -1)
+                        curr_seg = np.asarray(curr_seg, dtype=float).reshape(idx.size - pos, -1)
+                    else:
+                        self._input_val = stimuli[idx[pos]]
+                        func_set_volt(self._input_val)
+                        sleep(self.settings.sleep_sec)
+                        volt_seg = np.array([[func_get_volt() for _ in range(self.settings.daq_ovr)]])
+                        curr_seg = np.array([[func_get_curr() for _ in range(self.settings.daq_ovr)]])
+
+                    overflow = np.any(np.abs(curr_seg) > 0.95 * self.curr_ranges[range_idx], axis=-1)
+                    num_valid = (
+                        int(np.argmax(overflow))
+                        if np.any(overflow) and range_idx < len(self.curr_ranges) - 1
+                        else overflow.size
+                    )
+                    sel = idx[pos : pos + num_valid]
+                    volt[rpt_idx, sel] = volt_seg[:num_valid]
+                    curr[rpt_idx, sel] = curr_seg[:num_valid]
+                    curr_range[rpt_idx, sel] = self.curr_ranges[range_idx]
+                    pos += num_valid
+                    if pos < idx.size and num_valid < overflow.size:
+                        range_idx += 1
+                        func_set_curr_range(self.curr_ranges[range_idx])
+                        self._logger.debug(
+                            f"Segment {seg_idx}: current range {self.curr_ranges[range_idx]} A @ {stimuli[idx[pos]]} V"
+                        )
+            func_set_volt(0.0)
+            func_beep()
+
+        results = {
+            "stim": stimuli,
+            "volt": volt,
+            "curr": curr,
+            "volt_range": volt_range,
+            "curr_range": curr_range,
+            "segment": segment_id,
+            "compliance": np.any(np.abs(curr) >= 0.98 * curr_limit, axis=-1),
+        }
+        metric = MetricCalculator().calculate_iv_metrics(
+            volt=np.mean(volt, axis=-1), curr=np.mean(curr, axis=-1), curr_threshold=curr_threshold
+        )
+        return results, metric
@@ -142,6 +142,55 @@ class TestDevice(unittest.TestCase):
         )
         self.assertTrue(len(results) == 1 + set0.num_rpt)
 
+    def test_iv_segments(self):
+        path2yaml = get_path_to_project("temp_config") / "device"
+        hndl = CharacterizationDevice(path2yaml=path2yaml)
+        stimuli = np.linspace(-10.0, 10.0, 21)
+        segments = hndl.get_iv_segments(stimuli)
+        self.assertEqual([rang for _, rang in segments], [6.0, 20.0, 6.0, 20.0])
+        np.testing.assert_array_equal(stimuli[segments[0][0]], [0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+        np.testing.assert_array_equal(stimuli[segments[2][0]], -np.arange(1.0, 7.0))
+        np.testing.assert_array_equal(
+            np.sort(np.concatenate([idx for idx, _ in segments])), np.arange(21)
+        )
+        with self.assertRaises(ValueError):
+            hndl.get_iv_segments(np.array([0.0, 21.0]))
+
+    def test_run_iv_curve(self):
+        path2yaml = get_path_to_project("temp_config") / "device"
+        hndl = CharacterizationDevice(path2yaml=path2yaml)
+        hndl.settings = deepcopy(settings)
+        hndl.settings.sleep_sec = 0.0
+        hndl.settings.daq_ovr = 2
+        hndl.settings.num_rpt = 2
+
+        state = {"volt": 0.0, "rang": list(), "limit": None}
+        stimuli = np.linspace(-10.0, 10.0, 41)
+        for list_mode in [False, True]:
+            state["rang"].clear()
+            results, metric = hndl.run_test_iv_curve(
+                func_set_volt=lambda val: state.update({"volt": val}),
+                func_get_volt=lambda: state["volt"],
+                func_get_curr=lambda: state["volt"] / 1e3,
+                func_set_volt_range=hndl.dummy_set_daq,
+                func_set_curr_range=state["rang"].append,
+                func_set_curr_limits=lambda val_min, val_max: state.update({"limit": val_max}),
+                func_beep=hndl.dummy_beep,
+                curr_limit=0.5,
+                stimuli=stimuli,
+                func_run_segment=(lambda volt: (volt, volt / 1e3)) if list_mode else None,
+            )
+            self.assertEqual(state["limit"], 0.5)
+            self.assertEqual(results["curr"].shape, (2, 41, 2))
+            np.testing.assert_allclose(results["curr"][0, :, 0], stimuli / 1e3)
+            np.testing.assert_array_equal(
+                results["curr_range"][0], np.where(np.abs(stimuli) > 9.5, 0.1, 0.01)
+            )
+            self.assertEqual(state["rang"], [0.01, 0.01, 0.1, 0.01, 0.01, 0.1] * 2)
+            self.assertFalse(np.any(results["compliance"]))
+            np.testing.assert_allclose(metric.resistance, [1e3, 1e3])
+            np.testing.assert_allclose(metric.threshold_pos, [1.0, 1.0])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -5,6 +5,7 @@ from scipy.signal import find_peaks, welch
 
 from elasticai.hw_measurements import MetricNoise, TransientNoiseSpectrum
 from elasticai.hw_measurements.plots import scale_auto_value
+from elasticai.hw_measurements.process.cache import AnalysisCache
 
 
 class CharacterizationNoise:
@@ -94,33 +95,41 @@ class CharacterizationNoise:
         )
         return self._metric
 
+    @staticmethod
+    def _calculate_noise_power_distribution(
+        signal: np.ndarray, fs: float, scale: float, num_segments: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Calculating the noise spectral density of all channels with Welch's method"""
+        freq, Pxx = welch(
+            x=scale * (signal - np.mean(signal, axis=-1, keepdims=True)),
+            window="hann",
+            scaling="density",
+            fs=fs,
+            nperseg=2 * num_segments,
+            return_onesided=True,
+            axis=-1,
+        )
+        return np.tile(freq, (signal.shape[0], 1)), np.sqrt(Pxx)
+
     def extract_noise_power_distribution(
-        self, scale: float = 1.0, num_segments: int = 16354
+        self, scale: float = 1.0, num_segments: int = 16354, cache: AnalysisCache | None = None
     ) -> TransientNoiseSpectrum:
         """Function to extract noise power distribution from transient measurement
         :param scale:           Floating value to scale the transient measurement, e.g. to scale the digital output to voltage
         :param num_segments:    Number of samples in the noise spectral density
+        :param cache:           Class AnalysisCache for reusing the spectrum of unchanged data, None if not used
         :return:                Dataclass of TransientNoiseSpectrum
         """
         if len(self._channels) == 0:
             raise ValueError("Data is not loaded. Please load data first.")
 
-        freq = list()
-        NPow = list()
-        for sig_ch in self._signal:
-            offset = np.mean(sig_ch)
-            f, Pxx = welch(
-                x=scale * (sig_ch - offset),
-                window="hann",
-                scaling="density",
-                fs=self._fs,
-                nperseg=2 * num_segments,
-                return_onesided=True,
-            )
-            freq.append(f)
-            NPow.append(np.sqrt(Pxx))
-
-        self._spec = TransientNoiseSpectrum(freq=np.array(freq), spec=np.array(NPow), chan=self._channels)
+        args = (self._signal, self._fs, scale, num_segments)
+        freq, NPow = (
+            self._calculate_noise_power_distribution(*args)
+            if cache is None
+            else cache.call(self._calculate_noise_power_distribution, *args)
+        )
+        self._spec = TransientNoiseSpectrum(freq=freq, spec=NPow, chan=self._channels)
         return self._spec
 
     @staticmethod
@@ -0,0 +1,154 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+from logging import Logger, getLogger
+from queue import Full, Queue
+from threading import Thread
+from time import perf_counter, sleep
+from typing import Any
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class PipelineSample:
+    """Class with one acquired step of the pipeline
+    Attributes:
+        index:      Integer with step index
+        timestamp:  Floating with time after reading the step, relative to the start of the pipeline [s]
+        value:      Acquired value of the step
+    """
+
+    index: int
+    timestamp: float
+    value: Any
+
+
+@dataclass(frozen=True)
+class PipelineStatistics:
+    num_acquired: int
+    num_processed: list
+    num_dropped: list
+    num_blocked: list
+    max_queue_fill: list
+    period_mean: float
+    period_jitter: float
+    duration_sec: float
+
+
+class _ConsumerStage:
+    def __init__(self, func: Callable[[PipelineSample], None], queue_size: int) -> None:
+        self.func = func
+        self.queue: Queue = Queue(maxsize=queue_size)
+        self.num_processed = 0
+        self.num_dropped = 0
+        self.num_blocked = 0
+        self.max_queue_fill = 0
+        self.error: BaseException | None = None
+        self.thread = Thread(target=self.__run, daemon=True)
+
+    def __run(self) -> None:
+        while True:
+            sample = self.queue.get()
+            if sample is None:
+                break
+            if self.error is not None:
+                continue
+            try:
+                self.func(sample)
+                self.num_processed += 1
+            except BaseException as e:
+                self.error = e
+
+    def put(self, sample: PipelineSample, drop_on_full: bool) -> None:
+        self.max_queue_fill = max(self.max_queue_fill, self.queue.qsize() + 1)
+        try:
+            self.queue.put_nowait(sample)
+        except Full:
+            if drop_on_full:
+                self.num_dropped += 1
+            else:
+                self.num_blocked += 1
+                self.queue.put(sample)
+
+
+class AcquisitionPipeline:
+    _logger: Logger
+    _stages: list[_ConsumerStage]
+
+    def __init__(
+        self,
+        func_acquire,
+        stages: list | tuple,
+        queue_size: int = 256,
+        period_sec: float = 0.0,
+        drop_on_full: bool = False,
+    ) -> None:
+        """Class for decoupling the instrument acquisition from the processing with a producer/consumer pipeline.
+        The acquisition thread only talks to the instruments and pushes timestamped samples into a bounded queue
+        of each consumer stage (like reducing, saving and plotting), which are running in parallel.
+        :param func_acquire:    Function for acquiring one step with input params (index), returning the sample value
+        :param stages:          List with consumer functions with input params (sample: PipelineSample)
+        :param queue_size:      Integer with maximal number of samples in the queue of each stage
+        :param period_sec:      Floating with fixed step period of acquisition in seconds (0.0: as fast as possible)
+        :param drop_on_full:    If True, samples are dropped for full stages, otherwise the acquisition is blocked (backpressure)
+        :return:                None
+        """
+        self._logger = getLogger(__name__)
+        self._func_acquire = func_acquire
+        self._func_stages = list(stages)
+        self._queue_size = queue_size
+        self._period_sec = period_sec
+        self._drop_on_full = drop_on_full
+
+    def run(self, num_steps: int) -> PipelineStatistics:
+        """Function for running the pipeline. If a consumer stage fails, the acquisition is stopped and the error is raised.
+        :param num_steps:   Integer with number of acquisition steps
+        :return:            Dataclass PipelineStatistics with counters of each stage
+        """
+        self._stages = [
+            _ConsumerStage(func=func, queue_size=self._queue_size) for func in self._func_stages
+        ]
+        for stage in self._stages:
+            stage.thread.start()
+
+        timestamps = np.zeros(shape=(num_steps,), dtype=float)
+        num_acquired = 0
+        time_start = perf_counter()
+        try:
+            for idx in range(num_steps):
+                if any(stage.error is not None for stage in self._stages):
+                    self._logger.error(f"Consumer stage failed - acquisition stopped at step {idx}")
+                    break
+                if self._period_sec > 0.0:
+                    time_wait = time_start + idx * self._period_sec - perf_counter()
+                    if time_wait > 0.0:
+                        sleep(time_wait)
+                value = self._func_acquire(idx)
+                timestamps[idx] = perf_counter() - time_start
+                sample = PipelineSample(index=idx, timestamp=timestamps[idx], value=value)
+                for stage in self._stages:
+                    stage.put(sample, drop_on_full=self._drop_on_full)
+                num_acquired += 1
+        finally:
+            for stage in self._stages:
+                stage.queue.put(None)
+            for stage in self._stages:
+                stage.thread.join()
+        duration = perf_counter() - time_start
+
+        for stage in self._stages:
+            if stage.error is not None:
+                raise stage.error
+        period = np.diff(timestamps)
+        stats = PipelineStatistics(
+            num_acquired=num_acquired,
+            num_processed=[stage.num_processed for stage in self._stages],
+            num_dropped=[stage.num_dropped for stage in self._stages],
+            num_blocked=[stage.num_blocked for stage in self._stages],
+            max_queue_fill=[stage.max_queue_fill for stage in self._stages],
+            period_mean=float(np.mean(period)) if period.size else 0.0,
+            period_jitter=float(np.std(period)) if period.size else 0.0,
+            duration_sec=duration,
+        )
+        self._logger.debug(f"Pipeline finished with {stats}")
+        return stats
@@ -0,0 +1,102 @@
+from threading import Event
+from time import sleep
+
+import numpy as np
+import pytest
+
+from elasticai.hw_measurements.charac.pipeline import AcquisitionPipeline, PipelineSample
+
+
+def test_pipeline_all_samples_processed_in_order():
+    rslt = list()
+    stats = AcquisitionPipeline(func_acquire=lambda idx: 2 * idx, stages=[rslt.append]).run(num_steps=50)
+    assert [sample.value for sample in rslt] == [2 * idx for idx in range(50)]
+    assert stats.num_acquired == 50
+    assert stats.num_processed == [50]
+    assert stats.num_dropped == [0]
+
+
+def test_pipeline_timestamps_rising():
+    rslt = list()
+    AcquisitionPipeline(func_acquire=lambda idx: idx, stages=[rslt.append]).run(num_steps=10)
+    assert all(isinstance(sample, PipelineSample) for sample in rslt)
+    assert np.all(np.diff([sample.timestamp for sample in rslt]) >= 0.0)
+
+
+def test_pipeline_backpressure_blocks_acquisition():
+    stats = AcquisitionPipeline(
+        func_acquire=lambda idx: idx, stages=[lambda sample: sleep(0.005)], queue_size=2
+    ).run(num_steps=20)
+    assert stats.num_processed == [20]
+    assert stats.num_dropped == [0]
+    assert stats.num_blocked[0] > 0
+    assert stats.max_queue_fill[0] <= 3
+
+
+def test_pipeline_drop_on_full():
+    stats = AcquisitionPipeline(
+        func_acquire=lambda idx: idx,
+        stages=[lambda sample: sleep(0.01), lambda sample: None],
+        queue_size=2,
+        drop_on_full=True,
+    ).run(num_steps=30)
+    assert stats.num_dropped[0] > 0
+    assert stats.num_processed[0] + stats.num_dropped[0] == 30
+    assert stats.num_processed[1] + stats.num_dropped[1] == 30
+    assert stats.num_blocked == [0, 0]
+
+
+def test_pipeline_cadence_steady_with_heavy_processing():
+    rslt = list()
+
+    def stage(sample: PipelineSample) -> None:
+        sleep(0.02)
+        rslt.append(sample)
+
+    stats = AcquisitionPipeline(
+        func_acquire=lambda idx: idx,
+        stages=[stage],
+        period_sec=0.005,
+        queue_size=64,
+    ).run(num_steps=20)
+    assert [sample.index for sample in rslt] == list(range(20))
+    assert stats.num_processed == [20]
+    assert stats.num_blocked == [0]
+    assert stats.max_queue_fill[0] <= 20
+    timestamps = np.array([sample.timestamp for sample in rslt])
+    assert np.all(np.diff(timestamps) > 0.0)
+    assert np.all(timestamps >= 0.005 * np.arange(20))
+
+
+def test_pipeline_stage_error_is_raised():
+    def stage(sample: PipelineSample) -> None:
+        raise RuntimeError("Disk full")
+
+    with pytest.raises(RuntimeError, match="Disk full"):
+        AcquisitionPipeline(func_acquire=lambda idx: idx, stages=[stage]).run(num_steps=5)
+
+
+def test_pipeline_stage_error_stops_acquisition():
+    acquired = list()
+    failed = Event()
+
+    def acquire(idx: int) -> int:
+        # wait until first sample is rejected by the stage
+        if idx > 0:
+            failed.wait(timeout=5.0)
+        acquired.append(idx)
+        return idx
+
+    def stage(sample: PipelineSample) -> None:
+        failed.set()
+        raise RuntimeError("Disk full")
+
+    with pytest.raises(RuntimeError, match="Disk full"):
+        AcquisitionPipeline(func_acquire=acquire, stages=[stage]).run(num_steps=1000)
+    assert len(acquired) < 1000
+
+
+def test_pipeline_timestamp_after_read():
+    rslt = list()
+    AcquisitionPipeline(func_acquire=lambda idx: sleep(0.01), stages=[rslt.append]).run(num_steps=2)
+    assert rslt[0].timestamp >= 0.01
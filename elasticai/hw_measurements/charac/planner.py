@@ -0,0 +1,221 @@
+from collections.abc import Callable
+from copy import deepcopy
+from dataclasses import dataclass, field
+from itertools import product
+from logging import Logger, getLogger
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+
+from elasticai.hw_measurements._helper.yaml import YamlConfigHandler
+
+
+@dataclass
+class LatencyProfile:
+    """Class with measured latencies of one instrument command in the sweep loop
+    Attributes:
+        set_mux:    Floating with latency for setting the DUT channel [s]
+        set_stim:   Floating with latency for applying one stimulus value [s]
+        read:       Floating with latency for reading one sample [s]
+        beep:       Floating with latency of one beep [s]
+    """
+
+    set_mux: float
+    set_stim: float
+    read: float
+    beep: float
+
+
+DefaultLatencyProfile = LatencyProfile(
+    set_mux=0.01,
+    set_stim=0.02,
+    read=0.05,
+    beep=0.2,
+)
+
+
+@dataclass(frozen=True)
+class SweepPhase:
+    name: str
+    num_steps: int
+    time_command: float
+    time_sleep: float
+
+    @property
+    def duration_sec(self) -> float:
+        """Returning the predicted wall time of the phase"""
+        return self.time_command + self.time_sleep
+
+
+@dataclass(frozen=True)
+class SweepPlan:
+    phases: list
+    settings: object = None
+
+    @property
+    def duration_sec(self) -> float:
+        """Returning the predicted wall time of the complete sweep"""
+        return float(sum(phase.duration_sec for phase in self.phases))
+
+    @property
+    def num_steps(self) -> int:
+        """Returning the total number of stimulus steps"""
+        return int(sum(phase.num_steps for phase in self.phases))
+
+
+@dataclass(frozen=True)
+class SweepSuggestion:
+    changes: dict
+    plan: SweepPlan
+    cost: float = field(default=0.0)
+
+
+def load_latency_profile(path2yaml: Path, yaml_name: str = "Config_Latency") -> LatencyProfile:
+    """Function for loading a stored latency profile (is created with default values if not existing)
+    :param path2yaml:   Path to the folder with YAML file
+    :param yaml_name:   String with name of the YAML file
+    :return:            Dataclass LatencyProfile
+    """
+    return YamlConfigHandler(
+        yaml_template=DefaultLatencyProfile, path2yaml=path2yaml, yaml_name=yaml_name
+    ).get_class(LatencyProfile)
+
+
+def calibrate_latency_profile(
+    func_set_stim, func_read, func_set_mux=None, func_beep=None, num_calls: int = 10
+) -> LatencyProfile:
+    """Function for measuring the latencies of the instrument commands in a short calibration pass (median of all calls)
+    :param func_set_stim:   Function for applying one stimulus value with input params (data), called with 0.0
+    :param func_read:       Function for reading one sample
+    :param func_set_mux:    Function for setting the DUT channel with input params (chnl), None if not used
+    :param func_beep:       Function for do a beep in DAQ, None if not used
+    :param num_calls:       Integer with number of calls for each command
+    :return:                Dataclass LatencyProfile
+    """
+
+    def measure(func: Callable | None, *args) -> float:
+        if func is None:
+            return 0.0
+        latency = np.zeros(shape=(num_calls,), dtype=float)
+        for idx in range(num_calls):
+            time_start = perf_counter()
+            func(*args)
+            latency[idx] = perf_counter() - time_start
+        return float(np.median(latency))
+
+    return LatencyProfile(
+        set_mux=measure(func_set_mux, 0),
+        set_stim=measure(func_set_stim, 0.0),
+        read=measure(func_read),
+        beep=measure(func_beep),
+    )
+
+
+class SweepPlanner:
+    _logger: Logger
+    _settings: object
+    _latency: LatencyProfile
+    _num_reads: int
+    time_finish: float = 0.5
+    num_finish: int = 4
+
+    def __init__(self, settings: object, latency: LatencyProfile, num_reads: int = 1) -> None:
+        """Class for predicting the wall time of a characterization sweep without hardware (dry-run) and for
+        suggesting config changes to fit into a time budget
+        :param settings:    Dataclass with settings of the characterization (like: SettingsADC, SettingsDAC, ...)
+        :param latency:     Dataclass LatencyProfile with command latencies
+        :param num_reads:   Integer with number of instrument reads per oversampling step (like: 2 for DUT and sensing)
+        :return:            None
+        """
+        self._logger = getLogger(__name__)
+        self._settings = settings
+        self._latency = latency
+        self._num_reads = num_reads
+
+    @staticmethod
+    def _get_channels(settings: object) -> list:
+        """Getting the list with tested channels of the settings (single channel if not defined)"""
+        for key in ("adc_chnl", "dac_chnl"):
+            if hasattr(settings, key):
+                return list(getattr(settings, key))
+        return [0]
+
+    @staticmethod
+    def _get_step_knob(settings: object) -> str:
+        """Getting the name of the settings variable for the stimulus step size"""
+        return "delta_steps" if hasattr(settings, "delta_steps") else "num_steps"
+
+    def estimate(self, settings: object | None = None) -> SweepPlan:
+        """Function for predicting the wall time of each phase (one per channel and the final beeps)
+        :param settings:    Dataclass with settings (None: settings of the planner)
+        :return:            Dataclass SweepPlan
+        """
+        settings = self._settings if settings is None else settings
+        lat = self._latency
+        num_steps = settings.get_num_steps()
+        time_step = lat.set_stim + self._num_reads * settings.daq_ovr * lat.read
+        time_chnl = lat.set_mux + settings.num_rpt * (num_steps * time_step + lat.beep)
+
+        phases = [
+            SweepPhase(
+                name=f"ch{chnl:02d}",
+                num_steps=settings.num_rpt * num_steps,
+                time_command=time_chnl,
+                time_sleep=settings.num_rpt * num_steps * settings.sleep_sec,
+            )
+            for chnl in self._get_channels(settings)
+        ]
+        phases.append(
+            SweepPhase(
+                name="finish",
+                num_steps=0,
+                time_command=self.num_finish * lat.beep,
+                time_sleep=self.num_finish * self.time_finish,
+            )
+        )
+        return SweepPlan(phases=phases, settings=settings)
+
+    def suggest(
+        self, budget_sec: float, num_suggestions: int = 3, max_factor: int = 8
+    ) -> list[SweepSuggestion]:
+        """Function for suggesting the cheapest config changes to fit the sweep into a time budget.
+        The cost is the summed log2-reduction of repetitions, oversampling and step resolution; shorter sleep times
+        are weighted twice due to the risk of non-settled measurements.
+        :param budget_sec:      Floating with time budget [s]
+        :param num_suggestions: Integer with maximal number of returned suggestions
+        :param max_factor:      Integer with maximal reduction factor of each variable
+        :return:                List with dataclass SweepSuggestion sorted by cost and predicted duration (empty if not possible)
+        """
+        settings = self._settings
+        knob_step = self._get_step_knob(settings)
+        factors = [2**idx for idx in range(int(np.log2(max_factor)) + 1)]
+        candidates = list()
+        for f_rpt, f_ovr, f_step, f_sleep in product(factors, factors, factors, factors[:3]):
+            if f_rpt > settings.num_rpt or f_ovr > settings.daq_ovr:
+                continue
+            changes = dict()
+            if f_rpt > 1:
+                changes["num_rpt"] = int(np.ceil(settings.num_rpt / f_rpt))
+            if f_ovr > 1:
+                changes["daq_ovr"] = int(np.ceil(settings.daq_ovr / f_ovr))
+            if f_step > 1:
+                changes[knob_step] = getattr(settings, knob_step) * f_step
+            if f_sleep > 1:
+                changes["sleep_sec"] = settings.sleep_sec / f_sleep
+
+            candidate = deepcopy(settings)
+            for key, value in changes.items():
+                setattr(candidate, key, value)
+            try:
+                plan = self.estimate(candidate)
+            except AssertionError:
+                continue
+            if plan.duration_sec <= budget_sec:
+                cost = float(np.log2(f_rpt * f_ovr * f_step) + 2 * np.log2(f_sleep))
+                candidates.append(SweepSuggestion(changes=changes, plan=plan, cost=cost))
+
+        candidates.sort(key=lambda item: (item.cost, item.plan.duration_sec))
+        if not candidates:
+            self._logger.info(f"No config found for time budget of {budget_sec} s")
+        return candidates[:num_suggestions]
@@ -0,0 +1,75 @@
+from copy import deepcopy
+from time import sleep
+
+import pytest
+
+from elasticai.hw_measurements import get_path_to_project
+from elasticai.hw_measurements.charac.adc import CharacterizationADC, SettingsADC
+from elasticai.hw_measurements.charac.planner import (
+    DefaultLatencyProfile,
+    LatencyProfile,
+    SweepPlanner,
+    calibrate_latency_profile,
+    load_latency_profile,
+)
+
+settings = SettingsADC(
+    system_id="0",
+    voltage_min=0.0,
+    voltage_max=5.0,
+    adc_reso=12,
+    adc_chnl=[0, 1],
+    adc_rang=[0.0, 5.0],
+    daq_ovr=4,
+    num_rpt=4,
+    delta_steps=0.5,
+    sleep_sec=0.1,
+)
+latency = LatencyProfile(set_mux=0.01, set_stim=0.02, read=0.05, beep=0.2)
+
+
+def test_load_latency_profile(tmp_path):
+    profile = load_latency_profile(path2yaml=tmp_path)
+    assert (tmp_path / "Config_Latency.yaml").exists()
+    assert profile == DefaultLatencyProfile
+
+
+def test_calibrate_latency_profile():
+    profile = calibrate_latency_profile(
+        func_set_stim=lambda data: None, func_read=lambda: sleep(0.002), num_calls=5
+    )
+    assert profile.read >= 0.002
+    assert profile.set_mux == profile.beep == 0.0
+
+
+def test_estimate_sweep():
+    plan = SweepPlanner(settings=settings, latency=latency, num_reads=2).estimate()
+    assert [phase.name for phase in plan.phases] == ["ch00", "ch01", "finish"]
+    time_chnl = 0.01 + 4 * (11 * (0.02 + 2 * 4 * 0.05) + 0.2) + 4 * 11 * 0.1
+    assert plan.phases[0].duration_sec == pytest.approx(time_chnl)
+    assert plan.duration_sec == pytest.approx(2 * time_chnl + 4 * (0.2 + 0.5))
+    assert plan.num_steps == 2 * 4 * 11
+
+
+def test_suggest_for_budget():
+    planner = SweepPlanner(settings=settings, latency=latency, num_reads=2)
+    budget = 0.6 * planner.estimate().duration_sec
+    suggestions = planner.suggest(budget_sec=budget, num_suggestions=5)
+    assert len(suggestions) == 5
+    assert all(item.plan.duration_sec <= budget for item in suggestions)
+    assert [item.cost for item in suggestions] == sorted(item.cost for item in suggestions)
+    assert suggestions[0].cost == 1.0
+    assert "sleep_sec" not in suggestions[0].changes
+
+    check = deepcopy(settings)
+    for key, value in suggestions[0].changes.items():
+        setattr(check, key, value)
+    assert planner.estimate(check).duration_sec == pytest.approx(suggestions[0].plan.duration_sec)
+    assert planner.suggest(budget_sec=1.0) == []
+
+
+def test_planner_from_characterization():
+    hndl = CharacterizationADC(path2yaml=get_path_to_project("temp_config") / "adc")
+    hndl.settings = deepcopy(settings)
+    plan = hndl.get_sweep_planner(latency).estimate()
+    assert plan.phases[0].time_command == pytest.approx(0.01 + 4 * (11 * 0.42 + 0.2))
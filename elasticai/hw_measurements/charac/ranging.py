@@ -0,0 +1,86 @@
+from dataclasses import dataclass
+from logging import Logger, getLogger
+
+import numpy as np
+
+RangesDMM6500Voltage = (0.1, 1.0, 10.0, 100.0, 1000.0)
+RangesDMM6500Current = (1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0, 3.0)
+RangesNGUX01Voltage = (6.0, 20.0)
+RangesNGUX01Current = (0.01, 0.1, 2.0)
+
+
+@dataclass(frozen=True)
+class RangePlan:
+    """Class with the planned measurement order and fixed instrument ranges of a sweep
+    Attributes:
+        order:                  Numpy array with indices of stimuli in measurement order
+        ranges:                 Numpy array with the selected range of each stimuli value (in original order)
+        segments:               List with tuple (start, stop, range) of consecutive steps in measurement order with same range
+        num_switches:           Integer with number of range changes in measurement order
+        num_switches_original:  Integer with number of range changes in original (low to high) order
+    """
+
+    order: np.ndarray
+    ranges: np.ndarray
+    segments: list
+    num_switches: int
+    num_switches_original: int
+
+
+class RangePlanner:
+    _logger: Logger
+    _ranges: np.ndarray
+    _headroom: float
+
+    def __init__(self, ranges: tuple | list, headroom: float = 0.95) -> None:
+        """Class for planning fixed instrument ranges (like: set_voltage_range/set_current_range of DMM6500 or NGUX01)
+        and the stimulus order of a sweep to avoid autorange stalls
+        :param ranges:      Tuple with available ranges of the instrument (like: RangesDMM6500Voltage)
+        :param headroom:    Floating with maximal usage of the range (expected value / range) before switching to next range
+        :return:            None
+        """
+        self._logger = getLogger(__name__)
+        self._ranges = np.sort(np.asarray(ranges, dtype=float))
+        self._headroom = headroom
+
+    def get_ranges(self, expected: np.ndarray) -> np.ndarray:
+        """Function for getting the smallest range covering the expected instrument values (vectorized)
+        :param expected:    Numpy array with expected values of the DUT response
+        :return:            Numpy array with selected range of each value
+        """
+        idx = np.searchsorted(self._ranges * self._headroom, np.abs(expected), side="left")
+        if np.any(idx >= self._ranges.size):
+            raise ValueError(f"Expected values exceed the maximal range of {self._ranges[-1]}")
+        return self._ranges[idx]
+
+    @staticmethod
+    def _get_num_switches(ranges: np.ndarray) -> int:
+        """Getting the number of range changes in sequence"""
+        return int(np.count_nonzero(np.diff(ranges)))
+
+    def plan(self, expected: np.ndarray, keep_order: bool = False) -> RangePlan:
+        """Function for planning the range of each step and the measurement order with minimal number of range switches.
+        Steps are grouped by range (ascending) and keep their original order inside each group.
+        :param expected:    Numpy array with expected values of the DUT response of each stimuli value
+        :param keep_order:  If True, the original order is kept and only the ranges are planned
+        :return:            Dataclass RangePlan
+        """
+        ranges = self.get_ranges(expected)
+        order = np.arange(ranges.size) if keep_order else np.argsort(ranges, kind="stable")
+        ranges_ordered = ranges[order]
+        bounds = np.concatenate(([0], np.flatnonzero(np.diff(ranges_ordered)) + 1, [ranges.size]))
+        segments = [
+            (int(start), int(stop), float(ranges_ordered[start]))
+            for start, stop in zip(bounds[:-1], bounds[1:])
+        ]
+        plan = RangePlan(
+            order=order,
+            ranges=ranges,
+            segments=segments,
+            num_switches=len(segments) - 1,
+            num_switches_original=self._get_num_switches(ranges),
+        )
+        self._logger.debug(
+            f"Range plan with {plan.num_switches} switches (original: {plan.num_switches_original})"
+        )
+        return plan
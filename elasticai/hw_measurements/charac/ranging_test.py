@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from elasticai.hw_measurements.charac.ranging import (
+    RangePlanner,
+    RangesDMM6500Voltage,
+    RangesNGUX01Current,
+)
+
+
+def test_get_ranges():
+    hndl = RangePlanner(ranges=RangesDMM6500Voltage, headroom=0.9)
+    rslt = hndl.get_ranges(np.array([0.0, 0.09, 0.091, -0.5, 5.0, 9.5, 850.0]))
+    np.testing.assert_array_equal(rslt, [0.1, 0.1, 1.0, 1.0, 10.0, 100.0, 1000.0])
+    with pytest.raises(ValueError):
+        hndl.get_ranges(np.array([1e4]))
+
+
+def test_plan_grouped_triangular():
+    stimuli = np.concatenate((np.linspace(0.0, 5.0, 11), np.linspace(4.5, -5.0, 20)))
+    plan = RangePlanner(ranges=RangesDMM6500Voltage).plan(expected=stimuli)
+    assert plan.num_switches_original == 6
+    assert plan.num_switches == 2
+    assert plan.segments == [(0, 2, 0.1), (2, 5, 1.0), (5, 31, 10.0)]
+    np.testing.assert_array_equal(np.sort(plan.order), np.arange(stimuli.size))
+    assert np.all(np.diff(plan.order[plan.segments[0][0] : plan.segments[0][1]]) > 0)
+
+
+def test_plan_keep_order():
+    expected = np.array([1e-3, 5e-2, 1e-3, 1.0])
+    plan = RangePlanner(ranges=RangesNGUX01Current).plan(expected=expected, keep_order=True)
+    np.testing.assert_array_equal(plan.order, np.arange(4))
+    assert plan.num_switches == plan.num_switches_original == 3
+    assert [seg[2] for seg in plan.segments] == [0.01, 0.1, 0.01, 2.0]
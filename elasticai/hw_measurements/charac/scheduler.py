@@ -0,0 +1,158 @@
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, fields
+from logging import Logger, getLogger
+from threading import Condition
+from time import perf_counter
+from typing import Any
+
+from elasticai.hw_measurements.predefines import DriverPort
+
+
+def get_instruments_from_port(port: type = DriverPort) -> list:
+    """Function for getting the instrument names of the laboratory setup from DriverPort (like: com_ngu -> ngu)"""
+    return [item.name.removeprefix("com_") for item in fields(port)]
+
+
+@dataclass
+class StationJob:
+    """Class with a DUT job for the test station
+    Attributes:
+        name:           String with unique job name (like: system_id of the DUT)
+        instruments:    List with names of used instruments (like: ['ngu', 'dmm']), must be locked during measurement
+        func_run:       Function for running the measurement without inputs, returning the results (like: run_transfer_test)
+        func_analyse:   Function for analysing / plotting the results with input params (results), is running in background
+    """
+
+    name: str
+    instruments: list
+    func_run: Callable[[], Any]
+    func_analyse: Callable[[Any], Any] | None = None
+
+
+@dataclass(frozen=True)
+class StationJobResult:
+    name: str
+    results: Any
+    analysis: Any
+    duration_sec: float
+
+
+@dataclass
+class _JobState:
+    job: StationJob
+    results: Any = None
+    duration_sec: float = 0.0
+    analysis: Future | None = field(default=None)
+
+
+class StationScheduler:
+    _logger: Logger
+    _instruments: list
+    _jobs: list[StationJob]
+    _num_workers: int
+
+    def __init__(self, instruments: list | None = None, num_workers: int = 2) -> None:
+        """Class for scheduling the measurements of many DUTs on one test station. Instruments are shared resources,
+        jobs with disjoint instruments are measured in parallel and the analysis is done in a background pool.
+        :param instruments: List with available instrument names (default: all devices from DriverPort)
+        :param num_workers: Integer with number of background workers for analysis / plotting
+        :return:            None
+        """
+        self._logger = getLogger(__name__)
+        self._instruments = get_instruments_from_port() if instruments is None else list(instruments)
+        self._jobs = list()
+        self._num_workers = num_workers
+
+    @property
+    def get_num_jobs(self) -> int:
+        """Returning the number of queued jobs"""
+        return len(self._jobs)
+
+    def add_job(self, job: StationJob) -> None:
+        """Function for adding a DUT job to the queue
+        :param job: Dataclass StationJob
+        :return:    None
+        """
+        unknown = [inst for inst in job.instruments if inst not in self._instruments]
+        if unknown:
+            raise ValueError(f"Instruments {unknown} are not available on test station")
+        if job.name in [item.name for item in self._jobs]:
+            raise ValueError(f"Job {job.name} is already queued")
+        self._jobs.append(job)
+
+    @staticmethod
+    def _get_next_job(pending: list[StationJob], busy: set) -> StationJob | None:
+        """Getting the first pending job whose instruments are free. Instruments of earlier (blocked) jobs
+        are reserved so that jobs sharing instruments keep the queue order."""
+        reserved = set()
+        for job in pending:
+            used = set(job.instruments)
+            if not used & busy and not used & reserved:
+                return job
+            reserved |= used
+        return None
+
+    def run(self) -> dict[str, StationJobResult]:
+        """Function for running all queued jobs. If a measurement fails, no further jobs are started,
+        the already running measurements are finished (instruments are left in a defined state) and the error is raised.
+        :return:    Dictionary with job name as key and dataclass StationJobResult
+        """
+        pending = list(self._jobs)
+        states = {job.name: _JobState(job=job) for job in pending}
+        busy = set()
+        errors = list()
+        cond = Condition()
+
+        with (
+            ThreadPoolExecutor(max_workers=max(1, self._num_workers)) as pool_analyse,
+            ThreadPoolExecutor(max_workers=max(1, len(pending))) as pool_measure,
+        ):
+
+            def measure(state: _JobState) -> None:
+                time_start = perf_counter()
+                try:
+                    state.results = state.job.func_run()
+                except BaseException as err:
+                    with cond:
+                        errors.append(err)
+                    raise
+                finally:
+                    state.duration_sec = perf_counter() - time_start
+                    with cond:
+                        busy.difference_update(state.job.instruments)
+                        cond.notify_all()
+                self._logger.debug(f"Job {state.job.name} measured in {state.duration_sec:.2f} s")
+                if state.job.func_analyse is not None:
+                    state.analysis = pool_analyse.submit(state.job.func_analyse, state.results)
+
+            measurements = list()
+            with cond:
+                while pending and not errors:
+                    job = self._get_next_job(pending, busy)
+                    if job is None:
+                        cond.wait()
+                        continue
+                    pending.remove(job)
+                    busy.update(job.instruments)
+                    self._logger.debug(f"Start job {job.name} with instruments {job.instruments}")
+                    measurements.append(pool_measure.submit(measure, states[job.name]))
+                if errors:
+                    self._logger.error(
+                        f"Measurement failed - skipped jobs {[job.name for job in pending]}"
+                    )
+                    raise errors[0]
+
+            for item in measurements:
+                item.result()
+            results = {
+                name: StationJobResult(
+                    name=name,
+                    results=state.results,
+                    analysis=state.analysis.result() if state.analysis is not None else None,
+                    duration_sec=state.duration_sec,
+                )
+                for name, state in states.items()
+            }
+        self._jobs = list()
+        return results
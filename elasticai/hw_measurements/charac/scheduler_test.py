@@ -0,0 +1,139 @@
+from threading import Barrier, Event, Lock
+from time import sleep
+
+import pytest
+
+from elasticai.hw_measurements.charac.scheduler import (
+    StationJob,
+    StationScheduler,
+    get_instruments_from_port,
+)
+
+
+class InstrumentUsage:
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.active = dict()
+        self.violation = False
+        self.order = list()
+
+    def func_run(self, name: str, instruments: list, duration: float = 0.1):
+        def run() -> dict:
+            with self._lock:
+                for inst in instruments:
+                    if self.active.get(inst, False):
+                        self.violation = True
+                    self.active[inst] = True
+                self.order.append(name)
+            sleep(duration)
+            with self._lock:
+                for inst in instruments:
+                    self.active[inst] = False
+            return {"name": name}
+
+        return run
+
+
+def test_get_instruments_from_port():
+    assert get_instruments_from_port() == ["ngu", "dmm", "mxo", "hmp"]
+
+
+def test_add_job_unknown_instrument():
+    hndl = StationScheduler()
+    with pytest.raises(ValueError, match="not available"):
+        hndl.add_job(StationJob(name="0", instruments=["smu"], func_run=lambda: None))
+
+
+def test_add_job_twice():
+    hndl = StationScheduler()
+    hndl.add_job(StationJob(name="0", instruments=["ngu"], func_run=lambda: None))
+    with pytest.raises(ValueError, match="already queued"):
+        hndl.add_job(StationJob(name="0", instruments=["dmm"], func_run=lambda: None))
+
+
+def test_run_disjoint_jobs_in_parallel():
+    barrier = Barrier(3, timeout=5.0)
+
+    def func_run(name: str):
+        def run() -> dict:
+            # only passes if all three measurements are running at the same time
+            barrier.wait()
+            return {"name": name}
+
+        return run
+
+    hndl = StationScheduler()
+    hndl.add_job(StationJob(name="adc", instruments=["ngu"], func_run=func_run("adc")))
+    hndl.add_job(StationJob(name="dac", instruments=["dmm"], func_run=func_run("dac")))
+    hndl.add_job(StationJob(name="amp", instruments=["mxo"], func_run=func_run("amp")))
+
+    rslt = hndl.run()
+    assert list(rslt.keys()) == ["adc", "dac", "amp"]
+    assert rslt["dac"].results == {"name": "dac"}
+    assert hndl.get_num_jobs == 0
+
+
+def test_run_shared_instruments_keep_order():
+    usage = InstrumentUsage()
+    hndl = StationScheduler()
+    for idx, inst in enumerate([["ngu", "dmm"], ["ngu"], ["dmm"], ["hmp"]]):
+        hndl.add_job(
+            StationJob(
+                name=f"dut{idx}", instruments=inst, func_run=usage.func_run(f"dut{idx}", inst, 0.05)
+            )
+        )
+    hndl.run()
+    assert not usage.violation
+    assert usage.order.index("dut0") < usage.order.index("dut1")
+    assert usage.order.index("dut0") < usage.order.index("dut2")
+
+
+def test_run_analysis_in_background():
+    usage = InstrumentUsage()
+    measured_last = Event()
+
+    def func_analyse(data: dict) -> tuple:
+        # analysis of first DUT is only finished if the last DUT is measured meanwhile
+        overlap = measured_last.wait(timeout=5.0) if data["name"] == "dut0" else True
+        return data["name"].upper(), overlap
+
+    def func_run_last() -> dict:
+        measured_last.set()
+        return {"name": "dut2"}
+
+    hndl = StationScheduler(num_workers=2)
+    for idx in range(3):
+        func_run = usage.func_run(f"dut{idx}", ["ngu"], 0.01) if idx < 2 else func_run_last
+        hndl.add_job(
+            StationJob(
+                name=f"dut{idx}", instruments=["ngu"], func_run=func_run, func_analyse=func_analyse
+            )
+        )
+    rslt = hndl.run()
+    assert [item.analysis for item in rslt.values()] == [("DUT0", True), ("DUT1", True), ("DUT2", True)]
+    assert all(item.duration_sec > 0.0 for item in rslt.values())
+
+
+def test_run_job_error_is_raised():
+    def func_fail() -> dict:
+        raise RuntimeError("DUT not responding")
+
+    hndl = StationScheduler()
+    hndl.add_job(StationJob(name="0", instruments=["ngu"], func_run=func_fail))
+    with pytest.raises(RuntimeError, match="DUT not responding"):
+        hndl.run()
+
+
+def test_run_job_error_stops_scheduling():
+    usage = InstrumentUsage()
+
+    def func_fail() -> dict:
+        raise RuntimeError("DUT not responding")
+
+    hndl = StationScheduler()
+    hndl.add_job(StationJob(name="0", instruments=["ngu"], func_run=func_fail))
+    hndl.add_job(StationJob(name="1", instruments=["ngu"], func_run=usage.func_run("1", ["ngu"])))
+    hndl.add_job(StationJob(name="2", instruments=["ngu"], func_run=usage.func_run("2", ["ngu"])))
+    with pytest.raises(RuntimeError, match="DUT not responding"):
+        hndl.run()
+    assert usage.order == []
@@ -0,0 +1,285 @@
+from dataclasses import dataclass, field
+from logging import Logger, getLogger
+from pathlib import Path
+from time import perf_counter, sleep
+
+import numpy as np
+import yaml
+
+from elasticai.hw_measurements.process.data import MetricCalculator
+
+
+@dataclass(frozen=True)
+class LimitCheck:
+    """Class with limits of one metric for production screening
+    Attributes:
+        metric:     String with metric name ['gain', 'lsb', 'dnl', 'inl', 'offset', 'noise_rms']
+        val_min:    Floating with lower limit (inclusive)
+        val_max:    Floating with upper limit (inclusive)
+        hard:       Boolean if a failing metric aborts the test immediately (otherwise checked after full sweep)
+    """
+
+    metric: str
+    val_min: float = -np.inf
+    val_max: float = np.inf
+    hard: bool = True
+
+    def is_passed(self, value: float) -> bool:
+        """Checking if the value is inside the limits (not available values (NaN) are failed)"""
+        return bool(self.val_min <= value <= self.val_max)
+
+
+class _ScreeningAccumulator:
+    _stim: np.ndarray
+    _mean: np.ndarray
+    num_steps: int
+    sum_stim: float
+    sum_mean: float
+    sum_lsb: float
+    lsb_min: float
+    lsb_max: float
+    noise_max: float
+
+    def __init__(self, num_steps: int) -> None:
+        """Class with running sums of a (partially) measured transfer function for updating the screening metrics in O(1) per step
+        :param num_steps:   Integer with maximal number of steps in sweep
+        :return:            None
+        """
+        self._stim = np.zeros(shape=(num_steps,), dtype=float)
+        self._mean = np.zeros(shape=(num_steps,), dtype=float)
+        self.num_steps = 0
+        self.sum_stim = 0.0
+        self.sum_mean = 0.0
+        self.sum_lsb = 0.0
+        self.lsb_min = np.inf
+        self.lsb_max = -np.inf
+        self.noise_max = np.nan
+
+    def add_step(self, stim: float, samples: np.ndarray) -> None:
+        """Adding the samples of the next step
+        :param stim:    Floating with applied stimulus value
+        :param samples: Numpy array with DAQ output of the step [shape: (daq_ovr, )]
+        :return:        None
+        """
+        idx = self.num_steps
+        self._stim[idx] = stim
+        self._mean[idx] = np.mean(samples)
+        if samples.size > 1:
+            self.noise_max = float(np.fmax(self.noise_max, np.std(samples)))
+        if idx > 0:
+            lsb = (self._mean[idx] - self._mean[idx - 1]) / (self._stim[idx] - self._stim[idx - 1])
+            self.sum_lsb += lsb
+            self.lsb_min = min(self.lsb_min, lsb)
+            self.lsb_max = max(self.lsb_max, lsb)
+        self.sum_stim += self._stim[idx]
+        self.sum_mean += self._mean[idx]
+        self.num_steps += 1
+
+    def get_metrics(self, do_inl: bool) -> dict:
+        """Getting the available screening metrics of the measured steps (same definition like ProductionScreening.calculate_metrics)
+        :param do_inl:  If True, the INL is calculated (O(num_steps), since it depends on the actual mean LSB)
+        :return:        Dictionary with available metrics (not available metrics are missing)
+        """
+        metrics = dict() if np.isnan(self.noise_max) else {"noise_rms": self.noise_max}
+        if self.num_steps < 2:
+            return metrics
+
+        lsb_mean = self.sum_lsb / (self.num_steps - 1)
+        stim_mean = self.sum_stim / self.num_steps
+        out_mean = self.sum_mean / self.num_steps
+        metrics.update({"gain": lsb_mean, "lsb": lsb_mean, "offset": out_mean - lsb_mean * stim_mean})
+        if self.num_steps > 2:
+            metrics["dnl"] = max(abs(self.lsb_min / lsb_mean - 1), abs(self.lsb_max / lsb_mean - 1))
+        if do_inl:
+            stim = self._stim[: self.num_steps] - stim_mean
+            out = self._mean[: self.num_steps] - out_mean
+            metrics["inl"] = float(np.max(np.abs(out - lsb_mean * stim)))
+        return metrics
+
+
+@dataclass(frozen=True)
+class ScreeningResult:
+    system_id: str
+    passed: bool
+    aborted: bool
+    failed: list
+    metrics: dict = field(default_factory=dict)
+    num_steps: int = 0
+    duration_sec: float = 0.0
+
+
+class ProductionScreening:
+    _logger: Logger
+    _limits: list[LimitCheck]
+    _hndl: MetricCalculator
+    metrics_available: tuple = ("gain", "lsb", "dnl", "inl", "offset", "noise_rms")
+
+    def __init__(self, limits: list[LimitCheck] | Path) -> None:
+        """Class for pass/fail screening of DUTs in production with incremental limit checks and early abort
+        :param limits:  List with dataclass LimitCheck or path to YAML limit file
+        :return:        None
+        """
+        self._logger = getLogger(__name__)
+        self._hndl = MetricCalculator()
+        self._limits = self.load_limits(limits) if isinstance(limits, Path) else list(limits)
+        for limit in self._limits:
+            if limit.metric not in self.metrics_available:
+                raise ValueError(f"Metric {limit.metric} is not available")
+
+    @property
+    def get_limits(self) -> list[LimitCheck]:
+        """Returning the used limits"""
+        return self._limits
+
+    @staticmethod
+    def load_limits(path2yaml: Path) -> list[LimitCheck]:
+        """Function for loading the limits from YAML file with entries like 'dnl: {val_max: 0.5, hard: true}'
+        :param path2yaml:   Path to YAML file
+        :return:            List with dataclass LimitCheck
+        """
+        if not path2yaml.exists():
+            raise FileNotFoundError(f"File {path2yaml} does not exist")
+        with open(path2yaml, "r") as f:
+            config_data = yaml.safe_load(f)
+        return [LimitCheck(metric=key, **value) for key, value in config_data.items()]
+
+    @staticmethod
+    def write_limits(path2yaml: Path, limits: list[LimitCheck]) -> None:
+        """Function for writing the limits into YAML file
+        :param path2yaml:   Path to YAML file
+        :param limits:      List with dataclass LimitCheck
+        :return:            None
+        """
+        path2yaml.parent.mkdir(parents=True, exist_ok=True)
+        config_data = {
+            item.metric: {
+                "val_min": float(item.val_min),
+                "val_max": float(item.val_max),
+                "hard": item.hard,
+            }
+            for item in limits
+        }
+        with open(path2yaml, "w") as f:
+            yaml.dump(config_data, f, sort_keys=False)
+
+    def calculate_metrics(self, stim_input: np.ndarray, daq_output: np.ndarray) -> dict:
+        """Function for calculating all screening metrics from (partially) measured transfer function.
+        The gain is the mean LSB over all steps, the offset is the mean of the INL (output minus gain * stimulus),
+        i.e. the intercept of the line with this gain through the centroid of the transfer function. The INL metric
+        is the maximal deviation from this line and the noise is the maximal standard deviation of the oversampled steps.
+        :param stim_input:  Numpy array with stimulus input [shape: (num_steps, )]
+        :param daq_output:  Numpy array with DAQ output [shape: (num_steps, daq_ovr)]
+        :return:            Dictionary with metrics (NaN if not available)
+        """
+        metrics = {key: np.nan for key in self.metrics_available}
+        if daq_output.shape[-1] > 1:
+            metrics["noise_rms"] = float(np.max(np.std(daq_output, axis=-1)))
+        if stim_input.size < 2:
+            return metrics
+
+        mean = np.mean(daq_output, axis=-1)
+        transfer = self._hndl.calculate_transfer_metrics(stim_input=stim_input, daq_output=mean)
+        metrics["gain"] = float(transfer.lsb_mean)
+        metrics["lsb"] = float(transfer.lsb_mean)
+        metrics["offset"] = float(transfer.offset)
+        metrics["inl"] = float(np.max(np.abs(transfer.inl - transfer.offset)))
+        if stim_input.size > 2:
+            metrics["dnl"] = float(np.max(np.abs(transfer.dnl)))
+        return metrics
+
+    def check_limits(self, metrics: dict, only_hard: bool) -> list[str]:
+        """Function for checking the metrics against the limits
+        :param metrics:     Dictionary with metrics (missing metrics are not checked, NaN values are failed)
+        :param only_hard:   If True, only hard limits are checked
+        :return:            List with names of failed metrics
+        """
+        return [
+            limit.metric
+            for limit in self._limits
+            if (limit.hard or not only_hard)
+            and limit.metric in metrics
+            and not limit.is_passed(metrics[limit.metric])
+        ]
+
+    def run_screening(
+        self,
+        system_id: str,
+        stimuli: np.ndarray,
+        func_set,
+        func_get,
+        daq_ovr: int = 1,
+        sleep_sec: float = 0.0,
+        chnl: list | tuple = (0,),
+        func_mux=None,
+        num_min_steps: int = 3,
+        num_steps_inl: int = 64,
+    ) -> ScreeningResult:
+        """Function for running the production screening of a DUT with incremental evaluation after each step.
+        The metrics are updated from running sums in O(1) per step, only the INL is checked every num_steps_inl steps.
+        :param system_id:       String with system name or ID
+        :param stimuli:         Numpy array with stimuli of the sweep
+        :param func_set:        Function for applying the stimuli value with input params (data)
+        :param func_get:        Function for getting the DUT output with input params (chnl)
+        :param daq_ovr:         Integer number for oversampling of DAQ system
+        :param sleep_sec:       Sleeping seconds between each DAQ setting
+        :param chnl:            List with channel IDs to test
+        :param func_mux:        Function for setting the channel with input params (chnl), None if not required
+        :param num_min_steps:   Integer with minimal number of measured steps before hard limits are checked
+        :param num_steps_inl:   Integer with interval of steps for checking the hard INL limit
+        :return:                Dataclass ScreeningResult
+        """
+        if daq_ovr < 2 and any(limit.metric == "noise_rms" for limit in self._limits):
+            raise ValueError("Limit noise_rms needs daq_ovr >= 2 for estimating the noise")
+        time_start = perf_counter()
+        metrics = dict()
+        num_steps = 0
+        for chnl_id in chnl:
+            if func_mux is not None:
+                func_mux(chnl_id)
+            data = np.zeros(shape=(stimuli.size, daq_ovr), dtype=float)
+            accumulator = _ScreeningAccumulator(num_steps=stimuli.size)
+            for val_idx, val in enumerate(stimuli):
+                func_set(val)
+                sleep(sleep_sec)
+                for ovr_idx in range(daq_ovr):
+                    data[val_idx, ovr_idx] = func_get(chnl_id)
+                accumulator.add_step(stim=val, samples=data[val_idx])
+                num_steps += 1
+
+                is_last = val_idx + 1 == stimuli.size
+                if val_idx + 1 < num_min_steps and not is_last:
+                    continue
+                metrics_ch = accumulator.get_metrics(do_inl=(val_idx + 1) % num_steps_inl == 0 or is_last)
+                failed = self.check_limits(metrics_ch, only_hard=True)
+                if failed:
+                    metrics.update(
+                        {
+                            f"ch{chnl_id:02d}": self.calculate_metrics(
+                                stimuli[: val_idx + 1], data[: val_idx + 1]
+                            )
+                        }
+                    )
+                    self._logger.info(f"DUT {system_id} failed on CH{chnl_id} with {failed} - Abort!")
+                    return ScreeningResult(
+                        system_id=system_id,
+                        passed=False,
+                        aborted=True,
+                        failed=[f"ch{chnl_id:02d}:{item}" for item in failed],
+                        metrics=metrics,
+                        num_steps=num_steps,
+                        duration_sec=perf_counter() - time_start,
+                    )
+            metrics.update({f"ch{chnl_id:02d}": self.calculate_metrics(stimuli, data)})
+
+        failed = [
+            f"{key}:{item}" for key, value in metrics.items() for item in self.check_limits(value, False)
+        ]
+        return ScreeningResult(
+            system_id=system_id,
+            passed=len(failed) == 0,
+            aborted=False,
+            failed=failed,
+            metrics=metrics,
+            num_steps=num_steps,
+            duration_sec=perf_counter() - time_start,
+        )
@@ -0,0 +1,163 @@
+import numpy as np
+import pytest
+
+from elasticai.hw_measurements import get_path_to_project
+from elasticai.hw_measurements.charac.screening import (
+    LimitCheck,
+    ProductionScreening,
+    _ScreeningAccumulator,
+)
+
+limits = [
+    LimitCheck(metric="gain", val_min=0.9, val_max=1.1, hard=True),
+    LimitCheck(metric="dnl", val_max=0.5, hard=True),
+    LimitCheck(metric="offset", val_min=-0.1, val_max=0.1, hard=False),
+    LimitCheck(metric="noise_rms", val_max=0.01, hard=True),
+]
+
+
+class DutLinear:
+    def __init__(self, gain: float = 1.0, offset: float = 0.0, jump: float = 0.0) -> None:
+        self.val = 0.0
+        self.num_reads = 0
+        self.gain = gain
+        self.offset = offset
+        self.jump = jump
+
+    def set(self, val: float) -> None:
+        self.val = val
+
+    def get(self, chnl: int) -> float:
+        self.num_reads += 1
+        return self.offset + self.gain * self.val + (self.jump if self.val > 2.0 else 0.0)
+
+
+def test_limit_check_passed():
+    limit = LimitCheck(metric="dnl", val_min=-0.5, val_max=0.5)
+    assert limit.is_passed(0.2)
+    assert not limit.is_passed(0.7)
+    assert not limit.is_passed(np.nan)
+
+
+def test_unknown_metric():
+    with pytest.raises(ValueError, match="not available"):
+        ProductionScreening(limits=[LimitCheck(metric="thd")])
+
+
+def test_write_and_load_limits():
+    path2yaml = get_path_to_project("temp_config") / "screening" / "limits.yaml"
+    ProductionScreening.write_limits(path2yaml=path2yaml, limits=limits)
+    rslt = ProductionScreening(limits=path2yaml).get_limits
+    assert rslt == limits
+
+
+def test_calculate_metrics_linear():
+    hndl = ProductionScreening(limits=limits)
+    stim = np.linspace(0.0, 5.0, 11)
+    data = np.tile((0.05 + 2.0 * stim)[:, None], (1, 4))
+    rslt = hndl.calculate_metrics(stim, data)
+    assert rslt["gain"] == pytest.approx(2.0)
+    assert rslt["lsb"] == pytest.approx(2.0)
+    assert rslt["offset"] == pytest.approx(0.05)
+    assert rslt["dnl"] == pytest.approx(0.0, abs=1e-9)
+    assert rslt["inl"] == pytest.approx(0.0, abs=1e-9)
+    assert rslt["noise_rms"] == 0.0
+
+
+def test_screening_passed():
+    dut = DutLinear()
+    stim = np.linspace(0.0, 5.0, 51)
+    rslt = ProductionScreening(limits=limits).run_screening(
+        system_id="0", stimuli=stim, func_set=dut.set, func_get=dut.get, daq_ovr=2, chnl=[0, 1]
+    )
+    assert rslt.passed and not rslt.aborted
+    assert rslt.num_steps == 2 * stim.size
+    assert list(rslt.metrics.keys()) == ["ch00", "ch01"]
+
+
+def test_screening_soft_fail_after_full_sweep():
+    dut = DutLinear(offset=0.5)
+    stim = np.linspace(0.0, 5.0, 51)
+    rslt = ProductionScreening(limits=limits).run_screening(
+        system_id="0", stimuli=stim, func_set=dut.set, func_get=dut.get, daq_ovr=2
+    )
+    assert not rslt.passed and not rslt.aborted
+    assert rslt.failed == ["ch00:offset"]
+    assert rslt.num_steps == stim.size
+
+
+def test_screening_hard_fail_aborts_early():
+    dut = DutLinear(gain=2.0)
+    stim = np.linspace(0.0, 5.0, 51)
+    rslt = ProductionScreening(limits=limits).run_screening(
+        system_id="0",
+        stimuli=stim,
+        func_set=dut.set,
+        func_get=dut.get,
+        daq_ovr=2,
+        chnl=[0, 1],
+        num_min_steps=3,
+    )
+    assert not rslt.passed and rslt.aborted
+    assert rslt.failed == ["ch00:gain"]
+    assert rslt.num_steps == 3
+    assert dut.num_reads == 6
+    assert rslt.metrics["ch00"]["gain"] == pytest.approx(2.0)
+
+
+def test_screening_hard_fail_on_missing_code():
+    dut = DutLinear(jump=0.1)
+    stim = np.linspace(0.0, 5.0, 51)
+    rslt = ProductionScreening(limits=limits).run_screening(
+        system_id="0", stimuli=stim, func_set=dut.set, func_get=dut.get, daq_ovr=2
+    )
+    assert rslt.aborted
+    assert rslt.failed == ["ch00:dnl"]
+    assert rslt.num_steps < stim.size
+
+
+def test_screening_noise_limit_without_oversampling():
+    dut = DutLinear()
+    with pytest.raises(ValueError, match="daq_ovr"):
+        ProductionScreening(limits=limits).run_screening(
+            system_id="0", stimuli=np.linspace(0.0, 5.0, 11), func_set=dut.set, func_get=dut.get
+        )
+
+
+def test_screening_incremental_metrics_equal():
+    rng = np.random.default_rng(0)
+    stim = np.linspace(0.0, 5.0, 40)
+    data = (0.1 + 1.02 * stim + 0.01 * rng.standard_normal(stim.size))[
+        :, None
+    ] + 0.001 * rng.standard_normal((stim.size, 3))
+    accumulator = _ScreeningAccumulator(num_steps=stim.size)
+    for idx in range(stim.size):
+        accumulator.add_step(stim=stim[idx], samples=data[idx])
+    ref = ProductionScreening(limits=limits).calculate_metrics(stim, data)
+    rslt = accumulator.get_metrics(do_inl=True)
+    for key in ProductionScreening.metrics_available:
+        assert rslt[key] == pytest.approx(ref[key])
+
+
+def test_screening_hard_inl_checked_in_interval():
+    dut = DutLinear(jump=0.5)
+    stim = np.linspace(0.0, 5.0, 51)
+    limits_inl = [LimitCheck(metric="inl", val_max=0.05, hard=True)]
+    rslt = ProductionScreening(limits=limits_inl).run_screening(
+        system_id="0", stimuli=stim, func_set=dut.set, func_get=dut.get, num_steps_inl=25
+    )
+    assert rslt.aborted
+    assert rslt.failed == ["ch00:inl"]
+    assert rslt.num_steps == 25
+
+    rslt = ProductionScreening(limits=limits_inl).run_screening(
+        system_id="0",
+        stimuli=stim[:50],
+        func_set=dut.set,
+        func_get=dut.get,
+        chnl=(0, 1, 2),
+        num_steps_inl=64,
+    )
+    assert rslt.aborted and not rslt.passed
+    assert rslt.failed == ["ch00:inl"]
+    assert rslt.num_steps == 50
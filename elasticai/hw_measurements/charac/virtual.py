@@ -0,0 +1,321 @@
+from logging import Logger, getLogger
+
+import numpy as np
+
+
+class _VirtualDevice:
+    _logger: Logger
+    _rng: np.random.Generator
+    _input_val: float | int
+
+    def __init__(self, seed: int | None = None) -> None:
+        """Common class of all virtual DUT models with seeded random generator and stored input value"""
+        self._logger = getLogger(__name__)
+        self._rng = np.random.default_rng(seed)
+        self._input_val = 0
+
+    def set_input(self, val: float | int) -> None:
+        """Function for applying the input value (like: func_daq of ADC or func_set_daq of amplifier)"""
+        self._input_val = val
+
+    def get_input(self) -> float | int:
+        """Function for getting the applied input value (like: func_sens)"""
+        return self._input_val
+
+    @staticmethod
+    def _get_results_dict(stimuli: np.ndarray, data: np.ndarray, chnl: list | tuple) -> dict:
+        """Function for building the results dictionary ['stim', 'ch<X>'] from data [shape: (num_chnl, num_rpt, num_steps, daq_ovr)]"""
+        results = {"stim": stimuli}
+        results.update({f"ch{chnl_id:02d}": data[idx] for idx, chnl_id in enumerate(chnl)})
+        return results
+
+
+class VirtualADC(_VirtualDevice):
+    _thresholds: np.ndarray
+
+    def __init__(
+        self,
+        adc_reso: int = 12,
+        adc_rang: list | tuple = (0.0, 5.0),
+        inl_bow: float = 0.0,
+        dnl_sigma: float = 0.0,
+        missing_codes: list | tuple = (),
+        noise_rms: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        """Class with virtual model of an N-bit Analog-Digital-Converter (ADC) with static non-linearities
+        :param adc_reso:        Integer with bit resolution of ADC
+        :param adc_rang:        List with [min, max] analog input range
+        :param inl_bow:         Floating with amplitude of the bow-shaped INL profile [LSB]
+        :param dnl_sigma:       Floating with standard deviation of random code widths [LSB]
+        :param missing_codes:   List with missing output codes (code width is zero)
+        :param noise_rms:       Floating with RMS value of input-referred noise [LSB]
+        :param seed:            Integer with seed of random generator
+        :return:                None
+        """
+        super().__init__(seed=seed)
+        self.adc_reso = adc_reso
+        self.adc_rang = adc_rang
+        self.noise_rms = noise_rms
+        self._thresholds = self.__build_thresholds(inl_bow, dnl_sigma, missing_codes)
+
+    @property
+    def lsb(self) -> float:
+        """Returning the ideal LSB of the ADC"""
+        return (self.adc_rang[1] - self.adc_rang[0]) / 2**self.adc_reso
+
+    def __build_thresholds(self, inl_bow: float, dnl_sigma: float, missing_codes) -> np.ndarray:
+        """Building the code transition voltages (into code 1, ..., 2^N-1) from INL/DNL profile"""
+        code = np.arange(1, 2**self.adc_reso, dtype=float)
+        deviation = np.concatenate(([0.0], np.cumsum(dnl_sigma * self._rng.normal(size=code.size - 1))))
+        deviation -= np.linspace(0.0, deviation[-1], code.size)
+        thresholds = code + inl_bow * np.sin(np.pi * code / 2**self.adc_reso) + deviation
+        for missing in missing_codes:
+            if not 1 <= missing < 2**self.adc_reso - 1:
+                raise ValueError(
+                    f"Missing code {missing} must be in range of [1, {2**self.adc_reso - 2}]"
+                )
+            thresholds[missing - 1] = thresholds[missing]
+        return self.adc_rang[0] + self.lsb * np.maximum.accumulate(thresholds)
+
+    def get_inl(self) -> np.ndarray:
+        """Getting the true Integral Non-Linearity of each code transition [LSB]"""
+        return (self._thresholds - self.adc_rang[0]) / self.lsb - np.arange(1, 2**self.adc_reso)
+
+    def get_dnl(self) -> np.ndarray:
+        """Getting the true Differential Non-Linearity of the inner codes 1, ..., 2^N-2 [LSB]"""
+        return np.diff(self._thresholds) / self.lsb - 1
+
+    def convert(self, volt: np.ndarray | float) -> np.ndarray:
+        """Function for converting the analog input into output codes (vectorized for any shape)"""
+        volt = np.asarray(volt, dtype=float)
+        if self.noise_rms:
+            volt = volt + self.noise_rms * self.lsb * self._rng.normal(size=volt.shape)
+        return np.searchsorted(self._thresholds, volt, side="right")
+
+    def get_output(self, chnl: int = 0) -> int:
+        """Function for getting the ADC output of the applied input (like: func_dut)"""
+        return int(self.convert(self._input_val))
+
+    def generate_results(
+        self, stimuli: np.ndarray, num_rpt: int = 1, daq_ovr: int = 1, chnl: list | tuple = (0,)
+    ) -> dict:
+        """Function for generating a synthetic transfer function measurement in one vectorized call
+        :param stimuli: Numpy array with input voltages
+        :param num_rpt: Integer of completes cycles to run DAQ
+        :param daq_ovr: Integer number for oversampling of DAQ system
+        :param chnl:    List with ADC channel IDs
+        :return:        Dictionary with ['stim': input voltages, 'ch<X>': ADC codes with shape (num_rpt, num_steps, daq_ovr)]
+        """
+        volt = np.broadcast_to(stimuli[:, None], (len(chnl), num_rpt, stimuli.size, daq_ovr))
+        return self._get_results_dict(stimuli, self.convert(volt), chnl)
+
+
+class VirtualDAC(_VirtualDevice):
+    _weights: np.ndarray
+    _output: float
+
+    def __init__(
+        self,
+        dac_reso: int = 12,
+        dac_rang: list | tuple = (0.0, 5.0),
+        mismatch: float = 0.0,
+        offset: float = 0.0,
+        noise_rms: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        """Class with virtual model of a binary-weighted N-bit Digital-Analog-Converter (DAC)
+        :param dac_reso:    Integer with bit resolution of DAC
+        :param dac_rang:    List with [min, max] analog output range
+        :param mismatch:    Floating with relative standard deviation of one unit element (bit k has 2^k elements)
+        :param offset:      Floating with output offset voltage
+        :param noise_rms:   Floating with RMS value of output noise [V]
+        :param seed:        Integer with seed of random generator
+        :return:            None
+        """
+        super().__init__(seed=seed)
+        self.dac_reso = dac_reso
+        self.dac_rang = dac_rang
+        self.offset = offset
+        self.noise_rms = noise_rms
+        self._output = 0.0
+
+        units = 2.0 ** np.arange(dac_reso)
+        self._weights = self.lsb * (units + mismatch * np.sqrt(units) * self._rng.normal(size=dac_reso))
+
+    @property
+    def lsb(self) -> float:
+        """Returning the ideal LSB of the DAC"""
+        return (self.dac_rang[1] - self.dac_rang[0]) / 2**self.dac_reso
+
+    def get_bit_weights(self) -> np.ndarray:
+        """Getting the true voltage weight of each bit"""
+        return self._weights
+
+    def convert(self, code: np.ndarray | int) -> np.ndarray:
+        """Function for converting the digital codes into output voltages (vectorized for any shape)"""
+        code = np.asarray(code, dtype=np.int64)
+        bits = (code[..., None] >> np.arange(self.dac_reso)) & 1
+        volt = self.dac_rang[0] + self.offset + bits @ self._weights
+        if self.noise_rms:
+            volt = volt + self.noise_rms * self._rng.normal(size=volt.shape)
+        return volt
+
+    def set_output(self, chnl: int, data: int) -> None:
+        """Function for applying the DAC code (like: func_dac)"""
+        self._input_val = data
+        self._output = float(self.convert(data))
+
+    def get_output(self) -> float:
+        """Function for sensing the DAC output (like: func_daq)"""
+        if self.noise_rms:
+            return float(self.convert(self._input_val))
+        return self._output
+
+    def generate_results(
+        self, stimuli: np.ndarray, num_rpt: int = 1, daq_ovr: int = 1, chnl: list | tuple = (0,)
+    ) -> dict:
+        """Function for generating a synthetic transfer function measurement in one vectorized call
+        :param stimuli: Numpy array with DAC codes
+        :param num_rpt: Integer of completes cycles to run DAQ
+        :param daq_ovr: Integer number for oversampling of DAQ system
+        :param chnl:    List with DAC channel IDs
+        :return:        Dictionary with ['stim': DAC codes, 'ch<X>': output voltages with shape (num_rpt, num_steps, daq_ovr)]
+        """
+        code = np.broadcast_to(stimuli[:, None], (len(chnl), num_rpt, stimuli.size, daq_ovr))
+        return self._get_results_dict(stimuli, self.convert(code), chnl)
+
+
+class VirtualAmplifier(_VirtualDevice):
+    def __init__(
+        self,
+        gain: float = 1.0,
+        offset: float = 0.0,
+        vss: float = -5.0,
+        vdd: float = 5.0,
+        harmonics: list | tuple = (),
+        noise_rms: float = 0.0,
+        fs: float = 1e6,
+        seed: int | None = None,
+    ) -> None:
+        """Class with virtual model of an amplifier stage with gain/offset error, clipping and harmonic distortion
+        :param gain:        Floating with small-signal gain [V/V]
+        :param offset:      Floating with output offset voltage
+        :param vss:         Floating with lower supply rail (output clipping)
+        :param vdd:         Floating with upper supply rail (output clipping)
+        :param harmonics:   List with polynomial coefficients of the input for order 2, 3, ... (like: [0.01, 0.001])
+        :param noise_rms:   Floating with RMS value of output noise [V]
+        :param fs:          Sampling rate of captured waveforms [Hz]
+        :param seed:        Integer with seed of random generator
+        :return:            None
+        """
+        super().__init__(seed=seed)
+        self.gain = gain
+        self.offset = offset
+        self.vss = vss
+        self.vdd = vdd
+        self.harmonics = list(harmonics)
+        self.noise_rms = noise_rms
+        self.fs = fs
+        self._gen = {"offset": 0.0, "freq": 1e3, "ampl": 0.0}
+
+    def transfer(self, volt: np.ndarray | float) -> np.ndarray:
+        """Function for applying the amplifier transfer function on the input voltage (vectorized for any shape)"""
+        volt = np.asarray(volt, dtype=float)
+        poly = volt + sum(coeff * volt ** (idx + 2) for idx, coeff in enumerate(self.harmonics))
+        out = self.offset + self.gain * poly
+        if self.noise_rms:
+            out = out + self.noise_rms * self._rng.normal(size=out.shape)
+        return np.clip(out, self.vss, self.vdd)
+
+    def get_output(self) -> float:
+        """Function for sensing the amplifier output of the applied input (like: func_get_daq)"""
+        return float(self.transfer(self._input_val))
+
+    def set_gen_offset(self, offset: float) -> None:
+        """Function for setting the offset of the sinusoidal stimulus (like: func_gen_offset)"""
+        self._gen["offset"] = offset
+
+    def set_gen_frequency(self, freq: float) -> None:
+        """Function for setting the frequency of the sinusoidal stimulus (like: func_gen_freq)"""
+        self._gen["freq"] = freq
+
+    def set_gen_amplitude(self, ampl: float) -> None:
+        """Function for setting the amplitude of the sinusoidal stimulus (like: func_gen_ampl)"""
+        self._gen["ampl"] = ampl
+
+    def capture(self, num_samples: int) -> np.ndarray:
+        """Function for capturing the amplifier output with sinusoidal stimulus (like: func_capture)"""
+        time = np.arange(num_samples) / self.fs
+        stim = self._gen["offset"] + self._gen["ampl"] * np.sin(2 * np.pi * self._gen["freq"] * time)
+        return self.transfer(stim)
+
+
+class VirtualNoiseSource(_VirtualDevice):
+    _buffer: np.ndarray
+    _pos: int
+
+    def __init__(
+        self,
+        fs: float = 1e3,
+        white_rms: float = 0.0,
+        flicker_rms: float = 0.0,
+        mains_ampl: float = 0.0,
+        mains_freq: float = 50.0,
+        offset: float = 0.0,
+        block_size: int = 4096,
+        seed: int | None = None,
+    ) -> None:
+        """Class with virtual noise source with white, flicker (1/f) and mains interference components
+        :param fs:          Sampling rate [Hz]
+        :param white_rms:   Floating with RMS value of white noise
+        :param flicker_rms: Floating with RMS value of 1/f noise
+        :param mains_ampl:  Floating with amplitude of mains interference
+        :param mains_freq:  Floating with mains frequency [Hz]
+        :param offset:      Floating with DC offset
+        :param block_size:  Integer with number of samples generated at once for sample-wise reading
+        :param seed:        Integer with seed of random generator
+        :return:            None
+        """
+        super().__init__(seed=seed)
+        self.fs = fs
+        self.white_rms = white_rms
+        self.flicker_rms = flicker_rms
+        self.mains_ampl = mains_ampl
+        self.mains_freq = mains_freq
+        self.offset = offset
+        self._block_size = block_size
+        self._buffer = np.zeros(shape=(0,), dtype=float)
+        self._pos = 0
+
+    def generate(self, num_samples: int, num_channels: int = 1) -> np.ndarray:
+        """Function for generating transient noise signals
+        :param num_samples:     Integer with number of samples
+        :param num_channels:    Integer with number of (uncorrelated) channels
+        :return:                Numpy array with noise signal [shape: (num_channels, num_samples)]
+        """
+        shape = (num_channels, num_samples)
+        signal = self.offset + self.white_rms * self._rng.normal(size=shape)
+        if self.flicker_rms:
+            freq = np.fft.rfftfreq(num_samples, d=1 / self.fs)
+            spec = self._rng.normal(size=(num_channels, freq.size)) + 1j * self._rng.normal(
+                size=(num_channels, freq.size)
+            )
+            spec[:, 0] = 0.0
+            spec[:, 1:] /= np.sqrt(freq[1:])
+            flicker = np.fft.irfft(spec, n=num_samples, axis=-1)
+            flicker -= np.mean(flicker, axis=-1, keepdims=True)
+            signal += self.flicker_rms * flicker / np.std(flicker, axis=-1, keepdims=True)
+        if self.mains_ampl:
+            time = np.arange(num_samples) / self.fs
+            phase = 2 * np.pi * self._rng.random(size=(num_channels, 1))
+            signal += self.mains_ampl * np.sin(2 * np.pi * self.mains_freq * time + phase)
+        return signal
+
+    def get_output(self) -> float:
+        """Function for reading one sample of the continuous noise stream (like: func_daq)"""
+        if self._pos >= self._buffer.size:
+            self._buffer = self.generate(num_samples=self._block_size)[0]
+            self._pos = 0
+        self._pos += 1
+        return float(self._buffer[self._pos - 1])
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from elasticai.hw_measurements.charac.dac import CharacterizationDAC
+from elasticai.hw_measurements.charac.virtual import (
+    VirtualADC,
+    VirtualAmplifier,
+    VirtualDAC,
+    VirtualNoiseSource,
+)
+from elasticai.hw_measurements.process.data import MetricCalculator
+
+
+def test_virtual_adc_ideal():
+    dut = VirtualADC(adc_reso=4, adc_rang=(0.0, 1.6))
+    volt = 0.1 * (np.arange(16) + np.array([[0.01], [0.5], [0.99]]))
+    np.testing.assert_array_equal(dut.convert(volt), np.zeros((3, 1)) + np.arange(16))
+    np.testing.assert_array_equal(dut.convert([-1.0, 2.0]), [0, 15])
+    np.testing.assert_array_almost_equal(dut.get_dnl(), np.zeros(14))
+
+
+def test_virtual_adc_missing_code_and_seed():
+    dut0 = VirtualADC(adc_reso=8, inl_bow=1.0, dnl_sigma=0.1, missing_codes=[100], seed=42)
+    dut1 = VirtualADC(adc_reso=8, inl_bow=1.0, dnl_sigma=0.1, missing_codes=[100], seed=42)
+    np.testing.assert_array_equal(dut0.get_inl(), dut1.get_inl())
+    assert dut0.get_dnl()[99] == pytest.approx(-1.0)
+
+    codes = dut0.convert(np.linspace(0.0, 5.0, 10001))
+    assert 100 not in codes
+    assert 101 in codes
+    assert np.max(np.abs(dut0.get_inl())) > 0.5
+
+
+def test_virtual_adc_generate_results():
+    dut = VirtualADC(adc_reso=10, noise_rms=0.5, seed=0)
+    dut.set_input(2.5)
+    assert dut.get_input() == 2.5
+    assert abs(dut.get_output(0) - 512) < 5
+
+    stimuli = np.linspace(0.0, 5.0, 101)
+    results = dut.generate_results(stimuli, num_rpt=3, daq_ovr=4, chnl=[0, 2])
+    assert list(results.keys()) == ["stim", "ch00", "ch02"]
+    assert results["ch02"].shape == (3, 101, 4)
+
+
+def test_virtual_dac_bit_weights():
+    dut = VirtualDAC(dac_reso=8, dac_rang=(0.0, 2.56), mismatch=0.05, offset=0.1, seed=1)
+    codes = np.arange(256)
+    weights = dut.convert(np.concatenate(([0], 2 ** np.arange(8)))).reshape(1, 9, 1)
+    rslt = CharacterizationDAC.reconstruct_transfer_from_bit_weights(
+        codes=codes, weight_data=weights, dac_reso=8
+    )
+    np.testing.assert_array_almost_equal(rslt[0, :, 0], dut.convert(codes))
+    assert not np.allclose(dut.convert(codes), 0.1 + 0.01 * codes)
+
+    dut.set_output(chnl=0, data=255)
+    assert dut.get_output() == pytest.approx(0.1 + np.sum(dut.get_bit_weights()))
+
+
+def test_virtual_amplifier_clipping_and_harmonics():
+    dut = VirtualAmplifier(gain=2.0, offset=0.1, vss=-1.0, vdd=1.0, harmonics=[0.02], fs=1e5)
+    np.testing.assert_array_almost_equal(dut.transfer(np.array([-2.0, 0.0, 2.0])), [-1.0, 0.1, 1.0])
+
+    freq = 1e5 * 37 / 4096
+    dut.set_gen_frequency(freq)
+    dut.set_gen_amplitude(0.25)
+    signal = dut.capture(num_samples=4096)
+    metric = MetricCalculator.calculate_dynamic_metrics(signal, fs=1e5, method_window="")
+    assert float(metric.freq_fund) == pytest.approx(freq)
+    assert float(metric.thd) == pytest.approx(20 * np.log10(0.02 * 0.25 / 2), abs=0.01)
+
+
+def test_virtual_noise_source():
+    dut = VirtualNoiseSource(fs=1e3, white_rms=0.1, flicker_rms=0.05, mains_ampl=0.2, seed=3)
+    signal = dut.generate(num_samples=10000, num_channels=2)
+    assert signal.shape == (2, 10000)
+    expected = np.sqrt(0.1**2 + 0.05**2 + 0.2**2 / 2)
+    np.testing.assert_allclose(np.std(signal, axis=-1), expected, rtol=0.1)
+
+    spec = np.abs(np.fft.rfft(signal[0]))
+    freq = np.fft.rfftfreq(10000, d=1e-3)
+    assert freq[np.argmax(spec[1:]) + 1] == pytest.approx(50.0)
+
+    stream = np.array([dut.get_output() for _ in range(5000)])
+    assert stream.size == 5000
+    assert np.std(stream) > 0.0
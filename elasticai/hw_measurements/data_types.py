@@ -33,6 +33,46 @@ class FrequencyResponse:
     phase: np.ndarray
 
 
+@dataclass(frozen=True)
+class MetricFrequencyResponse:
+    gain_max: np.ndarray
+    freq_max: np.ndarray
+    bandwidth: np.ndarray
+    freq_unity: np.ndarray
+    phase_margin: np.ndarray
+
+
+@dataclass(frozen=True)
+class MetricTransfer:
+    lsb: np.ndarray
+    lsb_mean: np.ndarray
+    dnl: np.ndarray
+    inl: np.ndarray
+    offset: np.ndarray
+    gain_endpoint: np.ndarray
+    offset_endpoint: np.ndarray
+    gain_fit: np.ndarray
+    offset_fit: np.ndarray
+
+
+@dataclass(frozen=True)
+class MetricIVCurve:
+    resistance: np.ndarray
+    leakage: np.ndarray
+    threshold_pos: np.ndarray
+    threshold_neg: np.ndarray
+
+
+@dataclass(frozen=True)
+class MetricStepResponse:
+    val_initial: np.ndarray
+    val_final: np.ndarray
+    rise_time: np.ndarray
+    slew_rate: np.ndarray
+    overshoot: np.ndarray
+    settling_time: np.ndarray
+
+
 @dataclass(frozen=True)
 class TransientNoiseSpectrum:
     freq: np.ndarray
@@ -48,7 +88,47 @@ class MetricNoise:
     sampling_rate: float
 
 
+@dataclass(frozen=True)
+class MetricDynamic:
+    freq_fund: np.ndarray
+    ampl_fund: np.ndarray
+    snr: np.ndarray
+    sinad: np.ndarray
+    enob: np.ndarray
+    sfdr: np.ndarray
+    thd: np.ndarray
+    thd_n: np.ndarray
+
+
+@dataclass(frozen=True)
+class MetricHarmonics:
+    freq: np.ndarray
+    ampl: np.ndarray
+    thd: np.ndarray
+
+
+@dataclass(frozen=True)
+class MetricSineFit:
+    ampl: np.ndarray
+    freq: np.ndarray
+    phase: np.ndarray
+    offset: np.ndarray
+    rms_residual: np.ndarray
+    enob: np.ndarray
+
+
 @dataclass(frozen=True)
 class LoadedData:
     data: dict
     settings: dict
+
+
+@dataclass(frozen=True)
+class ReducedData:
+    stim: np.ndarray
+    chan: list
+    mean: np.ndarray
+    std: np.ndarray
+    median: np.ndarray
+    mad: np.ndarray
+    mean_clipped: np.ndarray
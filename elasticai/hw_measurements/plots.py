@@ -12,6 +12,7 @@ from elasticai.hw_measurements import (
     TransientData,
     TransientNoiseSpectrum,
 )
+from elasticai.hw_measurements.process.cache import AnalysisCache
 from elasticai.hw_measurements.process.data import MetricCalculator, do_fft
 
 
@@ -149,7 +150,7 @@ def plot_transfer_function_metric(
 ) -> None:
     """Function for plotting the metric, extracted from the transfer function
     :param data:        Dictionary with pre-processed data from measurement with keys: ['stim', 'ch<x>': {'mean', 'std'}}
-    :param func:        Function for calculating the metric
+    :param func:        Function for calculating the metric of all channels [input: (stim, (num_chnl, num_steps))]
     :param path2save:   Path for saving the figure
     :param xlabel:      Text Label for x-axis
     :param ylabel:      Text Label for y-axis
@@ -157,14 +158,14 @@ def plot_transfer_function_metric(
     :param file_name:   File name of the saved figure
     :return:            None
     """
+    keys = [key for key in data.keys() if not key == "stim"]
+    metric = func(data["stim"], np.array([data[key]["mean"] for key in keys]))
+    if not metric.shape[-1] == data["stim"].size:
+        metric = np.concatenate((metric[:, :1], metric), axis=-1)
+
     data_metric = {"stim": data["stim"]}
-    for key in data.keys():
-        if not key == "stim":
-            scale_val = 1.0
-            metric = func(data["stim"], data[key]["mean"])
-            if not metric.size == data["stim"].size:
-                metric = np.concatenate((np.array((metric[0],)), metric), axis=0)
-            data_metric.update({key: {"mean": metric, "std": scale_val * data[key]["std"]}})
+    for idx, key in enumerate(keys):
+        data_metric.update({key: {"mean": metric[idx], "std": data[key]["std"]}})
 
     plot_transfer_function_norm(
         data=data_metric,
@@ -239,8 +240,8 @@ def plot_spectrum_harmonic(
         spec=data.spec[delta_peaks:] if not is_input_db else 10 ** (data.spec[delta_peaks:] / 20),
         sampling_rate=data.sampling_rate,
     )
-    thd = MetricCalculator().calculate_total_harmonics_distortion_from(
-        signal=new_data.spec, fs=new_data.sampling_rate, num_harmonics=num_harmonics
+    thd = MetricCalculator().calculate_total_harmonics_distortion_from_spec(
+        signal=new_data, num_harmonics=num_harmonics
     )
     if show_metric:
         plt.title(f"THD = {thd:.2f} dB", fontsize=get_font_size())
@@ -315,6 +316,7 @@ def plot_transient_data(
     path2save: str = "",
     show_plot: bool = False,
     xzoom: list = [0, -1],
+    cache: AnalysisCache | None = None,
 ) -> None:
     """Plotting content from transient measurements for extracting Total Harmonic Distortion (THD)
     :param data:        List with dataclass TransientData
@@ -322,10 +324,16 @@ def plot_transient_data(
     :param path2save:   String with path for saving the figure
     :param show_plot:   Boolean for showing the plot
     :param xzoom:       List with xzoom values
+    :param cache:       Class AnalysisCache for reusing the spectrum of unchanged data, None if not used
     :return:            None
     """
-    for data_ch, key in zip(data.rawdata, data.channels):
-        spec: TransformSpectrum = do_fft(y=data_ch, fs=data.sampling_rate, method_window="Hamming")
+    spec_all: TransformSpectrum = (
+        do_fft(y=data.rawdata, fs=data.sampling_rate, method_window="Hamming")
+        if cache is None
+        else cache.call(do_fft, y=data.rawdata, fs=data.sampling_rate, method_window="Hamming")
+    )
+    for data_ch, spec_ch, key in zip(data.rawdata, spec_all.spec, data.channels):
+        spec = TransformSpectrum(freq=spec_all.freq, spec=spec_ch, sampling_rate=spec_all.sampling_rate)
         plot_spectrum_harmonic(
             data=spec,
             num_harmonics=10,
@@ -1,3 +1,6 @@
+from .cache import AnalysisCache as AnalysisCache
+from .catalog import CatalogEntry as CatalogEntry
+from .catalog import RunCatalog as RunCatalog
 from .common import ProcessCommon as ProcessCommon
 from .data import (
     MetricCalculator as MetricCalculator,
@@ -14,3 +17,7 @@ from .mxo4x import (
 from .mxo4x import (
     load_transient_data as load_transient_data,
 )
+from .reduction import reduce_data as reduce_data
+from .results import ResultsReader as ResultsReader
+from .results import convert_npz_to_hdf5 as convert_npz_to_hdf5
+from .results import save_results_hdf5 as save_results_hdf5
@@ -0,0 +1,180 @@
+import hashlib
+import os
+import pickle
+import shutil
+from collections.abc import Callable
+from dataclasses import asdict, is_dataclass
+from functools import wraps
+from importlib.metadata import PackageNotFoundError, version
+from logging import Logger, getLogger
+from pathlib import Path
+
+import numpy as np
+
+
+def _get_package_version() -> str:
+    """Getting the version of the installed package (empty if not installed, like running from the source tree)"""
+    try:
+        return version("elasticai.hw-measurements")
+    except PackageNotFoundError:
+        return ""
+
+
+class AnalysisCache:
+    _logger: Logger
+    _path: Path
+    _max_size: int
+    _hash_files: dict
+    _version: str
+    chunk_size: int = 2**20
+
+    def __init__(self, path2cache: Path, max_size_mb: float = 512.0, version: str = "") -> None:
+        """Class for disk-backed memoization of analysis functions, keyed by a content hash of the inputs
+        (arrays, files, settings) together with the function name and the package version. Entries are evicted
+        least-recently-used if the cache exceeds the size limit.
+        :param path2cache:  Path to cache folder (is created if not existing)
+        :param max_size_mb: Floating with maximal size of the cache [MB]
+        :param version:     String with version of the analysis functions (change it to invalidate all entries)
+        :return:            None
+        """
+        self._logger = getLogger(__name__)
+        self._path = path2cache
+        self._max_size = int(max_size_mb * 2**20)
+        self._hash_files = dict()
+        self._version = f"{_get_package_version()}:{version}"
+        self._path.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def get_size_bytes(self) -> int:
+        """Returning the actual size of all cache entries"""
+        return sum(file.stat().st_size for file in self._path.rglob("*.pkl"))
+
+    @staticmethod
+    def get_function_name(func: Callable) -> str:
+        """Getting the unique name of the function (module and qualified name)"""
+        return f"{func.__module__}.{func.__qualname__}"
+
+    def _get_file_hash(self, path2file: Path) -> bytes:
+        """Getting the content hash of a file (only recalculated if file is modified)"""
+        stat = path2file.stat()
+        id_file = (path2file.resolve().as_posix(), stat.st_mtime_ns, stat.st_size)
+        if id_file not in self._hash_files:
+            hash_file = hashlib.blake2b(digest_size=16)
+            with open(path2file, "rb") as f:
+                while chunk := f.read(self.chunk_size):
+                    hash_file.update(chunk)
+            self._hash_files[id_file] = hash_file.digest()
+        return self._hash_files[id_file]
+
+    def _update_hash(self, hash_key, value: object) -> None:
+        """Adding the content of the value to the hash (recursive for containers)"""
+        hash_key.update(type(value).__name__.encode())
+        if isinstance(value, np.ndarray):
+            hash_key.update(f"{value.dtype.str}{value.shape}".encode())
+            hash_key.update(np.ascontiguousarray(value).data)
+        elif isinstance(value, Path):
+            hash_key.update(self._get_file_hash(value) if value.is_file() else value.as_posix().encode())
+        elif isinstance(value, dict):
+            for key in sorted(value.keys(), key=str):
+                self._update_hash(hash_key, key)
+                self._update_hash(hash_key, value[key])
+        elif isinstance(value, (list, tuple)):
+            hash_key.update(str(len(value)).encode())
+            for item in value:
+                self._update_hash(hash_key, item)
+        elif is_dataclass(value) and not isinstance(value, type):
+            self._update_hash(hash_key, asdict(value))
+        elif value is None or isinstance(value, (bool, int, float, complex, str, bytes, np.generic)):
+            hash_key.update(repr(value).encode())
+        else:
+            raise TypeError(f"Input of type {type(value).__name__} cannot be used as cache key")
+
+    def get_key(self, func: Callable, *args, **kwargs) -> str:
+        """Function for getting the cache key of a function call
+        :param func:    Function to call
+        :param args:    Positional arguments of the function (numpy arrays, paths to files, dataclasses, ...)
+        :param kwargs:  Keyword arguments of the function
+        :return:        String with hexadecimal content hash
+        """
+        hash_key = hashlib.blake2b(digest_size=20)
+        self._update_hash(hash_key, self._version)
+        self._update_hash(hash_key, self.get_function_name(func))
+        self._update_hash(hash_key, list(args))
+        self._update_hash(hash_key, kwargs)
+        return hash_key.hexdigest()
+
+    def _get_path_entry(self, func: Callable, key: str) -> Path:
+        return self._path / self.get_function_name(func) / f"{key}.pkl"
+
+    def call(self, func: Callable, *args, **kwargs) -> object:
+        """Function for calling a function with memoization (the state of bound instances is not part of the key)
+        :param func:    Function to call
+        :param args:    Positional arguments of the function
+        :param kwargs:  Keyword arguments of the function
+        :return:        Return value of the function (from cache if available)
+        """
+        path2entry = self._get_path_entry(func, self.get_key(func, *args, **kwargs))
+        if path2entry.exists():
+            try:
+                with open(path2entry, "rb") as f:
+                    rslt = pickle.load(f)
+                os.utime(path2entry)
+                self._logger.debug(f"Cache hit for {func.__qualname__}")
+                return rslt
+            except (OSError, EOFError, pickle.UnpicklingError):
+                self._logger.warning(f"Cache entry {path2entry.name} is corrupted - recalculated")
+
+        rslt = func(*args, **kwargs)
+        path2entry.parent.mkdir(parents=True, exist_ok=True)
+        path2temp = path2entry.with_suffix(".tmp")
+        with open(path2temp, "wb") as f:
+            pickle.dump(rslt, f, protocol=pickle.HIGHEST_PROTOCOL)
+        path2temp.replace(path2entry)
+        self._evict()
+        return rslt
+
+    def cached(self, func: Callable) -> Callable:
+        """Decorator for memoization of all calls of the function
+        :param func:    Function to wrap
+        :return:        Wrapped function
+        """
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return self.call(func, *args, **kwargs)
+
+        return wrapper
+
+    def _evict(self) -> None:
+        """Removing the least-recently-used entries until the cache fits into the size limit"""
+        entries = [(file, file.stat()) for file in self._path.rglob("*.pkl")]
+        size = sum(stat.st_size for _, stat in entries)
+        for file, stat in sorted(entries, key=lambda item: item[1].st_mtime_ns):
+            if size <= self._max_size:
+                break
+            file.unlink(missing_ok=True)
+            size -= stat.st_size
+            self._logger.debug(f"Evicted cache entry {file.name}")
+
+    def invalidate(self, func: Callable | None = None, *args, **kwargs) -> int:
+        """Function for removing cache entries
+        :param func:    Function whose entries are removed (None: all entries)
+        :param args:    Positional arguments for removing only the entry of this call (empty: all entries of function)
+        :param kwargs:  Keyword arguments for removing only the entry of this call
+        :return:        Integer with number of removed entries
+        """
+        if func is None:
+            num_entries = len(list(self._path.rglob("*.pkl")))
+            shutil.rmtree(self._path)
+            self._path.mkdir(parents=True, exist_ok=True)
+            return num_entries
+        if args or kwargs:
+            path2entry = self._get_path_entry(func, self.get_key(func, *args, **kwargs))
+            num_entries = int(path2entry.exists())
+            path2entry.unlink(missing_ok=True)
+            return num_entries
+
+        path2func = self._path / self.get_function_name(func)
+        num_entries = len(list(path2func.glob("*.pkl")))
+        shutil.rmtree(path2func, ignore_errors=True)
+        return num_entries
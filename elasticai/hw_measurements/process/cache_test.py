@@ -0,0 +1,121 @@
+import os
+import shutil
+from collections.abc import Callable
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from elasticai.hw_measurements import get_path_to_project
+from elasticai.hw_measurements.charac.dac import DefaultSettingsDAC
+from elasticai.hw_measurements.process.cache import AnalysisCache
+from elasticai.hw_measurements.process.common import ProcessCommon
+from elasticai.hw_measurements.process.data import do_fft
+
+
+def calculate_sum(data: np.ndarray, scale: float = 1.0) -> float:
+    return float(scale * np.sum(data))
+
+
+def get_counted_sum() -> tuple[Callable, list]:
+    """Getting a new summing function together with its list of calls (unique function name for the cache key)"""
+    calls = list()
+
+    def calculate_sum_counted(data: np.ndarray, scale: float = 1.0) -> float:
+        calls.append(data.size)
+        return calculate_sum(data, scale=scale)
+
+    return calculate_sum_counted, calls
+
+
+def test_cache_hit_and_miss(tmp_path):
+    cache = AnalysisCache(tmp_path / "cache")
+    func, calls = get_counted_sum()
+    data = np.arange(10.0)
+    assert cache.call(func, data) == 45.0
+    assert cache.call(func, data.copy()) == 45.0
+    assert len(calls) == 1
+
+    assert cache.call(func, data, scale=2.0) == 90.0
+    data[0] = 1.0
+    assert cache.call(func, data) == 46.0
+    assert len(calls) == 3
+
+
+def test_cache_persistent(tmp_path):
+    func, calls = get_counted_sum()
+    AnalysisCache(tmp_path / "cache").cached(func)(np.ones(4))
+    assert AnalysisCache(tmp_path / "cache").call(func, np.ones(4)) == 4.0
+    assert len(calls) == 1
+
+
+def test_cache_version(tmp_path):
+    func, calls = get_counted_sum()
+    AnalysisCache(tmp_path / "cache", version="1").call(func, np.ones(4))
+    AnalysisCache(tmp_path / "cache", version="1").call(func, np.ones(4))
+    assert len(calls) == 1
+    AnalysisCache(tmp_path / "cache", version="2").call(func, np.ones(4))
+    assert len(calls) == 2
+
+
+def test_cache_key_content(tmp_path):
+    cache = AnalysisCache(tmp_path / "cache")
+    data = np.arange(4)
+    assert cache.get_key(calculate_sum, data) == cache.get_key(calculate_sum, data.copy())
+    assert cache.get_key(calculate_sum, data) != cache.get_key(calculate_sum, data.astype(float))
+    assert cache.get_key(calculate_sum, data) != cache.get_key(do_fft, data)
+    assert cache.get_key(calculate_sum, DefaultSettingsDAC) == cache.get_key(
+        calculate_sum, replace(DefaultSettingsDAC)
+    )
+    assert cache.get_key(calculate_sum, DefaultSettingsDAC) != cache.get_key(
+        calculate_sum, replace(DefaultSettingsDAC, dac_reso=12)
+    )
+    with pytest.raises(TypeError):
+        cache.get_key(calculate_sum, object())
+
+
+def test_cache_file_content(tmp_path):
+    cache = AnalysisCache(tmp_path / "cache")
+    shutil.copy(get_path_to_project("test_data") / "dac_charac.npz", tmp_path / "dac_charac.npz")
+    hndl = ProcessCommon()
+    ref = hndl.process_data_from_file(path=tmp_path, file_name="dac_charac.npz")
+    hndl.process_data_from_file(path=tmp_path, file_name="dac_charac.npz", cache=cache)
+    rslt = hndl.process_data_from_file(path=tmp_path, file_name="dac_charac.npz", cache=cache)
+    np.testing.assert_array_equal(rslt["ch03"]["mean"], ref["ch03"]["mean"])
+    assert len(list((tmp_path / "cache").rglob("*.pkl"))) == 1
+
+    path2file = tmp_path / "data.bin"
+    path2file.write_bytes(b"abc")
+    key = cache.get_key(calculate_sum, path2file)
+    path2file.write_bytes(b"abcd")
+    assert cache.get_key(calculate_sum, path2file) != key
+
+
+def test_cache_lru_eviction(tmp_path):
+    cache = AnalysisCache(tmp_path / "cache", max_size_mb=0.03)
+    func = cache.cached(np.copy)
+    for idx in range(3):
+        data = np.full(1000, idx, dtype=float)
+        func(data)
+        path2entry = cache._get_path_entry(np.copy, cache.get_key(np.copy, data))
+        os.utime(path2entry, ns=(idx * 10**9, idx * 10**9))
+    func(np.full(1000, 0, dtype=float))
+    func(np.full(1000, 3, dtype=float))
+
+    assert cache.get_size_bytes <= 0.03 * 2**20
+    assert cache.invalidate(np.copy, np.full(1000, 1, dtype=float)) == 0
+    assert cache.invalidate(np.copy, np.full(1000, 0, dtype=float)) == 1
+    assert cache.invalidate(np.copy, np.full(1000, 2, dtype=float)) == 1
+
+
+def test_cache_invalidate(tmp_path):
+    cache = AnalysisCache(tmp_path / "cache")
+    func, calls = get_counted_sum()
+    cache.call(func, np.ones(2))
+    cache.call(func, np.ones(3))
+    cache.call(do_fft, np.ones(8), fs=1.0)
+    assert cache.invalidate(func) == 2
+    cache.call(func, np.ones(2))
+    assert len(calls) == 3
+    assert cache.invalidate() == 2
+    assert cache.get_size_bytes == 0
@@ -0,0 +1,247 @@
+import json
+import re
+import sqlite3
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from logging import Logger, getLogger
+from pathlib import Path
+
+import numpy as np
+
+from elasticai.hw_measurements.process.results import ResultsReader, _translate_settings_to_dict
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    path: str
+    system_id: str
+    test_type: str
+    date: str
+    mtime: float
+    settings: dict
+    metrics: dict
+
+
+class RunCatalog:
+    _logger: Logger
+    _path2db: Path
+    pattern_name = re.compile(r"(?P<date>\d{8}-\d{6})_(?P<type>[a-zA-Z0-9]+)_charac_id-(?P<id>\d+)")
+
+    def __init__(self, path2db: Path) -> None:
+        """Class for indexing the run metadata and summary metrics of all measurement files in a SQLite database
+        :param path2db: Path to SQLite database file (is created if not existing)
+        :return:        None
+        """
+        self._logger = getLogger(__name__)
+        self._path2db = path2db
+        path2db.parent.mkdir(parents=True, exist_ok=True)
+        with self.__connect() as con:
+            con.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS runs (
+                    path TEXT PRIMARY KEY, system_id TEXT, test_type TEXT, date TEXT,
+                    mtime REAL, size INTEGER, settings TEXT, metrics TEXT
+                );
+                CREATE TABLE IF NOT EXISTS run_settings (
+                    path TEXT, key TEXT, value TEXT, PRIMARY KEY (path, key)
+                );
+                CREATE INDEX IF NOT EXISTS idx_runs_system ON runs (system_id, test_type, date);
+                CREATE INDEX IF NOT EXISTS idx_settings_key ON run_settings (key, value);
+                """
+            )
+
+    @contextmanager
+    def __connect(self) -> Iterator[sqlite3.Connection]:
+        """Opening the database connection, which is committed and closed after usage"""
+        con = sqlite3.connect(self._path2db)
+        try:
+            with con:
+                yield con
+        finally:
+            con.close()
+
+    @property
+    def get_num_runs(self) -> int:
+        """Returning the number of indexed runs"""
+        with self.__connect() as con:
+            return int(con.execute("SELECT COUNT(*) FROM runs").fetchone()[0])
+
+    @staticmethod
+    def calculate_summary_metrics(data: dict) -> dict:
+        """Function for calculating the summary metrics of a results dictionary ['stim', 'ch<X>': (num_rpt, num_steps, daq_ovr)]
+        :param data:    Dictionary with measurement results
+        :return:        Dictionary with number of channels/steps, stimulus range and mean noise (std over oversampling)
+        """
+        channels = [key for key, value in data.items() if key != "stim" and np.ndim(value) == 3]
+        metrics = {"num_chnl": len(channels)}
+        if "stim" in data:
+            stim = np.asarray(data["stim"], dtype=float)
+            metrics.update(
+                {
+                    "num_steps": int(stim.size),
+                    "stim_min": float(stim.min()),
+                    "stim_max": float(stim.max()),
+                }
+            )
+        if channels:
+            metrics["noise_mean"] = float(
+                np.mean([np.nanmean(np.nanstd(data[key], axis=-1)) for key in channels])
+            )
+        return metrics
+
+    def __get_metadata(self, path2file: Path, settings: dict) -> tuple[str, str, str]:
+        """Getting system_id, test type and date from settings and file name (fallback: modification time)"""
+        match = self.pattern_name.search(path2file.stem)
+        system_id = str(settings.get("system_id", int(match["id"]) if match else ""))
+        test_type = match["type"] if match else ""
+        date = (
+            datetime.strptime(match["date"], "%Y%m%d-%H%M%S")
+            if match
+            else datetime.fromtimestamp(path2file.stat().st_mtime)
+        )
+        return system_id, test_type, date.isoformat(timespec="seconds")
+
+    @staticmethod
+    def __load_file(path2file: Path) -> tuple[dict, dict]:
+        """Loading data and settings of a results file (.h5 or .npz)"""
+        if path2file.suffix in (".h5", ".hdf5"):
+            with ResultsReader(path2file) as f:
+                return f.get_data(), f.get_settings()
+        loaded = np.load(file=path2file.as_posix(), allow_pickle=True)
+        try:
+            settings = _translate_settings_to_dict(loaded["settings"].flatten()[0])
+        except (ModuleNotFoundError, AttributeError):
+            settings = dict()
+        return loaded["data"].flatten()[0], settings
+
+    def add_run(
+        self, path2file: Path, data: dict | None = None, settings: object | dict | None = None
+    ) -> None:
+        """Function for adding (or updating) a run in the catalog
+        :param path2file:   Path to the results file
+        :param data:        Dictionary with measurement results (None: loaded from file)
+        :param settings:    Dataclass or dictionary with settings (None: loaded from file)
+        :return:            None
+        """
+        if data is None:
+            data, settings_file = self.__load_file(path2file)
+            settings = settings_file if settings is None else settings
+        settings = json.loads(
+            json.dumps(
+                _translate_settings_to_dict(settings), default=lambda item: np.asarray(item).tolist()
+            )
+        )
+        system_id, test_type, date = self.__get_metadata(path2file, settings)
+        stat = path2file.stat()
+        key = path2file.resolve().as_posix()
+        with self.__connect() as con:
+            con.execute(
+                "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    system_id,
+                    test_type,
+                    date,
+                    stat.st_mtime,
+                    stat.st_size,
+                    json.dumps(settings),
+                    json.dumps(self.calculate_summary_metrics(data)),
+                ),
+            )
+            con.execute("DELETE FROM run_settings WHERE path = ?", (key,))
+            con.executemany(
+                "INSERT INTO run_settings VALUES (?, ?, ?)",
+                [(key, name, json.dumps(value)) for name, value in settings.items()],
+            )
+
+    def backfill(self, folder: Path, patterns: tuple = ("*.npz", "*.h5")) -> int:
+        """Function for incrementally indexing all results files of a folder. Only new or modified files
+        (modification time or size) are opened, runs of deleted files are removed. Subfolders are not scanned.
+        :param folder:      Path to folder with results files (like: runs)
+        :param patterns:    Tuple with glob patterns of results files
+        :return:            Integer with number of (re-)indexed files
+        """
+        path2folder = folder.resolve()
+        with self.__connect() as con:
+            known = {
+                row[0]: (row[1], row[2])
+                for row in con.execute(
+                    "SELECT path, mtime, size FROM runs WHERE path LIKE ?",
+                    (f"{path2folder.as_posix()}/%",),
+                )
+                if Path(row[0]).parent == path2folder
+            }
+
+        num_indexed = 0
+        found = set()
+        for pattern in patterns:
+            for path2file in sorted(folder.glob(pattern)):
+                key = path2file.resolve().as_posix()
+                found.add(key)
+                stat = path2file.stat()
+                if known.get(key) == (stat.st_mtime, stat.st_size):
+                    continue
+                try:
+                    self.add_run(path2file)
+                    num_indexed += 1
+                except (OSError, ValueError, KeyError) as e:
+                    self._logger.warning(f"File {path2file.name} cannot be indexed: {e}")
+
+        removed = [(key,) for key in known.keys() if key not in found]
+        with self.__connect() as con:
+            con.executemany("DELETE FROM runs WHERE path = ?", removed)
+            con.executemany("DELETE FROM run_settings WHERE path = ?", removed)
+        self._logger.debug(f"Indexed {num_indexed} files and removed {len(removed)} runs")
+        return num_indexed
+
+    def query(
+        self,
+        system_id: str | None = None,
+        test_type: str | None = None,
+        date_from: str | None = None,
+        date_to: str | None = None,
+        settings: dict | None = None,
+    ) -> list[CatalogEntry]:
+        """Function for querying the runs of the catalog (all conditions are combined)
+        :param system_id:   String with system ID of the DUT
+        :param test_type:   String with test type from file name (like: 'adc', 'dac')
+        :param date_from:   String with ISO date of earliest run (like: '2025-01-31')
+        :param date_to:     String with ISO date of latest run (inclusive day if only date is given)
+        :param settings:    Dictionary with settings values which must match (like: {'dac_reso': 12})
+        :return:            List with dataclass CatalogEntry sorted by date
+        """
+        conditions = list()
+        params = list()
+        for column, value in (("system_id", system_id), ("test_type", test_type)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(str(value))
+        if date_from is not None:
+            conditions.append("date >= ?")
+            params.append(date_from)
+        if date_to is not None:
+            conditions.append("date <= ?")
+            params.append(date_to if "T" in date_to else f"{date_to}T23:59:59")
+        for name, value in (settings or dict()).items():
+            conditions.append("path IN (SELECT path FROM run_settings WHERE key = ? AND value = ?)")
+            params.extend([name, json.dumps(value)])
+
+        sql = "SELECT path, system_id, test_type, date, mtime, settings, metrics FROM runs"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        with self.__connect() as con:
+            rows = con.execute(sql + " ORDER BY date", params).fetchall()
+        return [
+            CatalogEntry(
+                path=row[0],
+                system_id=row[1],
+                test_type=row[2],
+                date=row[3],
+                mtime=row[4],
+                settings=json.loads(row[5]),
+                metrics=json.loads(row[6]),
+            )
+            for row in rows
+        ]
@@ -0,0 +1,102 @@
+import os
+from dataclasses import replace
+
+from elasticai.hw_measurements.charac.common import CharacterizationCommon
+from elasticai.hw_measurements.charac.dac import DefaultSettingsDAC
+from elasticai.hw_measurements.process.catalog import RunCatalog
+from elasticai.hw_measurements.process.results import save_results_hdf5
+
+
+def test_add_run_with_metadata(tmp_path, get_results):
+    catalog = RunCatalog(tmp_path / "catalog.db")
+    path2file = tmp_path / "20250102-030405_dac_charac_id-007.h5"
+    save_results_hdf5(path2file, get_results(), settings=replace(DefaultSettingsDAC, system_id="7"))
+    catalog.add_run(path2file)
+
+    entries = catalog.query()
+    assert len(entries) == 1
+    assert entries[0].system_id == "7"
+    assert entries[0].test_type == "dac"
+    assert entries[0].date == "2025-01-02T03:04:05"
+    assert entries[0].settings["dac_reso"] == 16
+    assert entries[0].metrics["num_chnl"] == 3
+    assert entries[0].metrics["num_steps"] == 50
+    assert entries[0].metrics["stim_min"] == 0.0
+
+
+def test_save_results_adds_run(tmp_path, get_results):
+    catalog = RunCatalog(tmp_path / "catalog.db")
+    CharacterizationCommon().save_results(
+        file_name="20250102-030405_dac_charac_id-000",
+        settings=DefaultSettingsDAC,
+        data=get_results(),
+        folder_name=tmp_path,
+        catalog=catalog,
+    )
+    assert catalog.get_num_runs == 1
+    assert catalog.query(test_type="dac", system_id="0")[0].path.endswith(".npz")
+
+
+def test_query_filters(tmp_path, get_results):
+    catalog = RunCatalog(tmp_path / "catalog.db")
+    for idx, (date, reso) in enumerate(
+        [("20250101-120000", 12), ("20250201-120000", 16), ("20250301-120000", 16)]
+    ):
+        save_results_hdf5(
+            tmp_path / f"{date}_dac_charac_id-{idx:03d}.h5",
+            get_results(),
+            settings=replace(DefaultSettingsDAC, system_id=str(idx), dac_reso=reso),
+        )
+    assert catalog.backfill(tmp_path) == 3
+
+    assert len(catalog.query(settings={"dac_reso": 16})) == 2
+    assert len(catalog.query(date_from="2025-02-01")) == 2
+    assert len(catalog.query(date_to="2025-02-01")) == 2
+    assert [entry.system_id for entry in catalog.query(date_from="2025-02-01", date_to="2025-02-28")] == [
+        "1"
+    ]
+    assert catalog.query(test_type="adc") == []
+
+
+def test_backfill_incremental(tmp_path, get_results):
+    catalog = RunCatalog(tmp_path / "catalog.db")
+    path2file = [tmp_path / f"20250101-12000{idx}_dac_charac_id-000.h5" for idx in range(2)]
+    for path in path2file:
+        save_results_hdf5(path, get_results(), settings=DefaultSettingsDAC)
+
+    assert catalog.backfill(tmp_path) == 2
+    assert catalog.backfill(tmp_path) == 0
+
+    save_results_hdf5(path2file[0], get_results(num_chnl=4), settings=DefaultSettingsDAC)
+    stat = path2file[0].stat()
+    os.utime(path2file[0], (stat.st_atime, stat.st_mtime + 10.0))
+    assert catalog.backfill(tmp_path) == 1
+    assert catalog.query(date_to="2025-01-01T12:00:00")[0].metrics["num_chnl"] == 4
+
+    path2file[1].unlink()
+    assert catalog.backfill(tmp_path) == 0
+    assert catalog.get_num_runs == 1
+
+
+def test_backfill_keeps_runs_of_subfolders(tmp_path, get_results):
+    catalog = RunCatalog(tmp_path / "catalog.db")
+    path2folder = tmp_path / "run_1"
+    path2nested = path2folder / "nested"
+    path2nested.mkdir(parents=True)
+    save_results_hdf5(
+        path2folder / "20250101-120000_dac_charac_id-000.h5", get_results(), settings=DefaultSettingsDAC
+    )
+    save_results_hdf5(
+        path2nested / "20250101-130000_dac_charac_id-000.h5", get_results(), settings=DefaultSettingsDAC
+    )
+    save_results_hdf5(
+        tmp_path / "runX1" / "20250101-140000_dac_charac_id-000.h5",
+        get_results(),
+        settings=DefaultSettingsDAC,
+    )
+
+    assert catalog.backfill(path2nested) == 1
+    assert catalog.backfill(tmp_path / "runX1") == 1
+    assert catalog.backfill(path2folder) == 1
+    assert catalog.backfill(path2folder) == 0
+    assert catalog.get_num_runs == 3
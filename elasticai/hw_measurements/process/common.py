@@ -4,6 +4,9 @@ from pathlib import Path
 import numpy as np
 
 from elasticai.hw_measurements.data_types import LoadedData
+from elasticai.hw_measurements.process.cache import AnalysisCache
+from elasticai.hw_measurements.process.reduction import reduce_data
+from elasticai.hw_measurements.process.results import ResultsReader
 
 
 class ProcessCommon:
@@ -16,11 +19,20 @@ class ProcessCommon:
         """Function for getting an overview of available data files"""
         return [file for file in path.iterdir() if acronym in file.as_posix()]
 
-    def load_data(self, path: Path, file_name: str, load_settings: bool = False) -> LoadedData:
+    def load_data(
+        self,
+        path: Path,
+        file_name: str,
+        load_settings: bool = False,
+        keys: list | None = None,
+        mmap: bool = False,
+    ) -> LoadedData:
         """Function for loading the measurement data
         :param path:            Path to measurement in which the files are inside
-        :param file_name:       Name of numpy file with measurement results
+        :param file_name:       Name of numpy file (.npz) or HDF5 file (.h5) with measurement results
         :param load_settings:   If True, load settings will be loaded from file
+        :param keys:            List with entries to load (like: ['stim', 'ch03']), None for all (only used for HDF5 files)
+        :param mmap:            If True, uncompressed entries are memory-mapped (only used for HDF5 files)
         :return:            Dictionary
         """
         path2file = path / file_name
@@ -28,6 +40,13 @@ class ProcessCommon:
         if not path2file.exists():
             raise FileNotFoundError(f"File {path2file} does not exist")
 
+        if path2file.suffix in (".h5", ".hdf5"):
+            with ResultsReader(path2file=path2file, mmap=mmap) as f:
+                return LoadedData(
+                    data=f.get_data(keys=keys),
+                    settings=f.get_settings() if load_settings else dict(),
+                )
+
         loaded = np.load(file=path2file.as_posix(), allow_pickle=True, mmap_mode="r")
         data = loaded["data"].flatten()[0]
         set = loaded["settings"].flatten()[0] if load_settings else dict()
@@ -39,32 +58,35 @@ class ProcessCommon:
 
     @staticmethod
     def process_data_direct(data: dict) -> dict:
-        """Function for processing the measurement data directly
+        """Function for processing the measurement data directly (pooled statistics over repetitions and oversampling)
         :param data:        Dictionary of measurement results
         :return:            Dictionary with ['stim': stimulation input array, 'ch<x>': results with 'mean' and 'std']
         """
-        rslt = {"stim": data["stim"]}
+        reduced = reduce_data(data=data, do_robust=False)
+        assert reduced.mean.shape[-1] == data["stim"].size, "Length of preprocessed data is not equal"
 
-        keys_test = data.keys()
-        for key_used in keys_test:
-            if not key_used == "stim":
-                daq_rslt = data[key_used]
-                mean = np.mean(np.mean(daq_rslt, axis=2), axis=0)
-                std = np.std(np.std(daq_rslt, axis=2), axis=0)
-                assert mean.size == std.size and mean.size == rslt["stim"].size, (
-                    "Length of preprocessed data is not equal"
-                )
-                rslt.update({key_used: {"mean": mean, "std": std}})
-
-        assert len(data) == len(keys_test), "not all data are processed"
+        rslt = {"stim": data["stim"]}
+        for idx, key in enumerate(reduced.chan):
+            rslt.update({key: {"mean": reduced.mean[idx], "std": reduced.std[idx]}})
+        assert len(data) == len(rslt), "not all data are processed"
         return rslt
 
-    def process_data_from_file(self, path: Path, file_name: str, load_settings: bool = False) -> dict:
+    def __process_file(self, path2file: Path) -> dict:
+        """Processing the measurement data of one file (cacheable without instance state)"""
+        data = self.load_data(path=path2file.parent, file_name=path2file.name)
+        return self.process_data_direct(data=data.data)
+
+    def process_data_from_file(
+        self, path: Path, file_name: str, load_settings: bool = False, cache: AnalysisCache | None = None
+    ) -> dict:
         """Function for processing the measurement data from loading a file
         :param path:            Path to measurement in which the files are inside
         :param file_name:       Name of numpy file with measurement results
         :param load_settings:   If True, load settings will be loaded from file
+        :param cache:           Class AnalysisCache for reusing the results of unchanged files, None if not used
         :return:                Dictionary with ['stim': stimulation input array, 'ch<x>': results with 'mean' and 'std']
         """
+        if cache is not None:
+            return cache.call(self.__process_file, Path(path) / file_name)
         data = self.load_data(path=path, file_name=file_name, load_settings=load_settings)
         return self.process_data_direct(data=data.data)
@@ -1,5 +1,6 @@
 import unittest
 
+import numpy as np
 import pytest
 
 from elasticai.hw_measurements import get_path_to_project
@@ -51,6 +52,18 @@ class TestDataAnalysis(unittest.TestCase):
         self.assertTrue(len(data_new) == len(data.data))
         self.assertTrue(len(data_new["ch00"]) == 2)
 
+    def test_process_data_direct_converged_channels(self):
+        stim = np.linspace(0.0, 1.0, 11)
+        data = {
+            "stim": stim,
+            "ch00": np.tile(stim[None, :, None], (2, 1, 4)),
+            "ch01": np.tile(2 * stim[None, :, None], (4, 1, 4)),
+        }
+        data_new = ProcessCommon().process_data_direct(data)
+        np.testing.assert_allclose(data_new["ch00"]["mean"], stim)
+        np.testing.assert_allclose(data_new["ch01"]["mean"], 2 * stim)
+        np.testing.assert_allclose(data_new["ch01"]["std"], 0.0, atol=1e-12)
+
     def test_process_data_from_file(self):
         hndl = ProcessCommon()
         file = hndl.get_data_overview(path=self.path2data, acronym="dac")[0]
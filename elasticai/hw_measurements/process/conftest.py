@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+
+def generate_results(
+    num_chnl: int = 3, num_rpt: int = 4, num_steps: int = 50, daq_ovr: int = 8, seed: int = 42
+) -> dict:
+    """Function for generating synthetic characterization results (linear transfer with channel-dependent noise)
+    :param num_chnl:    Integer with number of channels [ch00, ch01, ...]
+    :param num_rpt:     Integer with number of repetitions
+    :param num_steps:   Integer with number of stimuli steps in range [0.0, 1.0]
+    :param daq_ovr:     Integer with number of oversampling
+    :param seed:        Integer with seed of the random generator
+    :return:            Dictionary with stimuli (stim) and channel results [shape: (num_rpt, num_steps, daq_ovr)]
+    """
+    rng = np.random.default_rng(seed)
+    data = {"stim": np.linspace(0.0, 1.0, num_steps)}
+    data.update(
+        {
+            f"ch{idx:02d}": data["stim"][None, :, None]
+            + rng.normal(scale=0.01 * (idx + 1), size=(num_rpt, num_steps, daq_ovr))
+            for idx in range(num_chnl)
+        }
+    )
+    return data
+
+
+@pytest.fixture
+def get_results():
+    return generate_results
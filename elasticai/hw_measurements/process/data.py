@@ -1,56 +1,82 @@
+from functools import lru_cache
 from logging import Logger, getLogger
 
 import numpy as np
 from scipy.signal import find_peaks
 from scipy.signal.windows import gaussian
 
-from elasticai.hw_measurements import TransformSpectrum
+from elasticai.hw_measurements import (
+    FrequencyResponse,
+    MetricDynamic,
+    MetricFrequencyResponse,
+    MetricHarmonics,
+    MetricIVCurve,
+    MetricSineFit,
+    MetricStepResponse,
+    MetricTransfer,
+    TransformSpectrum,
+)
 from elasticai.hw_measurements.process.common import ProcessCommon
 
+WindowBinSpan = {
+    "": 1,
+    "hamming": 3,
+    "hanning": 3,
+    "bartlett": 3,
+    "blackman": 4,
+    "gaussian": 4,
+}
+"""Number of bins of the main lobe (one-sided, incl. center) of each window for grouping the leakage of a tone"""
 
-def window_method(window_size: int, method: str = "hamming") -> np.ndarray:
-    """Generating window for smoothing transformation method.
-    :param window_size:     Integer number with size of the window
-    :param method:          Selection of window method ['': None, 'Hamming', 'gaussian', 'bartlett', 'blackman']
-    :return:                Numpy array with window
-    """
+
+@lru_cache(maxsize=32)
+def _get_window(window_size: int, method: str) -> np.ndarray:
+    """Building the window of one method and size (cached, returned array is read-only)"""
     methods_avai = {
-        "hamming": np.hamming(window_size),
-        "gaussian": gaussian(window_size, int(0.16 * window_size), sym=True),
-        "hanning": np.hanning(window_size),
-        "bartlett": np.bartlett(window_size),
-        "blackman": np.blackman(window_size),
+        "hamming": np.hamming,
+        "gaussian": lambda size: gaussian(size, int(0.16 * size), sym=True),
+        "hanning": np.hanning,
+        "bartlett": np.bartlett,
+        "blackman": np.blackman,
     }
-    if method.lower() not in list(methods_avai.keys()):
+    if method not in methods_avai:
         raise ValueError(f"Method {method} is not available")
-
-    window = np.ones(window_size)
-    for key in methods_avai.keys():
-        if method.lower() == key:
-            window = methods_avai[key]
+    window = methods_avai[method](window_size)
+    window.flags.writeable = False
     return window
 
 
-def do_fft(y: np.ndarray, fs: float, method_window: str = "") -> TransformSpectrum:
-    """Performing the Discrete Fast Fourier Transformation.
-    :param y:   Transient input signal
-    :param fs:  Sampling rate [Hz]
+def window_method(window_size: int, method: str = "hamming") -> np.ndarray:
+    """Generating window for smoothing transformation method (cached for each method and size).
+    :param window_size:     Integer number with size of the window
+    :param method:          Selection of window method ['': None, 'Hamming', 'gaussian', 'bartlett', 'blackman']
+    :return:                Numpy array with window (read-only)
+    """
+    return _get_window(window_size, method.lower())
+
+
+def do_fft(
+    y: np.ndarray, fs: float, method_window: str = "", out: np.ndarray | None = None
+) -> TransformSpectrum:
+    """Performing the real-valued Discrete Fast Fourier Transformation of all signals in one pass.
+    :param y:               Transient input signal [shape: (..., num_samples), like: (num_channels, num_samples)]
+    :param fs:              Sampling rate [Hz]
     :param method_window:   Selected window ['': None, 'Hamming', 'guassian', 'bartlett', 'blackman']
-    :return:    Dataclass TransformSpectrum with spectrum data
+    :param out:             Numpy array for writing the amplitude spectrum [shape: (..., (num_samples + 1) // 2)], None for new array
+    :return:                Dataclass TransformSpectrum with spectrum data (positive frequencies without Nyquist bin)
     """
+    num_samples = y.shape[-1]
     fft_in = y
     if method_window:
-        window = window_method(window_size=y.size, method=method_window)
-        fft_in = window * y
-    N = y.size // 2
-    fft_out = 2 / N * np.abs(np.fft.fft(fft_in))
-    fft_out[0] = fft_out[0] / 2
-    freq = fs * np.fft.fftfreq(fft_out.size)
-
-    # Taking positive range
-    xsel = np.where(freq >= 0)
-    fft_out = fft_out[xsel]
-    freq = freq[xsel]
+        fft_in = window_method(window_size=num_samples, method=method_window) * y
+
+    # Taking positive range (like fftfreq, the Nyquist bin of even sizes is negative and skipped)
+    num_bins = (num_samples + 1) // 2
+    N = num_samples // 2
+    fft_out = np.abs(np.fft.rfft(fft_in, axis=-1)[..., :num_bins], out=out)
+    fft_out *= 2 / N
+    fft_out[..., 0] /= 2
+    freq = fs * np.fft.rfftfreq(num_samples)[:num_bins]
     return TransformSpectrum(freq=freq, spec=fft_out, sampling_rate=fs)
 
 
@@ -61,102 +87,149 @@ class MetricCalculator(ProcessCommon):
         """Class with constructors for processing the measurement results for extracting device-specific metrics"""
         super().__init__()
 
-    def calculate_lsb_mean(self, stim_input: np.ndarray, daq_output: np.ndarray) -> float:
+    def calculate_lsb_mean(self, stim_input: np.ndarray, daq_output: np.ndarray) -> float | np.ndarray:
         """Function for calculating the mean Least Significant Bit (LSB)
-        :param stim_input:  Numpy array with stimulus input
-        :param daq_output:  Numpy array with DAQ output
-        :return:        Float with LSB
+        :param stim_input:  Numpy array with stimulus input [shape: (num_steps, )]
+        :param daq_output:  Numpy array with DAQ output [shape: (..., num_steps)]
+        :return:        Float with LSB [numpy array with shape (...) for stacked input]
         """
-        return float(np.mean(self.calculate_lsb(stim_input=stim_input, daq_output=daq_output), axis=0))
+        lsb_mean = np.mean(self.calculate_lsb(stim_input=stim_input, daq_output=daq_output), axis=-1)
+        return float(lsb_mean) if np.ndim(lsb_mean) == 0 else lsb_mean
 
     @staticmethod
     def calculate_gain_from_transfer(stim_input: np.ndarray, src_output: np.ndarray) -> np.ndarray:
         """Function for extracting the gain of an electrical circuit using the transfer function test
-        :param stim_input:  Numpy array with stimulus input
-        :param src_output:  Numpy array with DAQ output (should have same unit like stim_input)
+        :param stim_input:  Numpy array with stimulus input [shape: (num_steps, )]
+        :param src_output:  Numpy array with DAQ output (should have same unit like stim_input) [shape: (..., num_steps)]
         :return:            Numpy array with gain value
         """
-        assert src_output.shape == stim_input.shape, "Dimension / shape mismatch"
-        return np.diff(src_output) / np.diff(stim_input)
+        assert src_output.shape[-1] == stim_input.shape[-1], "Dimension / shape mismatch"
+        return np.diff(src_output, axis=-1) / np.diff(stim_input, axis=-1)
 
     @staticmethod
     def calculate_lsb(stim_input: np.ndarray, daq_output: np.ndarray) -> np.ndarray:
-        """Function for calculating the mean Least Significant Bit (LSB)
-        :param stim_input:  Numpy array with stimulus input
-        :param daq_output:  Numpy array with DAQ output
-        :return:        Float with LSB
+        """Function for calculating the Least Significant Bit (LSB) of each step
+        :param stim_input:  Numpy array with stimulus input [shape: (num_steps, )]
+        :param daq_output:  Numpy array with DAQ output [shape: (..., num_steps)]
+        :return:        Numpy array with LSB [shape: (..., num_steps - 1)]
         """
-        assert daq_output.shape == stim_input.shape, "Dimension / shape mismatch"
-        return np.diff(daq_output) / np.diff(stim_input)
+        assert daq_output.shape[-1] == stim_input.shape[-1], "Dimension / shape mismatch"
+        return np.diff(daq_output, axis=-1) / np.diff(stim_input, axis=-1)
 
     def calculate_dnl(self, stim_input: np.ndarray, daq_output: np.ndarray) -> np.ndarray:
         """Calculating the Differential Non-Linearity (DNL) of a transfer function from DAC/ADC
-        :param stim_input:  Numpy array with stimulus input
-        :param daq_output:  Numpy array with DAQ output
-        :return:            Numpy array with DNL
+        :param stim_input:  Numpy array with stimulus input [shape: (num_steps, )]
+        :param daq_output:  Numpy array with DAQ output [shape: (..., num_steps)]
+        :return:            Numpy array with DNL [shape: (..., num_steps - 1)]
         """
-        return (
-            self.calculate_lsb(stim_input, daq_output) / self.calculate_lsb_mean(stim_input, daq_output)
-            - 1
-        )
+        lsb = self.calculate_lsb(stim_input, daq_output)
+        return lsb / np.mean(lsb, axis=-1, keepdims=True) - 1
 
     def calculate_inl(self, stim_input: np.ndarray, daq_output: np.ndarray) -> np.ndarray:
         """Calculating the Integral Non-Linearity (INL) of a transfer function from DAC/ADC
-        :param stim_input:  Numpy array with stimulus input
-        :param daq_output:  Numpy array with DAQ output
-        :return:        Numpy array with INL
+        :param stim_input:  Numpy array with stimulus input [shape: (num_steps, )]
+        :param daq_output:  Numpy array with DAQ output [shape: (..., num_steps)]
+        :return:        Numpy array with INL [shape: (..., num_steps)]
+        """
+        lsb_mean = np.mean(self.calculate_lsb(stim_input, daq_output), axis=-1, keepdims=True)
+        return daq_output - lsb_mean * stim_input
+
+    @staticmethod
+    def calculate_transfer_metrics(stim_input: np.ndarray, daq_output: np.ndarray) -> MetricTransfer:
+        """Calculating all metrics of the transfer function for a stack of channels in one pass (shared step differences)
+        :param stim_input:  Numpy array with stimulus input [shape: (num_steps, )]
+        :param daq_output:  Numpy array with DAQ output [shape: (..., num_steps), like: (num_chnl, num_steps)]
+        :return:            Dataclass MetricTransfer (values per channel, LSB/DNL/INL per step)
         """
-        return daq_output - self.calculate_lsb_mean(stim_input, daq_output) * stim_input
+        assert daq_output.shape[-1] == stim_input.shape[-1], "Dimension / shape mismatch"
+        stim = np.asarray(stim_input, dtype=float)
+        lsb = np.diff(daq_output, axis=-1) / np.diff(stim)
+        lsb_mean = np.mean(lsb, axis=-1)
+        inl = daq_output - lsb_mean[..., None] * stim
+
+        gain_endpoint = (daq_output[..., -1] - daq_output[..., 0]) / (stim[-1] - stim[0])
+        stim_centered = stim - np.mean(stim)
+        gain_fit = np.sum(daq_output * stim_centered, axis=-1) / np.sum(stim_centered**2)
+        return MetricTransfer(
+            lsb=lsb,
+            lsb_mean=lsb_mean,
+            dnl=lsb / lsb_mean[..., None] - 1,
+            inl=inl,
+            offset=np.mean(inl, axis=-1),
+            gain_endpoint=gain_endpoint,
+            offset_endpoint=daq_output[..., 0] - gain_endpoint * stim[0],
+            gain_fit=gain_fit,
+            offset_fit=np.mean(daq_output, axis=-1) - gain_fit * np.mean(stim),
+        )
 
     @staticmethod
-    def calculate_error_mbe(y_pred: float | np.ndarray, y_true: float | np.ndarray) -> float:
+    def _reduce_error(error: np.ndarray | float, axis: int | tuple | None) -> float | np.ndarray:
+        """Reducing the element-wise error with mean (float for all elements, numpy array along axis)"""
+        if axis is None:
+            return float(np.sum(error) / np.size(error))
+        return np.mean(error, axis=axis)
+
+    @staticmethod
+    def calculate_error_mbe(
+        y_pred: float | np.ndarray, y_true: float | np.ndarray, axis: int | tuple | None = None
+    ) -> float | np.ndarray:
         """Calculating the distance-based metric with mean bias error
         :param y_pred:      Numpy array or float value from prediction
         :param y_true:      Numpy array or float value from true label
-        :return:            Float value with error
+        :param axis:        Axis for reduction (like: -1 for each channel), None for reduction over all elements
+        :return:            Float value with error (numpy array if axis is given)
         """
         if isinstance(y_true, np.ndarray):
             assert y_pred.shape == y_true.shape, "Dimension / shape mismatch"
-            return float(np.sum(y_pred - y_true) / y_pred.size)
+            return MetricCalculator._reduce_error(y_pred - y_true, axis)
         else:
             return y_pred - y_true
 
     @staticmethod
-    def calculate_error_mae(y_pred: np.ndarray | float, y_true: np.ndarray | float) -> float:
+    def calculate_error_mae(
+        y_pred: np.ndarray | float, y_true: np.ndarray | float, axis: int | tuple | None = None
+    ) -> float | np.ndarray:
         """Calculating the distance-based metric with mean absolute error
         :param y_pred:      Numpy array or float value from prediction
         :param y_true:      Numpy array or float value from true label
-        :return:            Float value with error
+        :param axis:        Axis for reduction (like: -1 for each channel), None for reduction over all elements
+        :return:            Float value with error (numpy array if axis is given)
         """
         if isinstance(y_true, np.ndarray):
             assert y_pred.shape == y_true.shape, "Dimension / shape mismatch"
-            return float(np.sum(np.abs(y_pred - y_true)) / y_pred.size)
+            return MetricCalculator._reduce_error(np.abs(y_pred - y_true), axis)
         else:
             return float(np.abs(y_pred - y_true))
 
     @staticmethod
-    def calculate_error_mse(y_pred: np.ndarray | float, y_true: np.ndarray | float) -> float:
+    def calculate_error_mse(
+        y_pred: np.ndarray | float, y_true: np.ndarray | float, axis: int | tuple | None = None
+    ) -> float | np.ndarray:
         """Calculating the distance-based metric with mean squared error
         :param y_pred:      Numpy array or float value from prediction
         :param y_true:      Numpy array or float value from true label
-        :return:            Float value with error
+        :param axis:        Axis for reduction (like: -1 for each channel), None for reduction over all elements
+        :return:            Float value with error (numpy array if axis is given)
         """
         if isinstance(y_true, np.ndarray):
             assert y_pred.shape == y_true.shape, "Dimension / shape mismatch"
-            return float(np.sum((y_pred - y_true) ** 2) / y_pred.size)
+            return MetricCalculator._reduce_error((y_pred - y_true) ** 2, axis)
         else:
             return float(y_pred - y_true) ** 2
 
     @staticmethod
-    def calculate_error_mape(y_pred: np.ndarray | float, y_true: np.ndarray | float) -> float:
+    def calculate_error_mape(
+        y_pred: np.ndarray | float, y_true: np.ndarray | float, axis: int | tuple | None = None
+    ) -> float | np.ndarray:
         """Calculating the distance-based metric with mean absolute percentage error
         :param y_pred:  Numpy array or float value from prediction
         :param y_true:  Numpy array or float value from true label
-        :return:        Float value with error
+        :param axis:    Axis for reduction (like: -1 for each channel), None for reduction over all elements
+        :return:        Float value with error (numpy array if axis is given)
         """
         if isinstance(y_true, np.ndarray):
             assert y_pred.shape == y_true.shape, "Dimension / shape mismatch"
-            return float(np.sum(np.abs(y_true - y_pred) / np.abs(y_true)) / float(y_true.size))
+            return MetricCalculator._reduce_error(np.abs(y_true - y_pred) / np.abs(y_true), axis)
         else:
             return float(abs(y_true - y_pred) / abs(y_true))
 
@@ -184,16 +257,407 @@ class MetricCalculator(ProcessCommon):
 
     def calculate_total_harmonics_distortion_from_transient(
         self, signal: np.ndarray, fs: float, num_harmonics: int = 4
-    ) -> float:
-        """Calculating the Total Harmonics Distortion (THD) from transient input
-        :param signal:          Array with frequency values for spectral analysis
+    ) -> float | np.ndarray:
+        """Calculating the Total Harmonics Distortion (THD) from transient input (all channels are transformed in one pass)
+        :param signal:          Array with transient signal [shape: (num_samples, ) or (num_channels, num_samples)]
         :param fs:              Sampling rate [Hz]
         :param num_harmonics:   Number of used harmonics for calculating THD
-        :return:                THD value (in dB)
+        :return:                THD value (in dB) [numpy array with shape (num_channels, ) for multichannel input]
         """
         spectrum: TransformSpectrum = do_fft(y=signal, fs=fs)
-        return self.calculate_total_harmonics_distortion_from_spec(
-            signal=spectrum, num_harmonics=num_harmonics
+        if signal.ndim == 1:
+            return self.calculate_total_harmonics_distortion_from_spec(
+                signal=spectrum, num_harmonics=num_harmonics
+            )
+        return np.array(
+            [
+                self.calculate_total_harmonics_distortion_from_spec(
+                    signal=TransformSpectrum(freq=spectrum.freq, spec=spec, sampling_rate=fs),
+                    num_harmonics=num_harmonics,
+                )
+                for spec in spectrum.spec.reshape(-1, spectrum.freq.size)
+            ]
+        ).reshape(signal.shape[:-1])
+
+    @staticmethod
+    def _get_aliased_bin(pos: np.ndarray, num_samples: int) -> np.ndarray:
+        """Getting the (fractional) bin position in the first Nyquist zone of a tone at bin position pos"""
+        pos = np.mod(pos, num_samples)
+        return np.where(pos > num_samples / 2, num_samples - pos, pos)
+
+    @staticmethod
+    def _get_tone_mask(power: np.ndarray, pos: np.ndarray, span: int) -> np.ndarray:
+        """Getting the mask of all bins of a tone (leakage of main lobe) around the local maximum next to the expected position"""
+        bins = np.arange(power.shape[-1])
+        pos_peak = np.argmax(np.where(np.abs(bins - pos[..., None]) < span, power, -1.0), axis=-1)
+        return np.abs(bins - pos_peak[..., None]) < span
+
+    @staticmethod
+    def calculate_dynamic_metrics(
+        signal: np.ndarray, fs: float, num_harmonics: int = 4, method_window: str = "hanning"
+    ) -> MetricDynamic:
+        """Calculating the dynamic metrics (SNR, SINAD, ENOB, SFDR, THD, THD+N) of sinusoidal captures from one windowed
+        spectrum, vectorized over all leading axes. Harmonics above the Nyquist frequency are folded back (aliased) and each
+        tone is grouped with all bins of the main lobe of the window.
+        :param signal:          Numpy array with transient captures [shape: (..., num_samples)]
+        :param fs:              Sampling rate [Hz]
+        :param num_harmonics:   Number of used harmonics for calculating THD (like calculate_total_harmonics_distortion_from_spec)
+        :param method_window:   Selected window ['hamming', 'hanning', 'bartlett', 'blackman', 'gaussian'] or '' for rectangular
+        :return:                Dataclass MetricDynamic with metrics (in dB, ENOB in bit, amplitude of fundamental) [shape: (...)]
+        """
+        num_samples = signal.shape[-1]
+        sig = signal - np.mean(signal, axis=-1, keepdims=True)
+        window = np.ones(num_samples)
+        if method_window:
+            window = window_method(window_size=num_samples, method=method_window)
+            sig = sig * window
+        power = np.abs(np.fft.rfft(sig, axis=-1)) ** 2
+        bins = np.arange(power.shape[-1])
+        span = WindowBinSpan[method_window.lower()]
+
+        # --- Getting the fundamental and its (aliased) harmonics, expected from power-weighted bin position
+        mask_dc = bins < span
+        pos_peak = np.argmax(np.where(mask_dc, 0.0, power), axis=-1)
+        mask_fund = np.abs(bins - pos_peak[..., None]) < span
+        pwr_fund = np.sum(power, axis=-1, where=mask_fund)
+        pos_fund = np.sum(bins * power, axis=-1, where=mask_fund) / pwr_fund
+
+        mask_harm = np.zeros_like(power, dtype=bool)
+        for idx in range(2, num_harmonics + 2):
+            pos_harm = MetricCalculator._get_aliased_bin(idx * pos_fund, num_samples)
+            mask_harm |= MetricCalculator._get_tone_mask(power, pos_harm, span)
+        mask_harm &= ~(mask_dc | mask_fund)
+
+        # --- Getting the power of each part
+        pwr_harm = np.sum(power, axis=-1, where=mask_harm)
+        pwr_noise = np.sum(power, axis=-1, where=~(mask_dc | mask_fund | mask_harm))
+        pwr_spur = np.max(power, axis=-1, where=~(mask_dc | mask_fund), initial=0.0)
+
+        sinad = 10 * np.log10(pwr_fund / (pwr_noise + pwr_harm))
+        return MetricDynamic(
+            freq_fund=fs * pos_peak / num_samples,
+            ampl_fund=2 * np.sqrt(pwr_fund / (num_samples * np.sum(window**2))),
+            snr=10 * np.log10(pwr_fund / pwr_noise),
+            sinad=sinad,
+            enob=(sinad - 1.76) / 6.02,
+            sfdr=10 * np.log10(np.max(power, axis=-1, where=mask_fund, initial=0.0) / pwr_spur),
+            thd=10 * np.log10(pwr_harm / pwr_fund),
+            thd_n=-sinad,
+        )
+
+    @staticmethod
+    def _estimate_sine_frequency(signal: np.ndarray, fs: float) -> np.ndarray:
+        """Estimating the frequency of the dominant tone from the power-weighted bins of the Hann-windowed spectrum"""
+        num_samples = signal.shape[-1]
+        window = window_method(window_size=num_samples, method="hanning")
+        power = (
+            np.abs(np.fft.rfft((signal - np.mean(signal, axis=-1, keepdims=True)) * window, axis=-1)) ** 2
+        )
+        bins = np.arange(power.shape[-1])
+        pos_peak = np.argmax(np.where(bins < 1, 0.0, power), axis=-1)[..., None]
+        mask = np.abs(bins - pos_peak) < 2
+        return (
+            fs
+            * np.sum(bins * power, axis=-1, where=mask)
+            / np.sum(power, axis=-1, where=mask)
+            / num_samples
+        )
+
+    @staticmethod
+    def _solve_least_squares(matrix: np.ndarray, signal: np.ndarray) -> np.ndarray:
+        """Solving the least-squares problems of all records with batched normal equations [matrix: (..., N, K), signal: (..., N)]"""
+        normal = np.einsum("...nk,...nl->...kl", matrix, matrix)
+        right = np.einsum("...nk,...n->...k", matrix, signal)
+        return np.linalg.solve(normal, right[..., None])[..., 0]
+
+    def calculate_sine_fit(
+        self,
+        signal: np.ndarray,
+        fs: float,
+        freq: float | np.ndarray | None = None,
+        fit_freq: bool = True,
+        num_iter: int = 20,
+        tol_freq: float = 1e-9,
+        full_scale: float | None = None,
+    ) -> MetricSineFit:
+        """Fitting a sine wave to (short, non-coherently sampled) records with the three- or four-parameter least-squares
+        method of IEEE 1057, vectorized over all leading axes
+        :param signal:      Numpy array with transient records [shape: (..., num_samples)]
+        :param fs:          Sampling rate [Hz]
+        :param freq:        Frequency of the sine wave [Hz] (scalar or shape (...)), None for estimation from the spectrum
+        :param fit_freq:    If True, the frequency is refined iteratively (four-parameter fit), else three-parameter fit
+        :param num_iter:    Integer with maximal number of iterations of the four-parameter fit
+        :param tol_freq:    Floating with relative frequency change for stopping the iterations
+        :param full_scale:  Floating with full-scale range of the DUT for ENOB, None for ENOB from SINAD of the fitted amplitude
+        :return:            Dataclass MetricSineFit with amplitude, frequency [Hz], phase [rad], offset, residual RMS and ENOB
+        """
+        time = np.arange(signal.shape[-1]) / fs
+        freq = self._estimate_sine_frequency(signal, fs) if freq is None else freq
+        omega = 2 * np.pi * np.broadcast_to(np.asarray(freq, dtype=float), signal.shape[:-1]).copy()
+
+        def get_sine_matrix(omega: np.ndarray) -> np.ndarray:
+            phase = omega[..., None] * time
+            return np.stack([np.cos(phase), np.sin(phase), np.ones_like(phase)], axis=-1)
+
+        param = self._solve_least_squares(get_sine_matrix(omega), signal)
+        for _ in range(num_iter if fit_freq else 0):
+            matrix = get_sine_matrix(omega)
+            slope = time * (param[..., 1:2] * matrix[..., 0] - param[..., 0:1] * matrix[..., 1])
+            param = self._solve_least_squares(np.concatenate([matrix, slope[..., None]], axis=-1), signal)
+            omega += param[..., 3]
+            if np.all(np.abs(param[..., 3]) <= tol_freq * np.abs(omega)):
+                break
+        if fit_freq:
+            param = self._solve_least_squares(get_sine_matrix(omega), signal)
+
+        fitted = np.einsum("...nk,...k->...n", get_sine_matrix(omega), param[..., :3])
+        rms_residual = np.sqrt(np.mean((signal - fitted) ** 2, axis=-1))
+        ampl = np.hypot(param[..., 0], param[..., 1])
+        if full_scale is None:
+            enob = (20 * np.log10(ampl / (np.sqrt(2) * rms_residual)) - 1.76) / 6.02
+        else:
+            enob = np.log2(full_scale / (rms_residual * np.sqrt(12)))
+        return MetricSineFit(
+            ampl=ampl,
+            freq=omega / (2 * np.pi),
+            phase=np.arctan2(-param[..., 1], param[..., 0]),
+            offset=param[..., 2],
+            rms_residual=rms_residual,
+            enob=enob,
+        )
+
+    def calculate_harmonics_from_transient(
+        self,
+        signal: np.ndarray,
+        fs: float,
+        num_harmonics: int = 9,
+        freq: float | np.ndarray | None = None,
+        chunk_size: int = 2**16,
+    ) -> MetricHarmonics:
+        """Extracting the amplitudes of the fundamental and its harmonics from (very long) transient records without full FFT.
+        The fundamental is taken from a sine fit of the first chunk, afterwards only the (aliased) harmonic frequencies
+        are evaluated with single-bin DFTs of the Hann-windowed record, chunk by chunk (memory-mapped input is supported).
+        :param signal:          Numpy array with transient records [shape: (..., num_samples)]
+        :param fs:              Sampling rate [Hz]
+        :param num_harmonics:   Number of harmonics (excl. fundamental, like calculate_total_harmonics_distortion_from_spec)
+        :param freq:            Frequency of the fundamental [Hz] as start value of sine fit, None for estimation
+        :param chunk_size:      Integer with number of samples processed at once
+        :return:                Dataclass MetricHarmonics with frequency [Hz] and amplitude [shape: (..., 1 + num_harmonics), fundamental first] and THD [dB]
+        """
+        num_samples = signal.shape[-1]
+        records = signal.reshape(-1, num_samples)
+        fit = self.calculate_sine_fit(
+            signal=np.asarray(records[:, :chunk_size], dtype=float),
+            fs=fs,
+            freq=None if freq is None else np.broadcast_to(freq, signal.shape[:-1]).reshape(-1),
+        )
+        freq_harm = np.mod(np.arange(1, num_harmonics + 2) * fit.freq[:, None], fs)
+        freq_harm = np.where(freq_harm > fs / 2, fs - freq_harm, freq_harm)
+
+        spec = np.zeros(freq_harm.shape, dtype=complex)
+        sum_window = 0.0
+        for start in range(0, num_samples, chunk_size):
+            pos = np.arange(start, min(start + chunk_size, num_samples))
+            window = 0.5 - 0.5 * np.cos(2 * np.pi * pos / (num_samples - 1))
+            chunk = (
+                np.asarray(records[:, start : pos[-1] + 1], dtype=float) - fit.offset[:, None]
+            ) * window
+            kernel = np.exp(-2j * np.pi * np.mod(freq_harm[..., None] / fs * pos, 1.0))
+            spec += np.einsum("bhn,bn->bh", kernel, chunk)
+            sum_window += np.sum(window)
+
+        ampl = 2 * np.abs(spec) / sum_window
+        shape = signal.shape[:-1] + (1 + num_harmonics,)
+        return MetricHarmonics(
+            freq=freq_harm.reshape(shape),
+            ampl=ampl.reshape(shape),
+            thd=10
+            * np.log10(np.sum(ampl[:, 1:] ** 2, axis=-1) / ampl[:, 0] ** 2).reshape(signal.shape[:-1]),
+        )
+
+    @staticmethod
+    def calculate_compression_point(
+        ampl_input: np.ndarray, ampl_output: np.ndarray, compression_db: float = 1.0
+    ) -> np.ndarray:
+        """Calculating the input-related compression point (like: 1 dB) of an amplifier from an amplitude sweep, vectorized over all leading axes
+        :param ampl_input:      Numpy array with increasing input amplitudes [shape: (num_ampl, )]
+        :param ampl_output:     Numpy array with output amplitudes of the fundamental [shape: (..., num_ampl)]
+        :param compression_db:  Floating with gain compression (in dB) related to the gain of the smallest amplitude
+        :return:                Numpy array with (linear interpolated) input amplitude at compression point, NaN if not reached [shape: (...)]
+        """
+        gain = 20 * np.log10(ampl_output / ampl_input)
+        drop = gain[..., :1] - gain - compression_db
+        mask = drop >= 0.0
+        found = np.any(mask, axis=-1)
+        pos = np.maximum(np.argmax(mask, axis=-1), 1)
+        drop0 = np.take_along_axis(drop, pos[..., None] - 1, axis=-1)[..., 0]
+        drop1 = np.take_along_axis(drop, pos[..., None], axis=-1)[..., 0]
+        frac = np.clip(-drop0 / np.where(drop1 == drop0, 1.0, drop1 - drop0), 0.0, 1.0)
+        ampl_cross = ampl_input[pos - 1] + frac * (ampl_input[pos] - ampl_input[pos - 1])
+        return np.where(found, ampl_cross, np.nan)
+
+    @staticmethod
+    def _get_first_crossing_below(
+        freq: np.ndarray, value: np.ndarray, level: np.ndarray, start: np.ndarray
+    ):
+        """Getting the (log-interpolated) frequency and the fractional position of the first crossing below level after index start
+        :return:    Tuple with [0] crossing frequency (NaN if not available), [1] index before crossing and [2] fraction to next index
+        """
+        idx = np.arange(value.shape[-1])
+        mask = (value < level[..., None]) & (idx > start[..., None])
+        found = np.any(mask, axis=-1)
+        pos = np.maximum(np.argmax(mask, axis=-1), 1) - 1
+        val0 = np.take_along_axis(value, pos[..., None], axis=-1)[..., 0]
+        val1 = np.take_along_axis(value, pos[..., None] + 1, axis=-1)[..., 0]
+        frac = np.clip((level - val0) / np.where(val1 == val0, -1.0, val1 - val0), 0.0, 1.0)
+        logf = np.log10(freq)
+        freq_cross = 10 ** (logf[pos] + frac * (logf[np.minimum(pos + 1, freq.size - 1)] - logf[pos]))
+        return np.where(found, freq_cross, np.nan), pos, frac
+
+    def calculate_fra_metrics(self, data: FrequencyResponse) -> MetricFrequencyResponse:
+        """Calculating the metrics of (stacked) Frequency Response Analysis results, vectorized over all leading axes
+        :param data:    Dataclass FrequencyResponse with freq [shape: (num_freq, )], gain in dB and phase in degree [shape: (..., num_freq)]
+        :return:        Dataclass MetricFrequencyResponse with maximal gain (dB) and its frequency, -3 dB bandwidth (upper corner frequency),
+                        unity-gain frequency and phase margin (degree) [shape: (...)], NaN if not available
+        """
+        assert data.gain.shape == data.phase.shape and data.gain.shape[-1] == data.freq.size, (
+            "Dimension / shape mismatch"
+        )
+        pos_max = np.argmax(data.gain, axis=-1)
+        gain_max = np.max(data.gain, axis=-1)
+        phase = np.rad2deg(np.unwrap(np.deg2rad(data.phase), axis=-1))
+
+        bandwidth = self._get_first_crossing_below(data.freq, data.gain, gain_max - 3.0, pos_max)[0]
+        freq_unity, pos, frac = self._get_first_crossing_below(
+            data.freq, data.gain, np.zeros_like(gain_max), pos_max
+        )
+        phase0 = np.take_along_axis(phase, pos[..., None], axis=-1)[..., 0]
+        phase1 = np.take_along_axis(phase, np.minimum(pos + 1, data.freq.size - 1)[..., None], axis=-1)[
+            ..., 0
+        ]
+        phase_margin = np.where(np.isnan(freq_unity), np.nan, 180.0 + phase0 + frac * (phase1 - phase0))
+        return MetricFrequencyResponse(
+            gain_max=gain_max,
+            freq_max=data.freq[pos_max],
+            bandwidth=bandwidth,
+            freq_unity=freq_unity,
+            phase_margin=phase_margin,
+        )
+
+    @staticmethod
+    def _get_first_crossing_above(value: np.ndarray, level: float, start: np.ndarray) -> np.ndarray:
+        """Getting the (linear interpolated) fractional sample index of the first crossing above level from index start, NaN if not available"""
+        idx = np.arange(value.shape[-1])
+        mask = (value >= level) & (idx >= start[..., None])
+        found = np.any(mask, axis=-1)
+        pos = np.argmax(mask, axis=-1)
+        pos0 = np.maximum(pos - 1, 0)
+        val0 = np.take_along_axis(value, pos0[..., None], axis=-1)[..., 0]
+        val1 = np.take_along_axis(value, pos[..., None], axis=-1)[..., 0]
+        frac = np.clip((level - val0) / np.where(val1 == val0, 1.0, val1 - val0), 0.0, 1.0)
+        cross = np.where(pos > start, pos0 + frac, pos)
+        return np.where(found, cross, np.nan)
+
+    def calculate_step_response(
+        self,
+        signal: np.ndarray,
+        fs: float,
+        pos_trigger: int | None = None,
+        settling_tol: float = 0.02,
+        rise_levels: tuple[float, float] = (0.1, 0.9),
+    ) -> MetricStepResponse:
+        """Calculating the step response metrics (rise time, slew rate, overshoot, settling time) of transient captures, vectorized over all leading axes
+        :param signal:          Numpy array with captured step responses (rising or falling) [shape: (..., num_samples)]
+        :param fs:              Sampling rate [Hz]
+        :param pos_trigger:     Integer with sample index of the applied step (None: first crossing of lower rise level)
+        :param settling_tol:    Floating with relative tolerance band around the final value for settling (like: 0.02 for +/-2%)
+        :param rise_levels:     Tuple with relative [low, high] levels for the rise time
+        :return:                Dataclass MetricStepResponse with initial and final value, rise time [s], slew rate [V/s],
+                                overshoot [%] and settling time [s] [shape: (...)], NaN if not available
+        """
+        num_samples = signal.shape[-1]
+        num_final = max(1, num_samples // 10)
+        num_initial = max(1, pos_trigger) if pos_trigger is not None else max(1, num_samples // 20)
+        val_initial = np.mean(signal[..., :num_initial], axis=-1)
+        val_final = np.mean(signal[..., -num_final:], axis=-1)
+        height = val_final - val_initial
+        norm = (signal - val_initial[..., None]) / np.where(height == 0.0, np.nan, height)[..., None]
+
+        start = np.zeros(shape=signal.shape[:-1], dtype=int) + (
+            pos_trigger if pos_trigger is not None else 0
+        )
+        pos_low = self._get_first_crossing_above(norm, rise_levels[0], start)
+        pos_high = self._get_first_crossing_above(
+            norm, rise_levels[1], np.nan_to_num(np.floor(pos_low)).astype(int)
+        )
+        rise_time = (pos_high - pos_low) / fs
+        pos_ref = start if pos_trigger is not None else pos_low
+
+        idx = np.arange(num_samples)
+        mask_out = (np.abs(norm - 1.0) > settling_tol) & (idx >= start[..., None])
+        pos_settled = np.where(
+            np.any(mask_out, axis=-1), num_samples - np.argmax(mask_out[..., ::-1], axis=-1), start
+        )
+        overshoot = np.max(np.where(idx >= start[..., None], norm, -np.inf), axis=-1) - 1.0
+        return MetricStepResponse(
+            val_initial=val_initial,
+            val_final=val_final,
+            rise_time=rise_time,
+            slew_rate=(rise_levels[1] - rise_levels[0]) * np.abs(height) / rise_time,
+            overshoot=100 * np.maximum(overshoot, 0.0),
+            settling_time=np.maximum(pos_settled - pos_ref, 0.0) / fs,
+        )
+
+    @staticmethod
+    def _get_value_at_position(value: np.ndarray, pos: np.ndarray) -> np.ndarray:
+        """Getting the linear interpolated value at fractional index position (NaN positions are returned as NaN)"""
+        pos_valid = np.nan_to_num(pos)
+        pos0 = np.floor(pos_valid).astype(int)
+        pos1 = np.minimum(pos0 + 1, value.shape[-1] - 1)
+        val0 = np.take_along_axis(value, pos0[..., None], axis=-1)[..., 0]
+        val1 = np.take_along_axis(value, pos1[..., None], axis=-1)[..., 0]
+        return np.where(np.isnan(pos), np.nan, val0 + (pos_valid - pos0) * (val1 - val0))
+
+    def calculate_iv_metrics(
+        self,
+        volt: np.ndarray,
+        curr: np.ndarray,
+        curr_threshold: float = 1e-3,
+        volt_fit: float | None = None,
+    ) -> MetricIVCurve:
+        """Calculating the metrics of (four-quadrant) I-V curves, vectorized over all leading axes
+        :param volt:            Numpy array with applied/measured voltages [shape: (..., num_points)]
+        :param curr:            Numpy array with measured currents [shape: (..., num_points)]
+        :param curr_threshold:  Floating with current level for extracting the threshold voltages
+        :param volt_fit:        Floating with voltage window (|V| <= volt_fit) for the linear fit of the resistance (None: all points)
+        :return:                Dataclass MetricIVCurve with resistance (from linear fit), leakage (maximal |I| for V < 0),
+                                threshold voltage for I >= curr_threshold (V >= 0) and I <= -curr_threshold (V <= 0)
+                                [shape: (...)], NaN if not available
+        """
+        order = np.argsort(volt, axis=-1)
+        volt = np.take_along_axis(volt, order, axis=-1)
+        curr = np.take_along_axis(curr, order, axis=-1)
+
+        mask_fit = np.ones_like(volt, dtype=bool) if volt_fit is None else np.abs(volt) <= volt_fit
+        volt_mean = np.mean(volt, axis=-1, where=mask_fit, keepdims=True)
+        curr_mean = np.mean(curr, axis=-1, where=mask_fit, keepdims=True)
+        slope = np.sum((volt - volt_mean) * (curr - curr_mean), axis=-1, where=mask_fit) / np.sum(
+            (volt - volt_mean) ** 2, axis=-1, where=mask_fit
+        )
+
+        mask_rev = volt < 0.0
+        leakage = np.where(
+            np.any(mask_rev, axis=-1), np.max(np.abs(curr), axis=-1, where=mask_rev, initial=0.0), np.nan
+        )
+        pos_th = self._get_first_crossing_above(curr, curr_threshold, np.argmax(volt >= 0.0, axis=-1))
+        pos_th_neg = self._get_first_crossing_above(
+            -curr[..., ::-1], curr_threshold, np.argmax(volt[..., ::-1] <= 0.0, axis=-1)
+        )
+        return MetricIVCurve(
+            resistance=1 / np.where(slope == 0.0, np.nan, slope),
+            leakage=leakage,
+            threshold_pos=self._get_value_at_position(volt, pos_th),
+            threshold_neg=self._get_value_at_position(volt[..., ::-1], pos_th_neg),
         )
 
     @staticmethod
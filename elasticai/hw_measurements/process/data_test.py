@@ -3,7 +3,7 @@ import unittest
 import numpy as np
 import pytest
 
-from elasticai.hw_measurements import get_path_to_project
+from elasticai.hw_measurements import FrequencyResponse, get_path_to_project
 from elasticai.hw_measurements.process.data import (
     MetricCalculator,
     do_fft,
@@ -45,6 +45,34 @@ def test_invalid_method_raises_value_error():
         window_method(10, "not_a_real_method")
 
 
+def test_window_is_cached_and_read_only():
+    window = window_method(64, "Blackman")
+    assert window is window_method(64, "blackman")
+    assert not window.flags.writeable
+
+
+@pytest.mark.parametrize("num_samples", [64, 65])
+def test_fft_matches_complex_reference(num_samples):
+    rng = np.random.default_rng(0)
+    signal = rng.normal(size=(3, num_samples))
+    freq_ref = 100.0 * np.fft.fftfreq(num_samples)
+    spec_ref = 2 / (num_samples // 2) * np.abs(np.fft.fft(signal, axis=-1))[:, freq_ref >= 0]
+    spec_ref[:, 0] /= 2
+
+    rslt = do_fft(y=signal, fs=100.0)
+    np.testing.assert_allclose(rslt.freq, freq_ref[freq_ref >= 0])
+    np.testing.assert_allclose(rslt.spec, spec_ref, rtol=1e-12)
+    np.testing.assert_allclose(do_fft(y=signal[1], fs=100.0).spec, rslt.spec[1])
+
+
+def test_fft_with_output_buffer():
+    signal = np.random.default_rng(0).normal(size=(2, 128))
+    out = np.empty((2, 64))
+    rslt = do_fft(y=signal, fs=1.0, method_window="hanning", out=out)
+    assert rslt.spec is out
+    np.testing.assert_allclose(out, do_fft(y=signal, fs=1.0, method_window="hanning").spec)
+
+
 class TestDataAnalysis(unittest.TestCase):
     path2data = get_path_to_project(new_folder="test_data")
     hndl = MetricCalculator()
@@ -79,6 +107,13 @@ class TestDataAnalysis(unittest.TestCase):
         )
         self.assertEqual(rslt, 1.0)
 
+    def test_lsb_mean_batch(self):
+        stim = np.arange(0, 16, dtype=float)
+        daq = np.stack([2.0 * stim, 0.5 * stim + 1.0, -stim])
+        rslt = self.hndl.calculate_lsb_mean(stim_input=stim, daq_output=daq)
+        self.assertEqual(rslt.shape, (3,))
+        np.testing.assert_allclose(rslt, [2.0, 0.5, -1.0])
+
     def test_dnl_constructor_size(self):
         rslt = self.hndl.calculate_dnl(stim_input=self.trns["stim"], daq_output=self.trns["ch00"]["mean"])
         self.assertTrue(rslt.size == self.trns["stim"].size - 1)
@@ -238,7 +273,7 @@ class TestDataAnalysis(unittest.TestCase):
             method_window="hamming",
         )
         rslt = self.hndl.calculate_total_harmonics_distortion_from_spec(signal=spectrum, num_harmonics=2)
-        self.assertEqual(rslt, -19.11810872201894)
+        self.assertEqual(rslt, -19.118108722018935)
 
     def test_gain_transfer_one(self):
         amp_input = np.linspace(start=-1.0, stop=1.0, num=101, endpoint=True)
@@ -250,3 +285,267 @@ class TestDataAnalysis(unittest.TestCase):
         )
         self.assertTrue(rslt.shape == (100,))
         self.assertEqual(rslt.mean(), 2.0)
+
+    def test_dynamic_metrics_batch(self):
+        fs = 1e4
+        num_samples = 4096
+        t = np.arange(num_samples) / fs
+        freq = fs * 101 / num_samples
+        rng = np.random.default_rng(0)
+        signal = (
+            np.sin(2 * np.pi * freq * t)
+            + 0.01 * np.sin(2 * np.pi * 2 * freq * t)
+            + rng.normal(0, 1e-3, (2, 3, num_samples))
+        )
+        rslt = self.hndl.calculate_dynamic_metrics(signal=signal, fs=fs, num_harmonics=2)
+        self.assertEqual(rslt.snr.shape, (2, 3))
+        np.testing.assert_array_almost_equal(rslt.freq_fund, np.zeros((2, 3)) + freq)
+        np.testing.assert_allclose(rslt.thd, -40.0, atol=0.2)
+        np.testing.assert_allclose(rslt.sfdr, 40.0, atol=0.2)
+        np.testing.assert_allclose(rslt.snr, 10 * np.log10(0.5 / 1e-6), atol=0.5)
+        np.testing.assert_allclose(rslt.enob, (rslt.sinad - 1.76) / 6.02)
+
+    def test_dynamic_metrics_rectangular_window(self):
+        fs = 1e3
+        t = np.arange(1000) / fs
+        signal = (
+            np.sin(2 * np.pi * 50 * t)
+            + 0.1 * np.sin(2 * np.pi * 100 * t)
+            + 1e-4 * np.sin(2 * np.pi * 313 * t)
+        )
+        rslt = self.hndl.calculate_dynamic_metrics(
+            signal=signal, fs=fs, num_harmonics=1, method_window=""
+        )
+        self.assertAlmostEqual(float(rslt.thd), -20.0, delta=1e-6)
+        self.assertAlmostEqual(float(rslt.sfdr), 20.0, delta=1e-6)
+        self.assertAlmostEqual(float(rslt.snr), 80.0, delta=1e-6)
+
+    def test_fra_metrics_two_pole(self):
+        freq = np.logspace(0, 6, 601)
+        gain = list()
+        phase = list()
+        for a0 in [10.0, 100.0]:
+            h = a0 / ((1 + 1j * freq / 100) * (1 + 1j * freq / 1e4))
+            gain.append(20 * np.log10(np.abs(h)))
+            phase.append(np.rad2deg(np.angle(h)))
+        rslt = self.hndl.calculate_fra_metrics(
+            FrequencyResponse(freq=freq, gain=np.array(gain), phase=np.array(phase))
+        )
+        self.assertEqual(rslt.bandwidth.shape, (2,))
+        np.testing.assert_allclose(rslt.gain_max, [20.0, 40.0], atol=1e-3)
+        np.testing.assert_allclose(rslt.bandwidth, 100.0, rtol=0.01)
+        np.testing.assert_allclose(rslt.freq_unity, [990.0, 7860.0], rtol=0.01)
+        np.testing.assert_allclose(rslt.phase_margin, [90.1, 52.6], atol=0.5)
+
+    def test_fra_metrics_no_crossing(self):
+        freq = np.logspace(0, 3, 31)
+        rslt = self.hndl.calculate_fra_metrics(
+            FrequencyResponse(freq=freq, gain=np.zeros((3, 31)) + 6.0, phase=np.zeros((3, 31)))
+        )
+        self.assertTrue(np.all(np.isnan(rslt.bandwidth)))
+        self.assertTrue(np.all(np.isnan(rslt.phase_margin)))
+
+    def test_dynamic_metrics_amplitude(self):
+        fs = 1e4
+        t = np.arange(4096) / fs
+        ampl = np.array([[0.5], [2.0]])
+        for freq, window in [(fs * 500 / 4096, ""), (1234.5, "hanning"), (1234.5, "blackman")]:
+            signal = ampl * np.sin(2 * np.pi * freq * t)
+            rslt = self.hndl.calculate_dynamic_metrics(signal=signal, fs=fs, method_window=window)
+            np.testing.assert_allclose(rslt.ampl_fund, ampl[:, 0], rtol=1e-3)
+
+    def test_compression_point(self):
+        ampl_in = np.array([0.1, 0.2, 0.3, 0.4, 0.5])
+        ampl_out = np.array(
+            [
+                [1.0, 2.0, 3.0, 4.0, 5.0],
+                [1.0, 2.0, 3.0, 4.0, 10 * 0.5 * 10 ** (-2 / 20)],
+            ]
+        )
+        rslt = self.hndl.calculate_compression_point(ampl_in, ampl_out, compression_db=1.0)
+        self.assertTrue(np.isnan(rslt[0]))
+        self.assertAlmostEqual(float(rslt[1]), 0.45, delta=1e-9)
+
+    def test_step_response_metrics(self):
+        fs = 1e6
+        t = np.arange(2000) / fs - 200e-6
+        tt = np.maximum(t, 0.0)
+        rc = np.where(t >= 0.0, 1 - np.exp(-tt / 50e-6), 0.0)
+        zeta = 0.5
+        wn = 2 * np.pi * 10e3
+        wd = wn * np.sqrt(1 - zeta**2)
+        osc = 1 - np.exp(-zeta * wn * tt) * (
+            np.cos(wd * tt) + zeta / np.sqrt(1 - zeta**2) * np.sin(wd * tt)
+        )
+        signal = np.stack([2 * rc, 3 - 2 * rc, np.where(t >= 0.0, osc, 0.0)])
+
+        rslt = self.hndl.calculate_step_response(signal=signal, fs=fs, pos_trigger=200)
+        np.testing.assert_allclose(rslt.val_final, [2.0, 1.0, 1.0], atol=1e-3)
+        np.testing.assert_allclose(rslt.rise_time[:2], 50e-6 * np.log(9), rtol=1e-3)
+        np.testing.assert_allclose(rslt.settling_time[:2], 50e-6 * np.log(50), rtol=0.01)
+        np.testing.assert_allclose(rslt.overshoot, [0.0, 0.0, 16.3], atol=0.1)
+
+    def test_step_response_trigger_at_first_sample(self):
+        fs = 1e6
+        tau = 50e-6
+        signal = 2 * (1 - np.exp(-np.arange(2000) / fs / tau))
+        rslt = self.hndl.calculate_step_response(signal=signal, fs=fs, pos_trigger=0)
+        self.assertEqual(float(rslt.val_initial), 0.0)
+        self.assertAlmostEqual(float(rslt.rise_time), tau * np.log(9), delta=1e-3 * tau)
+        self.assertAlmostEqual(float(rslt.settling_time), tau * np.log(50), delta=0.01 * tau)
+
+    def test_iv_metrics(self):
+        volt = np.linspace(-5.0, 5.0, 101)
+        diode = np.where(volt >= 0.0, np.minimum(1e-12 * (np.exp(volt / 0.05) - 1), 0.1), -1e-9)
+        diode = np.where(volt < -4.5, -0.1 * (-4.5 - volt) - 1e-9, diode)
+        rslt = self.hndl.calculate_iv_metrics(
+            volt=np.stack([volt, volt]), curr=np.stack([volt / 1e3, diode]), curr_threshold=1e-3
+        )
+        self.assertAlmostEqual(float(rslt.resistance[0]), 1e3, delta=1e-6)
+        np.testing.assert_allclose(rslt.leakage, [5e-3, 0.05], rtol=1e-6)
+        np.testing.assert_allclose(rslt.threshold_pos, [1.0, 1.0166], atol=1e-3)
+        np.testing.assert_allclose(rslt.threshold_neg, [-1.0, -4.51], atol=1e-3)
+
+    def test_transfer_metrics_batch(self):
+        rng = np.random.default_rng(1)
+        stim = np.arange(0, 64, dtype=float)
+        daq = np.stack([2.0 * stim + 5.0, 0.5 * stim - 1.0 + rng.normal(scale=0.1, size=stim.size)])
+        rslt = self.hndl.calculate_transfer_metrics(stim_input=stim, daq_output=daq)
+
+        self.assertEqual(rslt.lsb.shape, (2, 63))
+        self.assertEqual(rslt.inl.shape, (2, 64))
+        np.testing.assert_allclose([rslt.gain_fit[0], rslt.offset_fit[0]], [2.0, 5.0])
+        np.testing.assert_allclose([rslt.gain_endpoint[0], rslt.offset_endpoint[0]], [2.0, 5.0])
+        np.testing.assert_allclose(rslt.gain_fit[1], np.polyfit(stim, daq[1], 1)[0])
+        for idx in range(2):
+            np.testing.assert_allclose(rslt.lsb[idx], self.hndl.calculate_lsb(stim, daq[idx]))
+            np.testing.assert_allclose(rslt.dnl[idx], self.hndl.calculate_dnl(stim, daq[idx]))
+            np.testing.assert_allclose(rslt.inl[idx], self.hndl.calculate_inl(stim, daq[idx]))
+        np.testing.assert_allclose(self.hndl.calculate_dnl(stim, daq), rslt.dnl)
+
+    def test_metric_error_axis(self):
+        y_true = np.ones((3, 10))
+        y_pred = y_true + np.array([[0.0], [1.0], [-2.0]])
+        np.testing.assert_allclose(
+            self.hndl.calculate_error_mbe(y_pred, y_true, axis=-1), [0.0, 1.0, -2.0]
+        )
+        np.testing.assert_allclose(
+            self.hndl.calculate_error_mae(y_pred, y_true, axis=-1), [0.0, 1.0, 2.0]
+        )
+        np.testing.assert_allclose(
+            self.hndl.calculate_error_mse(y_pred, y_true, axis=-1), [0.0, 1.0, 4.0]
+        )
+        np.testing.assert_allclose(self.hndl.calculate_error_mape(y_pred, y_true, axis=0), np.ones(10))
+        self.assertEqual(self.hndl.calculate_error_mae(y_pred, y_true), 1.0)
+
+    def test_metric_thd_multichannel(self):
+        fs = 1000.0
+        t = np.linspace(start=0.0, stop=1.0, num=int(fs), endpoint=True)
+        signal = np.stack(
+            [np.sin(2 * np.pi * 50 * t) + ampl * np.sin(2 * np.pi * 100 * t) for ampl in (0.1, 0.01)]
+        )
+        rslt = self.hndl.calculate_total_harmonics_distortion_from_transient(signal=signal, fs=fs)
+        self.assertEqual(rslt.shape, (2,))
+        for idx in range(2):
+            self.assertAlmostEqual(
+                rslt[idx], self.hndl.calculate_total_harmonics_distortion_from_transient(signal[idx], fs)
+            )
+
+    def test_dynamic_metrics_aliased_harmonics(self):
+        fs = 1024.0
+        t = np.arange(1024) / fs
+        freq = np.array([[100.0], [400.0]])
+        signal = (
+            np.sin(2 * np.pi * freq * t)
+            + 0.01 * np.sin(2 * np.pi * 2 * freq * t)
+            + 0.001 * np.sin(2 * np.pi * 3 * freq * t)
+        )
+        rslt = self.hndl.calculate_dynamic_metrics(
+            signal=signal, fs=fs, num_harmonics=2, method_window=""
+        )
+        np.testing.assert_allclose(rslt.freq_fund, [100.0, 400.0])
+        np.testing.assert_allclose(rslt.thd, 10 * np.log10(0.01**2 + 0.001**2), atol=1e-6)
+        self.assertTrue(np.all(rslt.snr > 200.0))
+
+    def test_dynamic_metrics_leakage_grouping(self):
+        fs = 1e4
+        num_samples = 4096
+        t = np.arange(num_samples) / fs
+        freq = 1234.5
+        rng = np.random.default_rng(0)
+        signal = (
+            np.sin(2 * np.pi * freq * t)
+            + 0.01 * np.sin(2 * np.pi * 3 * freq * t)
+            + rng.normal(0, 1e-4, (3, num_samples))
+        )
+        for window in ["hanning", "blackman"]:
+            rslt = self.hndl.calculate_dynamic_metrics(
+                signal=signal, fs=fs, num_harmonics=2, method_window=window
+            )
+            np.testing.assert_allclose(rslt.thd, -40.0, atol=0.3)
+            np.testing.assert_allclose(rslt.thd_n, -rslt.sinad)
+            np.testing.assert_allclose(
+                rslt.thd_n, 10 * np.log10(10 ** (rslt.thd / 10) + 10 ** (-rslt.snr / 10)), atol=1e-9
+            )
+
+    def test_sine_fit_four_parameter_short_record(self):
+        fs = 1e5
+        t = np.arange(300) / fs
+        freq = np.array([[1234.567], [3210.9]])
+        rng = np.random.default_rng(0)
+        signal = 0.8 * np.cos(2 * np.pi * freq * t + 0.3) + 0.1 + rng.normal(0, 1e-3, (2, 300))
+
+        rslt = self.hndl.calculate_sine_fit(signal=signal, fs=fs)
+        self.assertEqual(rslt.ampl.shape, (2,))
+        np.testing.assert_allclose(rslt.freq, freq[:, 0], rtol=1e-4)
+        np.testing.assert_allclose(rslt.ampl, 0.8, atol=1e-3)
+        np.testing.assert_allclose(rslt.phase, 0.3, atol=1e-2)
+        np.testing.assert_allclose(rslt.offset, 0.1, atol=1e-3)
+        np.testing.assert_allclose(rslt.rms_residual, 1e-3, rtol=0.1)
+        np.testing.assert_allclose(
+            rslt.enob, (20 * np.log10(0.8 / np.sqrt(2) / 1e-3) - 1.76) / 6.02, atol=0.2
+        )
+
+    def test_sine_fit_three_parameter_exact(self):
+        fs = 1e4
+        t = np.arange(1000) / fs
+        signal = np.stack([np.sin(2 * np.pi * 77.7 * t), 2.0 * np.cos(2 * np.pi * 77.7 * t) - 0.5])
+        rslt = self.hndl.calculate_sine_fit(
+            signal=signal, fs=fs, freq=77.7, fit_freq=False, full_scale=4.0
+        )
+        np.testing.assert_allclose(rslt.ampl, [1.0, 2.0])
+        np.testing.assert_allclose(rslt.phase, [-np.pi / 2, 0.0], atol=1e-9)
+        np.testing.assert_allclose(rslt.offset, [0.0, -0.5], atol=1e-9)
+        np.testing.assert_allclose(rslt.freq, 77.7)
+        self.assertTrue(np.all(rslt.rms_residual < 1e-9))
+        self.assertTrue(np.all(rslt.enob > 30))
+
+    def test_harmonics_from_transient_chunked(self):
+        fs = 1e6
+        t = np.arange(2**18) / fs
+        freq = np.array([[12345.678], [45678.9]])
+        rng = np.random.default_rng(0)
+        signal = (
+            np.cos(2 * np.pi * freq * t)
+            + 0.01 * np.cos(2 * np.pi * 2 * freq * t + 1.0)
+            + 0.003 * np.cos(2 * np.pi * 3 * freq * t)
+            + 0.2
+            + rng.normal(0, 1e-3, (2, t.size))
+        )
+        rslt = self.hndl.calculate_harmonics_from_transient(
+            signal=signal, fs=fs, num_harmonics=2, chunk_size=10000
+        )
+        self.assertEqual(rslt.ampl.shape, (2, 3))
+        np.testing.assert_allclose(rslt.freq[:, 0], freq[:, 0], rtol=1e-6)
+        np.testing.assert_allclose(rslt.ampl, np.array([[1.0, 0.01, 0.003]] * 2), rtol=1e-2)
+        np.testing.assert_allclose(rslt.thd, 10 * np.log10(0.01**2 + 0.003**2), atol=0.05)
+
+    def test_harmonics_from_transient_aliased(self):
+        fs = 1e5
+        t = np.arange(50000) / fs
+        signal = np.sin(2 * np.pi * 30e3 * t) + 0.01 * np.sin(2 * np.pi * 60e3 * t)
+        rslt = self.hndl.calculate_harmonics_from_transient(
+            signal=signal, fs=fs, num_harmonics=1, freq=30e3
+        )
+        np.testing.assert_allclose(rslt.freq, [30e3, 40e3], rtol=1e-6)
+        np.testing.assert_allclose(rslt.ampl, [1.0, 0.01], rtol=1e-3)
@@ -0,0 +1,89 @@
+import warnings
+
+import numpy as np
+
+from elasticai.hw_measurements.data_types import ReducedData
+
+
+def _get_channel_keys(data: dict) -> list:
+    """Getting the keys of all channel results with shape (num_rpt, num_steps, daq_ovr)"""
+    return [key for key, value in data.items() if key != "stim" and np.ndim(value) == 3]
+
+
+def _get_sigma_clipped_mean(samples: np.ndarray, sigma_clip: float, num_iter: int) -> np.ndarray:
+    """Calculating the sigma-clipped mean along last axis (samples outside median +/- sigma_clip * std are removed iteratively)"""
+    clipped = samples.copy()
+    num_valid = np.count_nonzero(~np.isnan(clipped))
+    for _ in range(num_iter):
+        center = np.nanmedian(clipped, axis=-1, keepdims=True)
+        limit = sigma_clip * np.nanstd(clipped, axis=-1, keepdims=True)
+        clipped[np.abs(clipped - center) > limit] = np.nan
+        num_valid_new = np.count_nonzero(~np.isnan(clipped))
+        if num_valid_new == num_valid:
+            break
+        num_valid = num_valid_new
+    return np.nanmean(clipped, axis=-1)
+
+
+def reduce_data(
+    data: dict,
+    keys: list | None = None,
+    do_robust: bool = True,
+    sigma_clip: float = 3.0,
+    num_iter: int = 5,
+    max_elements: int = 2**24,
+) -> ReducedData:
+    """Function for reducing the measurement results of all channels in one vectorized pass over the stacked
+    (channel, rpt, step, ovr) array. The statistics of each step are calculated over all repetitions and
+    oversampling values (pooled). The steps are processed chunk-wise, so memory-mapped inputs are only read partially.
+    Channels with fewer repetitions (like converged sweeps) are padded with NaN to the maximal number of repetitions.
+    :param data:            Dictionary with measurement results ['stim', 'ch<X>': (num_rpt, num_steps, daq_ovr)]
+    :param keys:            List with channel keys to reduce (None: all channels)
+    :param do_robust:       If True, median, MAD and sigma-clipped mean are calculated (else filled with NaN)
+    :param sigma_clip:      Floating with clipping threshold in multiples of the standard deviation
+    :param num_iter:        Integer with maximal number of clipping iterations
+    :param max_elements:    Integer with maximal number of samples in one chunk
+    :return:                Dataclass ReducedData with arrays of shape (num_chnl, num_steps)
+    """
+    keys = _get_channel_keys(data) if keys is None else keys
+    if not keys:
+        raise ValueError("No channel results available for reduction")
+    shape = np.shape(data[keys[0]])[1:]
+    if any(np.shape(data[key])[1:] != shape for key in keys):
+        raise ValueError(
+            "Channel results have different number of steps or oversampling and cannot be stacked"
+        )
+
+    num_steps, daq_ovr = shape
+    num_rpt = max(np.shape(data[key])[0] for key in keys)
+    chunk_steps = max(1, max_elements // (len(keys) * num_rpt * daq_ovr))
+    rslt = {
+        name: np.full((len(keys), num_steps), np.nan)
+        for name in ("mean", "std", "median", "mad", "mean_clipped")
+    }
+    for start in range(0, num_steps, chunk_steps):
+        stop = min(start + chunk_steps, num_steps)
+        with warnings.catch_warnings():
+            # steps without valid samples (like aborted sweeps) are returned as NaN
+            warnings.simplefilter("ignore", RuntimeWarning)
+            stacked = np.full((len(keys), num_rpt, stop - start, daq_ovr), np.nan)
+            for idx, key in enumerate(keys):
+                value = data[key][:, start:stop, :]
+                stacked[idx, : value.shape[0]] = value
+            samples = stacked.transpose(0, 2, 1, 3).reshape(len(keys), stop - start, num_rpt * daq_ovr)
+
+            rslt["mean"][:, start:stop] = np.nanmean(samples, axis=-1)
+            rslt["std"][:, start:stop] = np.nanstd(samples, axis=-1)
+            if do_robust:
+                median = np.nanmedian(samples, axis=-1)
+                rslt["median"][:, start:stop] = median
+                rslt["mad"][:, start:stop] = np.nanmedian(np.abs(samples - median[..., None]), axis=-1)
+                rslt["mean_clipped"][:, start:stop] = _get_sigma_clipped_mean(
+                    samples, sigma_clip, num_iter
+                )
+
+    return ReducedData(
+        stim=np.asarray(data["stim"]) if "stim" in data else np.arange(num_steps),
+        chan=list(keys),
+        **rslt,
+    )
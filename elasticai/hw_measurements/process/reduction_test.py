@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from elasticai.hw_measurements.process.reduction import reduce_data
+from elasticai.hw_measurements.process.results import ResultsReader, save_results_hdf5
+
+
+def test_reduce_data_matches_reference(get_results):
+    data = get_results()
+    rslt = reduce_data(data)
+    assert rslt.chan == ["ch00", "ch01", "ch02"]
+    assert rslt.mean.shape == rslt.std.shape == (3, 50)
+    for idx, key in enumerate(rslt.chan):
+        samples = data[key].transpose(1, 0, 2).reshape(50, -1)
+        np.testing.assert_allclose(rslt.mean[idx], samples.mean(axis=-1))
+        np.testing.assert_allclose(rslt.std[idx], samples.std(axis=-1))
+        np.testing.assert_allclose(rslt.median[idx], np.median(samples, axis=-1))
+
+
+def test_reduce_data_chunked_equal(get_results):
+    data = get_results()
+    ref = reduce_data(data)
+    rslt = reduce_data(data, max_elements=100)
+    for name in ("mean", "std", "median", "mad", "mean_clipped"):
+        np.testing.assert_allclose(getattr(rslt, name), getattr(ref, name))
+
+
+def test_reduce_data_robust_against_outlier(get_results):
+    data = get_results(num_chnl=1)
+    data["ch00"][0, 10, 0] = 100.0
+    rslt = reduce_data(data)
+    assert abs(rslt.mean[0, 10] - data["stim"][10]) > 1.0
+    assert abs(rslt.mean_clipped[0, 10] - data["stim"][10]) < 0.05
+    assert abs(rslt.median[0, 10] - data["stim"][10]) < 0.05
+    assert rslt.mad[0, 10] < 0.05
+
+
+def test_reduce_data_without_robust(get_results):
+    rslt = reduce_data(get_results(), do_robust=False)
+    assert np.all(np.isnan(rslt.median))
+    assert np.all(np.isfinite(rslt.std))
+
+
+def test_reduce_data_with_nan(get_results):
+    data = get_results(num_chnl=1)
+    data["ch00"][:, 5, :] = np.nan
+    data["ch00"][0, 6, :] = np.nan
+    rslt = reduce_data(data)
+    assert np.isnan(rslt.mean[0, 5])
+    np.testing.assert_allclose(rslt.mean[0, 6], np.mean(data["ch00"][1:, 6, :]))
+
+
+def test_reduce_data_memmap(tmp_path, get_results):
+    data = get_results()
+    save_results_hdf5(tmp_path / "result.h5", data)
+    with ResultsReader(tmp_path / "result.h5", mmap=True) as f:
+        rslt = reduce_data(f.get_data(), max_elements=256)
+    np.testing.assert_allclose(rslt.mean, reduce_data(data).mean)
+
+
+def test_reduce_data_different_repetitions(get_results):
+    data = get_results(num_chnl=2)
+    data["ch01"] = data["ch01"][:2]
+    rslt = reduce_data(data)
+    assert rslt.mean.shape == (2, 50)
+    for idx, key in enumerate(rslt.chan):
+        samples = data[key].transpose(1, 0, 2).reshape(50, -1)
+        np.testing.assert_allclose(rslt.mean[idx], samples.mean(axis=-1))
+        np.testing.assert_allclose(rslt.median[idx], np.median(samples, axis=-1))
+
+
+def test_reduce_data_wrong_shape(get_results):
+    data = get_results()
+    data["ch01"] = data["ch01"][:, :10, :]
+    with pytest.raises(ValueError):
+        reduce_data(data)
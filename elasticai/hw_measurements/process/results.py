@@ -0,0 +1,143 @@
+import json
+from dataclasses import asdict, is_dataclass
+from logging import getLogger
+from pathlib import Path
+
+import h5py
+import numpy as np
+
+ResultsFormatName = "elasticai.hw_measurements.results"
+ResultsFormatVersion = 1
+
+
+def _translate_settings_to_dict(settings: object | dict | None) -> dict:
+    """Translating the settings (dataclass, class or dictionary) into a dictionary"""
+    if settings is None:
+        return dict()
+    if isinstance(settings, dict):
+        return settings
+    if is_dataclass(settings):
+        return asdict(settings)
+    return {
+        key: getattr(settings, key)
+        for key in dir(settings)
+        if not key.startswith("_") and not callable(getattr(settings, key))
+    }
+
+
+def _write_group(group: h5py.Group, data: dict, compression: str | None) -> None:
+    """Writing the dictionary into HDF5 group with one dataset per entry (nested dictionaries as sub-groups)"""
+    for key, value in data.items():
+        if isinstance(value, dict):
+            _write_group(group.create_group(key), value, compression)
+        else:
+            value = np.asarray(value)
+            if value.dtype == object:
+                raise TypeError(f"Entry {key} is not a numeric array and cannot be stored without pickle")
+            group.create_dataset(key, data=value, compression=compression if value.ndim > 0 else None)
+
+
+def save_results_hdf5(
+    path2file: Path, data: dict, settings: object | dict | None = None, compression: str | None = None
+) -> None:
+    """Function for saving the measurement results pickle-free in HDF5 format (one dataset per 'stim'/'ch<X>', settings as attributes)
+    :param path2file:   Path to HDF5 file
+    :param data:        Dictionary with results from measurement
+    :param settings:    Dataclass or dictionary with settings
+    :param compression: String with compression filter (like: 'gzip', 'lzf'), None for uncompressed and memory-mappable datasets
+    :return:            None
+    """
+    path2file.parent.mkdir(parents=True, exist_ok=True)
+    with h5py.File(path2file, "w") as f:
+        f.attrs["format"] = ResultsFormatName
+        f.attrs["version"] = ResultsFormatVersion
+        f.attrs["settings_class"] = type(settings).__name__ if settings is not None else ""
+        _write_group(f.create_group("data"), data, compression)
+        group = f.create_group("settings")
+        for key, value in _translate_settings_to_dict(settings).items():
+            group.attrs[key] = json.dumps(value, default=lambda item: np.asarray(item).tolist())
+
+
+class ResultsReader:
+    def __init__(self, path2file: Path, mmap: bool = False) -> None:
+        """Class for lazy reading of measurement results in HDF5 format, only the accessed entries are loaded
+        :param path2file:   Path to HDF5 file
+        :param mmap:        If True, uncompressed datasets are memory-mapped (read-only) instead of loaded
+        :return:            None
+        """
+        self._logger = getLogger(__name__)
+        if not path2file.exists():
+            raise FileNotFoundError(f"File {path2file} does not exist")
+        self._path = path2file
+        self._mmap = mmap
+        self._file = h5py.File(path2file, "r")
+        if self._file.attrs.get("format", "") != ResultsFormatName:
+            self.close()
+            raise ValueError(f"File {path2file} is not a results file")
+        if self.version > ResultsFormatVersion:
+            self.close()
+            raise ValueError(f"Results format version {self.version} is not supported")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closing the file handle"""
+        self._file.close()
+
+    @property
+    def version(self) -> int:
+        """Returning the format version of the file"""
+        return int(self._file.attrs["version"])
+
+    def keys(self) -> list:
+        """Returning the available entries (like: ['stim', 'ch00', ...])"""
+        return list(self._file["data"].keys())
+
+    def __getitem__(self, key: str) -> np.ndarray | dict:
+        return self.__read(self._file["data"][key])
+
+    def __read(self, item: h5py.Dataset | h5py.Group) -> np.ndarray | dict:
+        if isinstance(item, h5py.Group):
+            return {key: self.__read(value) for key, value in item.items()}
+        offset = item.id.get_offset()
+        if self._mmap and offset is not None and item.ndim > 0:
+            return np.memmap(self._path, mode="r", dtype=item.dtype, offset=offset, shape=item.shape)
+        return item[()]
+
+    def get_data(self, keys: list | None = None) -> dict:
+        """Function for reading the selected entries
+        :param keys:    List with entries to read (None: all entries)
+        :return:        Dictionary with entries
+        """
+        return {key: self[key] for key in (self.keys() if keys is None else keys)}
+
+    def get_settings(self) -> dict:
+        """Function for reading the settings
+        :return:        Dictionary with settings
+        """
+        return {key: json.loads(value) for key, value in self._file["settings"].attrs.items()}
+
+
+def convert_npz_to_hdf5(
+    path2npz: Path, path2file: Path | None = None, compression: str | None = None
+) -> Path:
+    """Function for converting the existing (pickled) numpy archives into the HDF5 results format
+    :param path2npz:    Path to numpy archive from CharacterizationCommon.save_results
+    :param path2file:   Path to new HDF5 file (None: same name with suffix '.h5')
+    :param compression: String with compression filter (like: 'gzip', 'lzf'), None for uncompressed datasets
+    :return:            Path to HDF5 file
+    """
+    path2file = path2npz.with_suffix(".h5") if path2file is None else path2file
+    loaded = np.load(file=path2npz.as_posix(), allow_pickle=True)
+    data = loaded["data"].flatten()[0]
+    try:
+        settings = loaded["settings"].flatten()[0]
+    except (ModuleNotFoundError, AttributeError) as e:
+        getLogger(__name__).warning(f"Settings of {path2npz.name} cannot be restored ({e}) - skipped")
+        settings = None
+    save_results_hdf5(path2file=path2file, data=data, settings=settings, compression=compression)
+    return path2file
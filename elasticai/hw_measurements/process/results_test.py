@@ -0,0 +1,72 @@
+import shutil
+
+import h5py
+import numpy as np
+import pytest
+
+from elasticai.hw_measurements import get_path_to_project
+from elasticai.hw_measurements.charac.dac import DefaultSettingsDAC
+from elasticai.hw_measurements.process.common import ProcessCommon
+from elasticai.hw_measurements.process.results import (
+    ResultsReader,
+    convert_npz_to_hdf5,
+    save_results_hdf5,
+)
+
+
+def test_save_and_read_results(tmp_path, get_results):
+    data = get_results(num_chnl=4)
+    data["metric"] = {"mean": np.ones(3), "std": np.zeros(3)}
+    path2file = tmp_path / "result.h5"
+    save_results_hdf5(path2file=path2file, data=data, settings=DefaultSettingsDAC)
+
+    with ResultsReader(path2file) as f:
+        assert f.version == 1
+        assert f.keys() == ["ch00", "ch01", "ch02", "ch03", "metric", "stim"]
+        np.testing.assert_array_equal(f["ch02"], data["ch02"])
+        np.testing.assert_array_equal(f["metric"]["mean"], np.ones(3))
+        settings = f.get_settings()
+    assert settings["dac_chnl"] == DefaultSettingsDAC.dac_chnl
+    assert settings["sleep_sec"] == DefaultSettingsDAC.sleep_sec
+
+
+def test_read_results_mmap_and_compression(tmp_path, get_results):
+    data = get_results(num_chnl=4)
+    save_results_hdf5(path2file=tmp_path / "raw.h5", data=data)
+    save_results_hdf5(path2file=tmp_path / "gzip.h5", data=data, compression="gzip")
+
+    with ResultsReader(tmp_path / "raw.h5", mmap=True) as f:
+        rslt = f["ch01"]
+        assert isinstance(rslt, np.memmap)
+        np.testing.assert_array_equal(rslt, data["ch01"])
+    with ResultsReader(tmp_path / "gzip.h5", mmap=True) as f:
+        rslt = f.get_data(keys=["stim", "ch03"])
+        assert not isinstance(rslt["ch03"], np.memmap)
+        np.testing.assert_array_equal(rslt["ch03"], data["ch03"])
+
+
+def test_reject_pickle_and_foreign_files(tmp_path):
+    with pytest.raises(TypeError):
+        save_results_hdf5(path2file=tmp_path / "obj.h5", data={"ch00": np.array([{}, 1], dtype=object)})
+    with h5py.File(tmp_path / "foreign.h5", "w") as f:
+        f.create_dataset("data", data=np.ones(3))
+    with pytest.raises(ValueError):
+        ResultsReader(tmp_path / "foreign.h5")
+
+
+def test_convert_npz_and_load_data(tmp_path):
+    path2npz = tmp_path / "dac_charac.npz"
+    shutil.copy(get_path_to_project("test_data") / "dac_charac.npz", path2npz)
+    path2file = convert_npz_to_hdf5(path2npz=path2npz, compression="gzip")
+    assert path2file.suffix == ".h5"
+
+    hndl = ProcessCommon()
+    ref = hndl.load_data(path=tmp_path, file_name="dac_charac.npz").data
+    data = hndl.load_data(path=tmp_path, file_name="dac_charac.h5", load_settings=True)
+    assert len(data.data) == len(ref) == 17
+    assert data.settings == dict()
+    np.testing.assert_array_equal(data.data["ch15"], ref["ch15"])
+
+    part = hndl.load_data(path=tmp_path, file_name="dac_charac.h5", keys=["stim", "ch07"])
+    assert list(part.data.keys()) == ["stim", "ch07"]
+    assert len(hndl.process_data_direct(part.data)) == 2